@@ -1,7 +1,12 @@
+import secrets
 from dataclasses import dataclass
 
 from fastapi import Header, HTTPException, status
 
+from app.core.config import get_settings
+
+settings = get_settings()
+
 
 @dataclass(slots=True)
 class CurrentUser:
@@ -30,3 +35,10 @@ async def get_optional_user(
         return None
     handle = x_user_handle or f"user-{x_user_id[:6]}"
     return CurrentUser(user_id=x_user_id, handle=handle)
+
+
+async def require_admin(x_admin_token: str | None = Header(default=None)) -> None:
+    if not settings.admin_api_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Admin API disabled")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.admin_api_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
@@ -1,10 +1,14 @@
 from fastapi import APIRouter
 
+from app.api.routes.admin import router as admin_router
 from app.api.routes.arguments import router as arguments_router
 from app.api.routes.health import router as health_router
+from app.api.routes.metrics import router as metrics_router
 from app.api.routes.streaming import router as streaming_router
 
 api_router = APIRouter()
 api_router.include_router(health_router)
+api_router.include_router(metrics_router)
 api_router.include_router(arguments_router)
 api_router.include_router(streaming_router)
+api_router.include_router(admin_router)
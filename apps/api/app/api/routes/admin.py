@@ -0,0 +1,42 @@
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import require_admin
+from app.db.models import Argument, ArgumentStatus
+from app.db.session import get_session
+from app.schemas.argument import CancelResponse
+from app.services.cancellation import request_cancel
+from app.services.tracing import load_trace
+
+router = APIRouter(prefix="/v1/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/arguments/{argument_id}/trace")
+async def get_argument_trace(argument_id: str) -> Response:
+    trace = await load_trace(argument_id)
+    if trace is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No trace recorded")
+    return Response(
+        content=orjson.dumps(trace),
+        media_type="application/json",
+        headers={
+            "Content-Disposition": f'attachment; filename="argument-{argument_id}.trace.json"'
+        },
+    )
+
+
+@router.post("/arguments/{argument_id}/cancel", response_model=CancelResponse)
+async def cancel_argument(
+    argument_id: str, session: AsyncSession = Depends(get_session)
+) -> CancelResponse:
+    argument_status = await session.scalar(select(Argument.status).where(Argument.id == argument_id))
+    if argument_status is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Argument not found")
+    if argument_status != ArgumentStatus.RUNNING:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Argument is not running")
+
+    await request_cancel(session, argument_id, reason="admin")
+    await session.commit()
+    return CancelResponse(argument_id=argument_id, status="cancel_requested")
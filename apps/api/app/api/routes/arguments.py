@@ -1,13 +1,17 @@
 import asyncio
+import base64
 import secrets
 from datetime import UTC, datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, func, select
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import Row, and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import CurrentUser, get_current_user
 from app.core.config import get_settings
+from app.core.metrics import ADMISSION_SHED
+from app.core.responses import ORJSONResponse
 from app.db.models import (
     Argument,
     ArgumentInvite,
@@ -21,8 +25,8 @@ from app.db.models import (
 )
 from app.db.session import get_session
 from app.schemas.argument import (
-    ArgumentListItem,
     ArgumentView,
+    CancelResponse,
     CreateArgumentRequest,
     CreateInviteRequest,
     InviteResponse,
@@ -33,19 +37,65 @@ from app.schemas.argument import (
     ReactionRequest,
     StartArgumentRequest,
     StartResponse,
-    TurnEventView,
-    TurnView,
 )
 from app.schemas.report import ArgumentReportView, WrappedReport
+from app.services.admission import get_admission_controller
+from app.services.archive import archive_argument, load_archive
 from app.services.argument_engine import shape_config
+from app.services.cancellation import request_cancel
 from app.services.credits import consume_start_credit, ensure_user, get_credit_balance
 from app.services.events import persist_event
-from app.workers.actors import run_argument_actor
-from app.workers.runtime import run_argument, run_postprocess
+from app.services.response_cache import CachedResponse, etag_matches, get_response_cache
+from app.services.wire import WIRE_EVENT_COLUMNS, WireEvent
+from app.workers.actors import run_argument_actor, send_for_argument
+from app.workers.runtime import ADMISSION_POLL_SECONDS, run_argument, run_postprocess
 
 settings = get_settings()
 router = APIRouter(prefix="/v1", tags=["arguments"])
 
+# Hot read paths select exactly the fields of TurnView/TurnEventView (events via the wire
+# projection) and serialize the rows directly; the schemas still document the response shape.
+TURN_COLUMNS = (
+    Turn.id,
+    Turn.turn_index,
+    Turn.speaker_participant_id,
+    Turn.phase,
+    Turn.content,
+    Turn.metrics,
+    Turn.model_metadata,
+    Turn.created_at,
+)
+
+# Read-only routes check access and render views from these projections; only routes that change
+# the argument itself load the entity.
+ARGUMENT_ACCESS_COLUMNS = (
+    Argument.id,
+    Argument.creator_user_id,
+    Argument.status,
+    Argument.audience_mode,
+)
+ARGUMENT_VIEW_COLUMNS = (
+    *ARGUMENT_ACCESS_COLUMNS,
+    Argument.topic,
+    Argument.phase,
+    Argument.controls,
+    Argument.turn_count,
+    Argument.created_at,
+    Argument.started_at,
+    Argument.ended_at,
+)
+PARTICIPANT_COLUMNS = (
+    ArgumentParticipant.id,
+    ArgumentParticipant.user_id,
+    ArgumentParticipant.seat_order,
+    ArgumentParticipant.ready,
+    ArgumentParticipant.persona_snapshot,
+)
+
+# Views change on lifecycle transitions, so clients always revalidate; reports are written once.
+VIEW_CACHE_CONTROL = "private, no-cache"
+REPORT_CACHE_CONTROL = "private, max-age=300"
+
 
 def _as_utc(dt: datetime) -> datetime:
     # SQLite may deserialize timezone columns as naive datetimes.
@@ -61,13 +111,23 @@ async def _get_argument_or_404(session: AsyncSession, argument_id: str) -> Argum
     return argument
 
 
-async def _get_participants(session: AsyncSession, argument_id: str) -> list[ArgumentParticipant]:
+async def _get_argument_row_or_404(
+    session: AsyncSession, argument_id: str, columns: tuple = ARGUMENT_ACCESS_COLUMNS
+) -> Row:
+    result = await session.execute(select(*columns).where(Argument.id == argument_id))
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Argument not found")
+    return row
+
+
+async def _get_participants(session: AsyncSession, argument_id: str) -> list[Row]:
     rows = await session.execute(
-        select(ArgumentParticipant)
+        select(*PARTICIPANT_COLUMNS)
         .where(ArgumentParticipant.argument_id == argument_id)
         .order_by(ArgumentParticipant.seat_order.asc())
     )
-    return list(rows.scalars().all())
+    return list(rows.all())
 
 
 async def _is_participant(session: AsyncSession, argument_id: str, user_id: str) -> bool:
@@ -97,7 +157,7 @@ async def _is_valid_spectator_token(
     return row.scalar_one_or_none() is not None
 
 
-def _argument_to_view(argument: Argument, participants: list[ArgumentParticipant]) -> ArgumentView:
+def _argument_to_view(argument: Argument | Row, participants: list[Row]) -> ArgumentView:
     return ArgumentView(
         id=argument.id,
         topic=argument.topic,
@@ -123,49 +183,101 @@ def _argument_to_view(argument: Argument, participants: list[ArgumentParticipant
     )
 
 
+def _cached_response(
+    cached: CachedResponse, cache_control: str, *, not_modified: bool = False
+) -> Response:
+    headers = {"ETag": cached.etag, "Cache-Control": cache_control}
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+def _encode_cursor(created_at: datetime, argument_id: str) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps([created_at.isoformat(), argument_id])).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        created_at, argument_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), str(argument_id)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+async def _list_my_arguments(
+    session: AsyncSession,
+    user_id: str,
+    statuses: tuple[ArgumentStatus, ...],
+    cursor: str | None,
+    limit: int,
+) -> tuple[list[dict], str | None]:
+    query = (
+        select(
+            Argument.id,
+            Argument.topic,
+            Argument.status,
+            Argument.phase,
+            Argument.created_at,
+            Argument.started_at,
+            Argument.ended_at,
+        )
+        .join(ArgumentParticipant, ArgumentParticipant.argument_id == Argument.id)
+        .where(ArgumentParticipant.user_id == user_id)
+        .where(Argument.status.in_(statuses))
+        .order_by(Argument.created_at.desc(), Argument.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        created_at, argument_id = _decode_cursor(cursor)
+        query = query.where(
+            or_(
+                Argument.created_at < created_at,
+                and_(Argument.created_at == created_at, Argument.id < argument_id),
+            )
+        )
+    rows = (await session.execute(query)).mappings().all()
+    items = [dict(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = _encode_cursor(items[-1]["created_at"], items[-1]["id"])
+    return items, next_cursor
+
+
 @router.get("/me/arguments", response_model=MyArgumentsResponse)
 async def my_arguments(
+    active_cursor: str | None = Query(default=None),
+    past_cursor: str | None = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=200),
     current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-) -> MyArgumentsResponse:
+) -> Response:
     await ensure_user(session, current_user.user_id, current_user.handle)
-    rows = await session.execute(
-        select(Argument)
-        .join(ArgumentParticipant, ArgumentParticipant.argument_id == Argument.id)
-        .where(ArgumentParticipant.user_id == current_user.user_id)
-        .order_by(Argument.created_at.desc())
+    active, active_next_cursor = await _list_my_arguments(
+        session,
+        current_user.user_id,
+        (ArgumentStatus.WAITING, ArgumentStatus.RUNNING),
+        active_cursor,
+        limit,
+    )
+    past, past_next_cursor = await _list_my_arguments(
+        session,
+        current_user.user_id,
+        (ArgumentStatus.COMPLETED, ArgumentStatus.FAILED),
+        past_cursor,
+        limit,
     )
-    all_arguments = list(rows.scalars().all())
-
-    active = [
-        ArgumentListItem(
-            id=argument.id,
-            topic=argument.topic,
-            status=argument.status,
-            phase=argument.phase,
-            created_at=argument.created_at,
-            started_at=argument.started_at,
-            ended_at=argument.ended_at,
-        )
-        for argument in all_arguments
-        if argument.status in {ArgumentStatus.WAITING, ArgumentStatus.RUNNING}
-    ]
-    past = [
-        ArgumentListItem(
-            id=argument.id,
-            topic=argument.topic,
-            status=argument.status,
-            phase=argument.phase,
-            created_at=argument.created_at,
-            started_at=argument.started_at,
-            ended_at=argument.ended_at,
-        )
-        for argument in all_arguments
-        if argument.status in {ArgumentStatus.COMPLETED, ArgumentStatus.FAILED}
-    ]
     balance = await get_credit_balance(session, current_user.user_id)
     await session.commit()
-    return MyArgumentsResponse(active=active, past=past, credits_balance=balance)
+    # Rows are the ArgumentListItem fields straight from the projection; skip model validation.
+    return ORJSONResponse(
+        {
+            "active": active,
+            "past": past,
+            "credits_balance": balance,
+            "active_next_cursor": active_next_cursor,
+            "past_next_cursor": past_next_cursor,
+        }
+    )
 
 
 @router.post("/arguments", response_model=ArgumentView)
@@ -206,19 +318,31 @@ async def create_argument(
 @router.get("/arguments/{argument_id}", response_model=ArgumentView)
 async def get_argument(
     argument_id: str,
+    request: Request,
     audience_token: str | None = Query(default=None),
     current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-) -> ArgumentView:
-    argument = await _get_argument_or_404(session, argument_id)
+) -> Response:
+    cache = get_response_cache()
+    cached, generation = await cache.lookup("view", argument_id)
+    if cached is not None and etag_matches(request.headers.get("if-none-match"), cached.etag):
+        # A matching strong ETag means the client already holds this exact body.
+        return _cached_response(cached, VIEW_CACHE_CONTROL, not_modified=True)
+
+    argument = await _get_argument_row_or_404(session, argument_id, ARGUMENT_VIEW_COLUMNS)
     is_member = await _is_participant(session, argument_id, current_user.user_id)
     can_spectate = argument.audience_mode and await _is_valid_spectator_token(
         session, argument_id, audience_token
     )
     if not is_member and not can_spectate:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-    participants = await _get_participants(session, argument_id)
-    return _argument_to_view(argument, participants)
+    if cached is None:
+        participants = await _get_participants(session, argument_id)
+        view = _argument_to_view(argument, participants)
+        cached = await cache.store(
+            "view", argument_id, generation, orjson.dumps(view.model_dump(mode="json"))
+        )
+    return _cached_response(cached, VIEW_CACHE_CONTROL)
 
 
 @router.post("/arguments/{argument_id}/invites", response_model=InviteResponse)
@@ -228,7 +352,7 @@ async def create_invite(
     current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> InviteResponse:
-    argument = await _get_argument_or_404(session, argument_id)
+    argument = await _get_argument_row_or_404(session, argument_id)
     if argument.creator_user_id != current_user.user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only creator can issue invites")
 
@@ -259,7 +383,7 @@ async def join_argument(
     session: AsyncSession = Depends(get_session),
 ) -> dict:
     await ensure_user(session, current_user.user_id, current_user.handle)
-    argument = await _get_argument_or_404(session, argument_id)
+    argument = await _get_argument_row_or_404(session, argument_id)
 
     invite_query = await session.execute(
         select(ArgumentInvite).where(
@@ -318,7 +442,7 @@ async def update_persona_snapshot(
     current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> dict:
-    argument = await _get_argument_or_404(session, argument_id)
+    argument = await _get_argument_row_or_404(session, argument_id)
     if argument.status != ArgumentStatus.WAITING:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Persona is locked after start")
 
@@ -346,7 +470,7 @@ async def mark_ready(
     current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> dict:
-    argument = await _get_argument_or_404(session, argument_id)
+    argument = await _get_argument_row_or_404(session, argument_id)
     if argument.status != ArgumentStatus.WAITING:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Argument already started")
 
@@ -370,8 +494,13 @@ async def mark_ready(
 
 
 async def _run_inline(argument_id: str) -> None:
-    await run_argument(argument_id)
+    queued = await run_argument(argument_id)
+    while queued is not None:
+        await asyncio.sleep(ADMISSION_POLL_SECONDS)
+        queued = await run_argument(argument_id, reported_position=queued.position)
     await run_postprocess(argument_id)
+    if settings.archive_enabled:
+        await archive_argument(argument_id)
 
 
 @router.post("/arguments/{argument_id}/start", response_model=StartResponse)
@@ -401,6 +530,17 @@ async def start_argument(
     if any(not participant.persona_snapshot for participant in ready):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ready participants need persona")
 
+    # Shed standard-lane starts before charging a credit once the queue is over its wait SLO.
+    if not argument.audience_mode and settings.admission_slo_seconds > 0:
+        waited = await get_admission_controller().standard_wait_seconds()
+        if waited > settings.admission_slo_seconds:
+            ADMISSION_SHED.inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Debate queue is full, try again shortly",
+                headers={"Retry-After": str(max(1, round(waited - settings.admission_slo_seconds)))},
+            )
+
     try:
         await consume_start_credit(session, current_user.user_id)
     except ValueError as exc:
@@ -424,7 +564,7 @@ async def start_argument(
         asyncio.create_task(_run_inline(argument.id))
     else:
         try:
-            run_argument_actor.send(argument.id)
+            send_for_argument(run_argument_actor, argument.id)
         except Exception:
             # Local fallback when broker is unavailable.
             asyncio.create_task(_run_inline(argument.id))
@@ -432,14 +572,31 @@ async def start_argument(
     return StartResponse(argument_id=argument.id, status="started")
 
 
+@router.post("/arguments/{argument_id}/cancel", response_model=CancelResponse)
+async def cancel_argument(
+    argument_id: str,
+    current_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+) -> CancelResponse:
+    argument = await _get_argument_row_or_404(session, argument_id)
+    if argument.creator_user_id != current_user.user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only initiator can cancel")
+    if argument.status != ArgumentStatus.RUNNING:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Argument is not running")
+
+    await request_cancel(session, argument_id, reason="initiator")
+    await session.commit()
+    return CancelResponse(argument_id=argument_id, status="cancel_requested")
+
+
 @router.get("/arguments/{argument_id}/turns")
 async def get_turns(
     argument_id: str,
     audience_token: str | None = Query(default=None),
     current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-) -> dict:
-    argument = await _get_argument_or_404(session, argument_id)
+) -> Response:
+    argument = await _get_argument_row_or_404(session, argument_id)
     is_member = await _is_participant(session, argument_id, current_user.user_id)
     can_spectate = argument.audience_mode and await _is_valid_spectator_token(
         session, argument_id, audience_token
@@ -447,38 +604,30 @@ async def get_turns(
     if not is_member and not can_spectate:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
 
-    turns_result = await session.execute(
-        select(Turn).where(Turn.argument_id == argument_id).order_by(Turn.turn_index.asc())
-    )
+    archived = await load_archive(session, argument_id)
+    last_archived_id = archived.last_event_id if archived else 0
+    # Hot events use the same wire projection as archived ones, so every event has one shape
+    # whether or not the argument has been archived, and both are spliced in without re-encoding.
     events_result = await session.execute(
-        select(TurnEvent).where(TurnEvent.argument_id == argument_id).order_by(TurnEvent.id.asc())
+        select(*WIRE_EVENT_COLUMNS)
+        .where(TurnEvent.argument_id == argument_id)
+        .where(TurnEvent.id > last_archived_id)
+        .order_by(TurnEvent.id.asc())
     )
-
-    turns = [
-        TurnView(
-            id=turn.id,
-            turn_index=turn.turn_index,
-            speaker_participant_id=turn.speaker_participant_id,
-            phase=turn.phase,
-            content=turn.content,
-            metrics=turn.metrics,
-            model_metadata=turn.model_metadata,
-            created_at=turn.created_at,
-        )
-        for turn in turns_result.scalars().all()
-    ]
-    events = [
-        TurnEventView(
-            id=event.id,
-            turn_index=event.turn_index,
-            event_type=event.event_type,
-            payload=event.payload,
-            created_at=event.created_at,
+    event_parts = [WireEvent.from_row(row).data for row in events_result]
+    if archived is not None:
+        # Reactions persisted after archival stay hot past the archived id and come last.
+        event_parts = [event.data for event in archived.events] + event_parts
+        turns = orjson.dumps(archived.turns)
+    else:
+        turns_result = await session.execute(
+            select(*TURN_COLUMNS)
+            .where(Turn.argument_id == argument_id)
+            .order_by(Turn.turn_index.asc())
         )
-        for event in events_result.scalars().all()
-    ]
-
-    return {"turns": turns, "events": events}
+        turns = orjson.dumps([dict(row) for row in turns_result.mappings()])
+    body = b'{"turns":%b,"events":[%b]}' % (turns, b",".join(event_parts))
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/arguments/{argument_id}/reactions")
@@ -489,7 +638,7 @@ async def add_reaction(
     current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> dict:
-    argument = await _get_argument_or_404(session, argument_id)
+    argument = await _get_argument_row_or_404(session, argument_id)
     if not argument.audience_mode:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Audience mode is disabled")
 
@@ -524,11 +673,17 @@ async def add_reaction(
 @router.get("/arguments/{argument_id}/report", response_model=ArgumentReportView)
 async def get_report(
     argument_id: str,
+    request: Request,
     audience_token: str | None = Query(default=None),
     current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-) -> ArgumentReportView:
-    argument = await _get_argument_or_404(session, argument_id)
+) -> Response:
+    cache = get_response_cache()
+    cached, generation = await cache.lookup("report", argument_id)
+    if cached is not None and etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return _cached_response(cached, REPORT_CACHE_CONTROL, not_modified=True)
+
+    argument = await _get_argument_row_or_404(session, argument_id)
     is_member = await _is_participant(session, argument_id, current_user.user_id)
     can_spectate = argument.audience_mode and await _is_valid_spectator_token(
         session, argument_id, audience_token
@@ -536,16 +691,21 @@ async def get_report(
     if not is_member and not can_spectate:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
 
-    report_result = await session.execute(
-        select(ArgumentReport).where(ArgumentReport.argument_id == argument_id)
-    )
-    report = report_result.scalar_one_or_none()
-    if not report:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not ready")
-
-    return ArgumentReportView(
-        argument_id=argument_id,
-        summary=report.summary,
-        report=WrappedReport(**report.report_json),
-        created_at=report.created_at,
-    )
+    if cached is None:
+        report_result = await session.execute(
+            select(ArgumentReport).where(ArgumentReport.argument_id == argument_id)
+        )
+        report = report_result.scalar_one_or_none()
+        if not report:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not ready")
+
+        view = ArgumentReportView(
+            argument_id=argument_id,
+            summary=report.summary,
+            report=WrappedReport(**report.report_json),
+            created_at=report.created_at,
+        )
+        cached = await cache.store(
+            "report", argument_id, generation, orjson.dumps(view.model_dump(mode="json"))
+        )
+    return _cached_response(cached, REPORT_CACHE_CONTROL)
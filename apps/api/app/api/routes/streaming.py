@@ -1,4 +1,4 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, AsyncIterator
 from datetime import UTC, datetime
 
 import orjson
@@ -8,13 +8,20 @@ from sqlalchemy import and_, select
 
 from app.api.deps import CurrentUser, get_optional_user
 from app.core.config import get_settings
+from app.core.metrics import ACTIVE_STREAMS
 from app.db.models import Argument, ArgumentInvite, ArgumentParticipant, RoleKind, TurnEvent
 from app.db.session import SessionLocal
-from app.services.events import get_event_bus
+from app.services.archive import load_archive
+from app.services.fanout import Frame, fanout_hub
+from app.services.snapshots import load_snapshot
+from app.services.wire import WIRE_EVENT_COLUMNS, WireEvent
 
 settings = get_settings()
 router = APIRouter(prefix="/v1", tags=["streaming"])
 
+REPLAY_LIMIT = 500
+REPLAY_BATCH_SIZE = 200
+
 
 async def _can_access(
     argument_id: str,
@@ -23,8 +30,11 @@ async def _can_access(
     audience_token: str | None,
 ) -> bool:
     async with SessionLocal() as session:
-        argument = await session.get(Argument, argument_id)
-        if not argument:
+        audience_row = await session.execute(
+            select(Argument.audience_mode).where(Argument.id == argument_id)
+        )
+        audience_mode = audience_row.scalar_one_or_none()
+        if audience_mode is None:
             return False
 
         if user_id:
@@ -39,7 +49,7 @@ async def _can_access(
             if participant.scalar_one_or_none():
                 return True
 
-        if argument.audience_mode and audience_token:
+        if audience_mode and audience_token:
             invite = await session.execute(
                 select(ArgumentInvite.id).where(
                     and_(
@@ -56,6 +66,98 @@ async def _can_access(
         return False
 
 
+async def _initial_frames(
+    argument_id: str, *, use_snapshot: bool
+) -> tuple[list[Frame], int | None]:
+    async with SessionLocal() as session:
+        if use_snapshot:
+            state, last_event_id = await load_snapshot(session, argument_id)
+            snapshot = {
+                "id": last_event_id,
+                "argument_id": argument_id,
+                "event_type": "snapshot",
+                "payload": state,
+                "turn_index": None,
+                "created_at": datetime.now(UTC).isoformat(),
+            }
+            return [Frame([WireEvent(last_event_id, orjson.dumps(snapshot))])], last_event_id
+
+        archived = await load_archive(session, argument_id)
+        # Archived events are stored in wire format and replayed as-is; only the hot tail is read.
+        events = archived.events[:REPLAY_LIMIT] if archived else []
+        history = await session.execute(
+            select(*WIRE_EVENT_COLUMNS)
+            .where(TurnEvent.argument_id == argument_id)
+            .where(TurnEvent.id > (archived.last_event_id if archived else 0))
+            .order_by(TurnEvent.id.asc())
+            .limit(REPLAY_LIMIT - len(events))
+        )
+        events += [WireEvent.from_row(row) for row in history]
+        frames = [
+            Frame(events[offset : offset + REPLAY_BATCH_SIZE])
+            for offset in range(0, len(events), REPLAY_BATCH_SIZE)
+        ]
+        if len(events) >= REPLAY_LIMIT:
+            # A truncated replay is not caught up; live events start wherever the bus is.
+            return frames, None
+        if events:
+            return frames, events[-1].id
+        return frames, archived.last_event_id if archived else 0
+
+
+async def _events_between(
+    argument_id: str, after_event_id: int, before_event_id: int | None = None
+) -> list[WireEvent]:
+    query = (
+        select(*WIRE_EVENT_COLUMNS)
+        .where(TurnEvent.argument_id == argument_id)
+        .where(TurnEvent.id > after_event_id)
+        .order_by(TurnEvent.id.asc())
+    )
+    if before_event_id is not None:
+        query = query.where(TurnEvent.id < before_event_id)
+    async with SessionLocal() as session:
+        return [WireEvent.from_row(row) for row in await session.execute(query)]
+
+
+async def _live_frames(argument_id: str, after_event_id: int | None) -> AsyncIterator[Frame]:
+    async with fanout_hub.attach(argument_id) as frames:
+        cutoff = after_event_id
+        # Ids already sent from the database, so the live copies of those events are skipped.
+        sent: set[int] = set()
+        if cutoff is not None:
+            # Events persisted between the initial read and the subscription are sent right
+            # away, so they arrive even if the debate goes quiet or ends before the next event.
+            missed = await _events_between(argument_id, cutoff)
+            sent.update(event.id for event in missed)
+            if missed:
+                yield Frame(missed)
+        while True:
+            frame = await frames.get()
+            if frame is None:
+                return
+            events = [
+                event
+                for event in frame.events
+                if event.id not in sent and (cutoff is None or event.id > cutoff)
+            ]
+            if not events:
+                continue
+            if cutoff is not None:
+                # A fresh bus subscription may only go live after that query; the first live
+                # event shows whether anything else slipped in between.
+                gap = await _events_between(argument_id, cutoff, events[0].id)
+                missed = [event for event in gap if event.id not in sent]
+                sent.update(event.id for event in missed)
+                events = missed + events
+                cutoff = None
+            yield Frame(events)
+
+
+def _flag(value: str | None) -> bool:
+    return (value or "").lower() in {"1", "true", "yes"}
+
+
 @router.websocket("/arguments/{argument_id}/stream")
 async def stream_argument(
     websocket: WebSocket,
@@ -63,6 +165,9 @@ async def stream_argument(
 ) -> None:
     user_id = websocket.query_params.get("userId")
     audience_token = websocket.query_params.get("audienceToken")
+    use_snapshot = _flag(websocket.query_params.get("snapshot"))
+    # Clients that understand array frames opt in; everyone else keeps one event per frame.
+    batch = _flag(websocket.query_params.get("batch"))
     if not await _can_access(argument_id, user_id=user_id, audience_token=audience_token):
         await websocket.close(code=4403)
         return
@@ -70,27 +175,17 @@ async def stream_argument(
     await websocket.accept()
 
     try:
-        async with SessionLocal() as session:
-            history = await session.execute(
-                select(TurnEvent)
-                .where(TurnEvent.argument_id == argument_id)
-                .order_by(TurnEvent.id.asc())
-                .limit(500)
-            )
-            for event in history.scalars().all():
-                await websocket.send_json(
-                    {
-                        "id": event.id,
-                        "argument_id": argument_id,
-                        "event_type": event.event_type,
-                        "payload": event.payload,
-                        "turn_index": event.turn_index,
-                        "created_at": event.created_at.isoformat(),
-                    }
-                )
-
-        async for event in get_event_bus().subscribe(argument_id):
-            await websocket.send_json(event)
+        with ACTIVE_STREAMS.track(transport="websocket"):
+            initial, after_event_id = await _initial_frames(argument_id, use_snapshot=use_snapshot)
+            for frame in initial:
+                for text in frame.texts(batch=batch):
+                    await websocket.send_text(text)
+
+            async for frame in _live_frames(argument_id, after_event_id):
+                for text in frame.texts(batch=batch):
+                    await websocket.send_text(text)
+        # The server ended the live stream; 1013 asks the client to reconnect.
+        await websocket.close(code=1013)
     except WebSocketDisconnect:
         return
 
@@ -99,6 +194,8 @@ async def stream_argument(
 async def spectate_argument_sse(
     argument_id: str,
     audience_token: str = Query(default=""),
+    snapshot: str | None = Query(default=None),
+    batch: str | None = Query(default=None),
     current_user: CurrentUser | None = Depends(get_optional_user),
 ) -> StreamingResponse:
     if not settings.spectator_sse_enabled:
@@ -108,26 +205,19 @@ async def spectate_argument_sse(
     if not await _can_access(argument_id, user_id=user_id, audience_token=audience_token):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
-    async def event_stream() -> AsyncGenerator[str, None]:
-        async with SessionLocal() as session:
-            history = await session.execute(
-                select(TurnEvent)
-                .where(TurnEvent.argument_id == argument_id)
-                .order_by(TurnEvent.id.asc())
-                .limit(500)
+    use_batch = _flag(batch)
+
+    async def event_stream() -> AsyncGenerator[bytes, None]:
+        with ACTIVE_STREAMS.track(transport="sse"):
+            initial, after_event_id = await _initial_frames(
+                argument_id, use_snapshot=_flag(snapshot)
             )
-            for event in history.scalars().all():
-                payload = {
-                    "id": event.id,
-                    "argument_id": argument_id,
-                    "event_type": event.event_type,
-                    "payload": event.payload,
-                    "turn_index": event.turn_index,
-                    "created_at": event.created_at.isoformat(),
-                }
-                yield f"data: {orjson.dumps(payload).decode('utf-8')}\n\n"
-
-        async for event in get_event_bus().subscribe(argument_id):
-            yield f"data: {orjson.dumps(event).decode('utf-8')}\n\n"
+            for frame in initial:
+                for chunk in frame.chunks(batch=use_batch):
+                    yield b"data: " + chunk + b"\n\n"
+
+            async for frame in _live_frames(argument_id, after_event_id):
+                for chunk in frame.chunks(batch=use_batch):
+                    yield b"data: " + chunk + b"\n\n"
 
     return StreamingResponse(event_stream(), media_type="text/event-stream")
@@ -19,11 +19,49 @@ class Settings(BaseSettings):
     max_participants: int = Field(default=4, alias="MAX_PARTICIPANTS")
     inline_debate_runner: bool = Field(default=False, alias="INLINE_DEBATE_RUNNER")
     spectator_sse_enabled: bool = Field(default=True, alias="SPECTATOR_SSE_ENABLED")
+    pace_delay_scale: float = Field(default=1.0, alias="PACE_DELAY_SCALE")
+    # Generate every seat's opening statement concurrently instead of one after another.
+    parallel_opening_round: bool = Field(default=True, alias="PARALLEL_OPENING_ROUND")
+    # Caps on concurrently running debates: across all workers (needs Redis) and per process.
+    # 0 disables a cap. Debates over the cap wait in a queue; audience-mode debates go first.
+    max_running_debates: int = Field(default=0, alias="MAX_RUNNING_DEBATES")
+    max_running_debates_per_worker: int = Field(default=0, alias="MAX_RUNNING_DEBATES_PER_WORKER")
+    admission_lease_seconds: float = Field(default=60.0, alias="ADMISSION_LEASE_SECONDS")
+    # New standard-lane starts are refused with 503 while the oldest waiter has queued this long;
+    # 0 disables shedding.
+    admission_slo_seconds: float = Field(default=0.0, alias="ADMISSION_SLO_SECONDS")
+    # Above 1, debate stages are routed to `<queue>.<n>` queues by consistent hash of argument id.
+    debate_shards: int = Field(default=0, alias="DEBATE_SHARDS")
+    # redis (pub/sub on REDIS_URL), postgres (LISTEN/NOTIFY on DATABASE_URL) or local (one process).
+    event_bus_backend: str = Field(default="redis", alias="EVENT_BUS_BACKEND")
+    stream_coalesce_ms: float = Field(default=5.0, alias="STREAM_COALESCE_MS")
+    stream_max_pending_frames: int = Field(default=256, alias="STREAM_MAX_PENDING_FRAMES")
+    worker_metrics_port: int = Field(default=0, alias="WORKER_METRICS_PORT")
+    admin_api_token: str | None = Field(default=None, alias="ADMIN_API_TOKEN")
+    debate_trace_enabled: bool = Field(default=False, alias="DEBATE_TRACE_ENABLED")
+    debate_trace_capacity: int = Field(default=4096, alias="DEBATE_TRACE_CAPACITY")
+    debate_trace_max_arguments: int = Field(default=256, alias="DEBATE_TRACE_MAX_ARGUMENTS")
+    debate_trace_ttl_seconds: int = Field(default=86400, alias="DEBATE_TRACE_TTL_SECONDS")
+    response_cache_ttl_seconds: int = Field(default=300, alias="RESPONSE_CACHE_TTL_SECONDS")
+    user_cache_ttl_seconds: float = Field(default=60.0, alias="USER_CACHE_TTL_SECONDS")
+    archive_enabled: bool = Field(default=False, alias="ARCHIVE_ENABLED")
+    archive_dir: str = Field(default="./archive", alias="ARCHIVE_DIR")
+    # Days to keep each event type; 0 or absent means keep forever unless a default is set.
+    # Empty by default: retention deletes event history, so deployments opt in.
+    event_retention_days: dict[str, int] = Field(default_factory=dict, alias="EVENT_RETENTION_DAYS")
+    event_retention_default_days: int = Field(default=0, alias="EVENT_RETENTION_DEFAULT_DAYS")
+    event_retention_batch_size: int = Field(default=5000, alias="EVENT_RETENTION_BATCH_SIZE")
+    event_retention_interval_seconds: int = Field(
+        default=3600, alias="EVENT_RETENTION_INTERVAL_SECONDS"
+    )
     model_provider: str | None = Field(default=None, alias="MODEL_PROVIDER")
     gemini_api_key: str | None = Field(default=None, alias="GEMINI_API_KEY")
     gemini_model: str = Field(default="gemini-2.5-flash", alias="GEMINI_MODEL")
     openai_api_key: str | None = Field(default=None, alias="OPENAI_API_KEY")
     openai_model: str = Field(default="gpt-4.1-mini", alias="OPENAI_MODEL")
+    # Sends the resolved provider's requests to another OpenAI-compatible endpoint, e.g. a proxy
+    # or `python -m benchmarks.fake_llm`.
+    llm_base_url: str | None = Field(default=None, alias="LLM_BASE_URL")
 
     @staticmethod
     def _has_value(value: str | None) -> bool:
@@ -0,0 +1,45 @@
+"""Per-event-loop caches for clients that cannot cross event loops.
+
+Dramatiq actors run every message under its own `asyncio.run`, on several worker threads at
+once, while the API keeps one long-lived loop. Redis and asyncpg connections belong to the loop
+that opened them, so shared services keep one client per running loop instead of one per process.
+"""
+
+import asyncio
+import threading
+import weakref
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class LoopLocal(Generic[T]):
+    __slots__ = ("_factory", "_lock", "_values")
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        self._factory = factory
+        self._lock = threading.Lock()
+        # Entries go away with their loop, so finished worker messages do not pile up here.
+        self._values: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, T] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get(self) -> T:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            value = self._values.get(loop)
+            if value is None:
+                value = self._values[loop] = self._factory()
+            return value
+
+    def peek(self) -> T | None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            return self._values.get(loop)
+
+    def pop(self) -> T | None:
+        # Forgets the current loop's value; the next get() builds a fresh one.
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            return self._values.pop(loop, None)
@@ -0,0 +1,335 @@
+"""Dependency-free Prometheus-style metrics registry and text exposition."""
+
+import logging
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    @contextmanager
+    def track(self, **labels: str) -> Iterator[None]:
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum.
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[idx] += 1
+            counts[-1] += 1
+            self._sums[key] += value
+
+    def count(self, **labels: str) -> int:
+        counts = self._counts.get(self._key(labels))
+        return counts[-1] if counts else 0
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(
+                (key, list(counts), self._sums[key]) for key, counts in self._counts.items()
+            )
+        lines: list[str] = []
+        for key, counts, total in items:
+            labels = _format_labels(self.labelnames, key)
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                le = f'le="{_format_value(bound)}"'
+                bucket_labels = _format_labels(self.labelnames, key, le)
+                lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {counts[-1]}")
+        return lines
+
+
+MetricT = TypeVar("MetricT", bound=_Metric)
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: MetricT) -> MetricT:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+# Label values must come from small fixed sets; never label by argument or user id.
+LLM_GENERATE_SECONDS = REGISTRY.histogram(
+    "aas_llm_generate_seconds",
+    "Latency of generate_turn_text, by outcome.",
+    ("outcome",),
+)
+PERSIST_EVENT_SECONDS = REGISTRY.histogram(
+    "aas_persist_event_seconds",
+    "Latency of persist_event (flush plus publish), by event type.",
+    ("event_type",),
+)
+DB_COMMIT_SECONDS = REGISTRY.histogram(
+    "aas_db_commit_seconds",
+    "Latency of session commits, including the final flush.",
+)
+EVENT_BUS_PUBLISH_SECONDS = REGISTRY.histogram(
+    "aas_event_bus_publish_seconds",
+    "Latency of EventBus.publish, by transport.",
+    ("transport",),
+)
+ACTIVE_STREAMS = REGISTRY.gauge(
+    "aas_active_streams",
+    "Spectator streams currently attached to this process.",
+    ("transport",),
+)
+STREAM_DISCONNECTS = REGISTRY.counter(
+    "aas_stream_disconnects_total",
+    "Spectator streams closed by the server, by reason.",
+    ("reason",),
+)
+RUNNING_DEBATES = REGISTRY.gauge(
+    "aas_running_debates",
+    "Debates currently executing in this process.",
+)
+DEBATE_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "aas_debate_queue_wait_seconds",
+    "Time from start request until a debate was admitted to run, by lane.",
+    ("lane",),
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+)
+DEBATE_CANCEL_SECONDS = REGISTRY.histogram(
+    "aas_debate_cancel_seconds",
+    "Time from a cancel request until the debate was finalized.",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+ADMISSION_SHED = REGISTRY.counter(
+    "aas_admission_shed_total",
+    "Start requests rejected because the standard lane was over its queue-wait SLO.",
+)
+LLM_TEMPLATE_FALLBACKS = REGISTRY.counter(
+    "aas_llm_template_fallbacks_total",
+    "Turns that fell back to the template text, by reason.",
+    ("reason",),
+)
+LLM_PROMPT_TOKENS = REGISTRY.counter(
+    "aas_llm_prompt_tokens_total",
+    "Prompt tokens reported by the provider, by whether its prefix cache served them.",
+    ("cache",),
+)
+LLM_COMPLETION_TOKENS = REGISTRY.counter(
+    "aas_llm_completion_tokens_total",
+    "Completion tokens reported by the provider.",
+)
+MODERATION_FLAGS = REGISTRY.counter(
+    "aas_moderation_flags_total",
+    "Generated turns redacted by moderation.",
+)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+
+def start_metrics_server(
+    port: int, *, host: str = "0.0.0.0", max_port_offset: int = 16
+) -> int | None:
+    # Dramatiq forks several worker processes from one command line; each process takes
+    # the first free port starting at `port` so every one of them stays scrapeable.
+    for offset in range(max_port_offset):
+        try:
+            server = ThreadingHTTPServer((host, port + offset), _MetricsHandler)
+        except OSError:
+            continue
+        thread = threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True)
+        thread.start()
+        logger.info("Metrics exporter listening on %s:%s", host, port + offset)
+        return port + offset
+    logger.warning("No free metrics port in %s-%s", port, port + max_port_offset - 1)
+    return None
@@ -0,0 +1,11 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    # orjson encodes datetimes, enums and UUIDs natively, so handlers can return plain row
+    # dicts without a jsonable_encoder pass.
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
@@ -9,6 +9,7 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -99,6 +100,9 @@ class Argument(Base):
     target_max_tokens: Mapped[int] = mapped_column(Integer, default=140)
     audience_mode: Mapped[bool] = mapped_column(Boolean, default=False)
     turn_count: Mapped[int] = mapped_column(Integer, default=0)
+    # Provider-reported token totals across all turns; template turns add nothing.
+    prompt_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    completion_tokens: Mapped[int] = mapped_column(Integer, default=0)
     start_idempotency_key: Mapped[str | None] = mapped_column(String(120), nullable=True)
     started_by_user_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -110,6 +114,8 @@ class ArgumentParticipant(Base):
     __tablename__ = "argument_participants"
     __table_args__ = (
         UniqueConstraint("argument_id", "user_id", name="uq_argument_participant_user"),
+        # Covers the dashboard lookup: a user's argument ids without touching participant rows.
+        Index("ix_argument_participants_user_argument", "user_id", "argument_id"),
     )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -153,6 +159,12 @@ class Turn(Base):
 
 class TurnEvent(Base):
     __tablename__ = "turn_events"
+    __table_args__ = (
+        # Retention scans expire one event type at a time by age.
+        Index("ix_turn_events_type_created", "event_type", "created_at"),
+        # Event ids are stream cursors; SQLite must never hand out a trimmed id again.
+        {"sqlite_autoincrement": True},
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     argument_id: Mapped[str] = mapped_column(ForeignKey("arguments.id", ondelete="CASCADE"), index=True)
@@ -162,6 +174,31 @@ class TurnEvent(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
 
 
+class ArgumentSnapshot(Base):
+    __tablename__ = "argument_snapshots"
+
+    argument_id: Mapped[str] = mapped_column(
+        ForeignKey("arguments.id", ondelete="CASCADE"), primary_key=True
+    )
+    last_event_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    state: Mapped[dict] = mapped_column(JSON, default=dict)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+
+
+class ArgumentArchive(Base):
+    __tablename__ = "argument_archives"
+
+    argument_id: Mapped[str] = mapped_column(
+        ForeignKey("arguments.id", ondelete="CASCADE"), primary_key=True
+    )
+    digest: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_event_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    reaction_counts: Mapped[dict] = mapped_column(JSON, default=dict)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+
+
 class BadgeAward(Base):
     __tablename__ = "badges_awarded"
 
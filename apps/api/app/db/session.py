@@ -1,8 +1,12 @@
+import time
 from collections.abc import AsyncGenerator
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
+from app.core.metrics import DB_COMMIT_SECONDS
 from app.db.base import Base
 
 settings = get_settings()
@@ -10,6 +14,25 @@ settings = get_settings()
 engine = create_async_engine(settings.database_url, echo=False, future=True)
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
+_COMMIT_STARTED_KEY = "metrics_commit_started"
+
+
+@event.listens_for(Session, "before_commit")
+def _mark_commit_started(session: Session) -> None:
+    session.info[_COMMIT_STARTED_KEY] = time.perf_counter()
+
+
+@event.listens_for(Session, "after_commit")
+def _observe_commit(session: Session) -> None:
+    started = session.info.pop(_COMMIT_STARTED_KEY, None)
+    if started is not None:
+        DB_COMMIT_SECONDS.observe(time.perf_counter() - started)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_commit_timer(session: Session) -> None:
+    session.info.pop(_COMMIT_STARTED_KEY, None)
+
 
 async def init_db() -> None:
     async with engine.begin() as conn:
@@ -5,9 +5,10 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.router import api_router
 from app.core.config import get_settings
+from app.core.responses import ORJSONResponse
 from app.db import models  # noqa: F401
 from app.db.session import init_db
-from app.services.events import EventBus, set_event_bus
+from app.services.event_bus import create_event_bus, set_event_bus
 
 settings = get_settings()
 
@@ -15,8 +16,7 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
-    bus = EventBus(settings.redis_url)
-    await bus.connect()
+    bus = create_event_bus()
     set_event_bus(bus)
     try:
         yield
@@ -24,7 +24,12 @@ async def lifespan(app: FastAPI):
         await bus.close()
 
 
-app = FastAPI(title="AaS API", version="0.1.0", lifespan=lifespan)
+app = FastAPI(
+    title="AaS API",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -104,6 +104,7 @@ class TurnView(BaseModel):
 
 class TurnEventView(BaseModel):
     id: int
+    argument_id: str
     turn_index: int | None
     event_type: str
     payload: dict
@@ -124,8 +125,15 @@ class MyArgumentsResponse(BaseModel):
     active: list[ArgumentListItem]
     past: list[ArgumentListItem]
     credits_balance: int
+    active_next_cursor: str | None = None
+    past_next_cursor: str | None = None
 
 
 class StartResponse(BaseModel):
     argument_id: str
     status: Literal["started", "already_started"]
+
+
+class CancelResponse(BaseModel):
+    argument_id: str
+    status: Literal["cancel_requested"]
@@ -0,0 +1,255 @@
+"""Admission control for running debates: per-worker and global caps with an ordered wait queue.
+
+Running debates hold a lease in a Redis sorted set (member = argument id, score = lease expiry),
+which acts as a global counting semaphore. Waiters sit in two lanes ordered by queue time, and
+the priority lane (audience-mode debates) is always admitted first. Leases and waiters that stop
+refreshing expire, so a crashed worker never leaks a slot. Without Redis the same structures live
+in-process and the caps apply per process; a call that fails on Redis falls back to them once and
+the next call tries Redis again.
+"""
+
+import threading
+import time
+from contextlib import suppress
+
+from redis.asyncio import Redis
+
+from app.core.config import get_settings
+from app.core.loops import LoopLocal
+
+settings = get_settings()
+
+RUNNING_KEY = "admission:running"
+PRIORITY_KEY = "admission:waiting:priority"
+STANDARD_KEY = "admission:waiting:standard"
+SEEN_KEY = "admission:waiting:seen"
+
+# KEYS: running, priority, standard, seen. ARGV: member, now, lease expiry, limit, stale before.
+_ACQUIRE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+local stale = redis.call('ZRANGEBYSCORE', KEYS[4], '-inf', ARGV[5])
+for _, member in ipairs(stale) do
+    redis.call('ZREM', KEYS[2], member)
+    redis.call('ZREM', KEYS[3], member)
+    redis.call('ZREM', KEYS[4], member)
+end
+local limit = tonumber(ARGV[4])
+if limit > 0 and not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    local free = limit - redis.call('ZCARD', KEYS[1])
+    local rank = redis.call('ZRANK', KEYS[2], ARGV[1])
+    if not rank then
+        rank = redis.call('ZRANK', KEYS[3], ARGV[1])
+        if rank then
+            rank = rank + redis.call('ZCARD', KEYS[2])
+        end
+    end
+    if free <= 0 or (rank and rank >= free) then
+        return 0
+    end
+end
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('ZREM', KEYS[3], ARGV[1])
+redis.call('ZREM', KEYS[4], ARGV[1])
+return 1
+"""
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        redis_url: str | None,
+        *,
+        global_limit: int,
+        local_limit: int,
+        lease_seconds: float,
+    ) -> None:
+        self.redis_url = redis_url
+        self.global_limit = global_limit
+        self.local_limit = local_limit
+        self.lease_seconds = lease_seconds
+        # Dramatiq actors run each message under their own asyncio.run, so clients are per loop.
+        self._redis: LoopLocal[Redis] = LoopLocal(
+            lambda: Redis.from_url(redis_url, decode_responses=False)
+        )
+        # Local state is shared by worker threads, each with its own event loop.
+        self._lock = threading.Lock()
+        self._local_running: set[str] = set()
+        self._running: dict[str, float] = {}
+        self._priority: dict[str, float] = {}
+        self._standard: dict[str, float] = {}
+        self._seen: dict[str, float] = {}
+
+    def _redis_client(self) -> Redis | None:
+        return self._redis.get() if self.redis_url else None
+
+    async def _reset_redis(self) -> None:
+        # Only the failing call falls back to in-process admission; the global cap would silently
+        # become a per-process one if Redis were given up for good.
+        redis = self._redis.pop()
+        if redis is not None:
+            with suppress(Exception):
+                await redis.aclose()
+
+    async def enqueue(self, argument_id: str, *, queued_at: float, priority: bool) -> None:
+        """Join (or stay in) the wait queue; call again periodically to keep the place."""
+        now = time.time()
+        lane_key = PRIORITY_KEY if priority else STANDARD_KEY
+        redis = self._redis_client()
+        if redis is not None:
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    pipe.zadd(lane_key, {argument_id: queued_at}, nx=True)
+                    pipe.zadd(SEEN_KEY, {argument_id: now})
+                    await pipe.execute()
+                return
+            except Exception:
+                await self._reset_redis()
+        with self._lock:
+            (self._priority if priority else self._standard).setdefault(argument_id, queued_at)
+            self._seen[argument_id] = now
+
+    async def try_acquire(self, argument_id: str) -> bool:
+        with self._lock:
+            local_full = 0 < self.local_limit <= len(self._local_running)
+        if local_full and argument_id not in self._local_running:
+            # Step out of the shared lanes so this worker's backlog does not hold up workers with
+            # free slots; the lane score is the original queue time, so re-enqueueing keeps order.
+            await self._withdraw(argument_id)
+            return False
+        if not await self._acquire_global(argument_id, time.time()):
+            return False
+        with self._lock:
+            self._local_running.add(argument_id)
+        return True
+
+    async def _acquire_global(self, argument_id: str, now: float) -> bool:
+        redis = self._redis_client()
+        if redis is not None:
+            try:
+                result = await redis.eval(
+                    _ACQUIRE_SCRIPT,
+                    4,
+                    RUNNING_KEY,
+                    PRIORITY_KEY,
+                    STANDARD_KEY,
+                    SEEN_KEY,
+                    argument_id,
+                    now,
+                    now + self.lease_seconds,
+                    self.global_limit,
+                    now - self.lease_seconds,
+                )
+                return bool(result)
+            except Exception:
+                await self._reset_redis()
+
+        with self._lock:
+            for member, expires_at in list(self._running.items()):
+                if expires_at < now:
+                    del self._running[member]
+            for member, seen_at in list(self._seen.items()):
+                if seen_at < now - self.lease_seconds:
+                    self._forget(member)
+            if self.global_limit > 0 and argument_id not in self._running:
+                free = self.global_limit - len(self._running)
+                rank = self._rank(argument_id)
+                if free <= 0 or (rank is not None and rank >= free):
+                    return False
+            self._running[argument_id] = now + self.lease_seconds
+            self._forget(argument_id)
+            return True
+
+    def _forget(self, argument_id: str) -> None:
+        self._priority.pop(argument_id, None)
+        self._standard.pop(argument_id, None)
+        self._seen.pop(argument_id, None)
+
+    def _rank(self, argument_id: str) -> int | None:
+        for offset, lane in ((0, self._priority), (len(self._priority), self._standard)):
+            queued_at = lane.get(argument_id)
+            if queued_at is not None:
+                key = (queued_at, argument_id)
+                return offset + sum(1 for member, other in lane.items() if (other, member) < key)
+        return None
+
+    async def position(self, argument_id: str) -> int | None:
+        """1-based place in the wait queue, or None when the argument is not waiting."""
+        redis = self._redis_client()
+        if redis is not None:
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    pipe.zrank(PRIORITY_KEY, argument_id)
+                    pipe.zrank(STANDARD_KEY, argument_id)
+                    pipe.zcard(PRIORITY_KEY)
+                    priority_rank, standard_rank, priority_count = await pipe.execute()
+                if priority_rank is not None:
+                    return priority_rank + 1
+                return None if standard_rank is None else priority_count + standard_rank + 1
+            except Exception:
+                await self._reset_redis()
+        with self._lock:
+            rank = self._rank(argument_id)
+        return None if rank is None else rank + 1
+
+    async def renew(self, argument_id: str) -> None:
+        expires_at = time.time() + self.lease_seconds
+        redis = self._redis_client()
+        if redis is not None:
+            try:
+                await redis.zadd(RUNNING_KEY, {argument_id: expires_at}, xx=True)
+                return
+            except Exception:
+                await self._reset_redis()
+        with self._lock:
+            if argument_id in self._running:
+                self._running[argument_id] = expires_at
+
+    async def release(self, argument_id: str) -> None:
+        with self._lock:
+            self._local_running.discard(argument_id)
+        await self._withdraw(argument_id, running=True)
+
+    async def _withdraw(self, argument_id: str, *, running: bool = False) -> None:
+        redis = self._redis_client()
+        if redis is not None:
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    for key in (RUNNING_KEY,) * running + (PRIORITY_KEY, STANDARD_KEY, SEEN_KEY):
+                        pipe.zrem(key, argument_id)
+                    await pipe.execute()
+                return
+            except Exception:
+                await self._reset_redis()
+        with self._lock:
+            if running:
+                self._running.pop(argument_id, None)
+            self._forget(argument_id)
+
+    async def standard_wait_seconds(self) -> float:
+        """How long the oldest standard-lane waiter has been queued; this is what gets shed."""
+        now = time.time()
+        redis = self._redis_client()
+        if redis is not None:
+            try:
+                head = await redis.zrange(STANDARD_KEY, 0, 0, withscores=True)
+                return max(0.0, now - head[0][1]) if head else 0.0
+            except Exception:
+                await self._reset_redis()
+        with self._lock:
+            return max(0.0, now - min(self._standard.values())) if self._standard else 0.0
+
+
+_admission: AdmissionController | None = None
+
+
+def get_admission_controller() -> AdmissionController:
+    global _admission
+    if _admission is None:
+        _admission = AdmissionController(
+            settings.redis_url,
+            global_limit=settings.max_running_debates,
+            local_limit=settings.max_running_debates_per_worker,
+            lease_seconds=settings.admission_lease_seconds,
+        )
+    return _admission
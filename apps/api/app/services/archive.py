@@ -0,0 +1,230 @@
+"""Cold storage for finished arguments: one compressed, content-addressed blob per argument."""
+
+import asyncio
+import hashlib
+import mmap
+import os
+import tempfile
+import zlib
+from collections import OrderedDict
+from datetime import UTC, datetime
+from pathlib import Path
+
+import orjson
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.models import (
+    Argument,
+    ArgumentArchive,
+    ArgumentReport,
+    ArgumentStatus,
+    BadgeAward,
+    Turn,
+    TurnEvent,
+)
+from app.db.session import SessionLocal
+from app.services.wire import WIRE_EVENT_COLUMNS, WireEvent
+
+settings = get_settings()
+
+ARCHIVE_VERSION = 1
+# Blobs are immutable once written, so decoded archives can be cached by digest without
+# invalidation; the cap only bounds memory.
+ARCHIVE_CACHE_SIZE = 64
+
+
+class LocalArchiveStore:
+    # Filesystem stand-in for an object store: keys are sha256 digests of the uncompressed blob,
+    # fanned out over two-character prefixes like most bucket layouts.
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.ndjson.z"
+
+    def put(self, digest: str, data: bytes) -> None:
+        target = self.path(digest)
+        if target.exists():
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_path, target)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def get(self, digest: str) -> bytes:
+        # zlib reads straight from the mapping, so the compressed bytes are never copied.
+        with (
+            open(self.path(digest), "rb") as handle,
+            mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+        ):
+            return zlib.decompress(mapped)
+
+
+class ArchivedArgument:
+    __slots__ = ("badges", "events", "last_event_id", "turns")
+
+    def __init__(self, header: dict, events: list[WireEvent]) -> None:
+        self.turns: list[dict] = header["turns"]
+        self.badges: list[dict] = header["badges"]
+        self.last_event_id: int = header["last_event_id"]
+        self.events = events
+
+
+def encode_archive(
+    *, argument_id: str, turns: list[dict], badges: list[dict], events: list[WireEvent]
+) -> bytes:
+    # Line one is the header; every other line is an event in bus wire format (`<id>:<json>`),
+    # so replays can hand the stored bytes to the stream without re-encoding them.
+    header = {
+        "version": ARCHIVE_VERSION,
+        "argument_id": argument_id,
+        "last_event_id": events[-1].id if events else 0,
+        "turns": turns,
+        "badges": badges,
+    }
+    return b"\n".join([orjson.dumps(header), *(event.pack() for event in events)])
+
+
+def decode_archive(raw: bytes) -> ArchivedArgument:
+    lines = raw.split(b"\n")
+    header = orjson.loads(lines[0])
+    if header.get("version") != ARCHIVE_VERSION:
+        raise ValueError(f"Unsupported archive version: {header.get('version')}")
+    return ArchivedArgument(header, [WireEvent.unpack(line) for line in lines[1:] if line])
+
+
+def get_archive_store() -> LocalArchiveStore:
+    return LocalArchiveStore(settings.archive_dir)
+
+
+_cache: OrderedDict[str, ArchivedArgument] = OrderedDict()
+
+
+def _read_archive(digest: str) -> ArchivedArgument:
+    return decode_archive(get_archive_store().get(digest))
+
+
+async def load_archive(session: AsyncSession, argument_id: str) -> ArchivedArgument | None:
+    row = await session.execute(
+        select(ArgumentArchive.digest).where(ArgumentArchive.argument_id == argument_id)
+    )
+    digest = row.scalar_one_or_none()
+    if digest is None:
+        return None
+    archived = _cache.get(digest)
+    if archived is None:
+        archived = await asyncio.to_thread(_read_archive, digest)
+        _cache[digest] = archived
+        while len(_cache) > ARCHIVE_CACHE_SIZE:
+            _cache.popitem(last=False)
+    else:
+        _cache.move_to_end(digest)
+    return archived
+
+
+def _turn_record(turn: Turn) -> dict:
+    return {
+        "id": turn.id,
+        "turn_index": turn.turn_index,
+        "speaker_participant_id": turn.speaker_participant_id,
+        "phase": turn.phase.value,
+        "content": turn.content,
+        "metrics": turn.metrics,
+        "model_metadata": turn.model_metadata,
+        "created_at": turn.created_at.isoformat(),
+    }
+
+
+def _badge_record(badge: BadgeAward) -> dict:
+    return {
+        "id": badge.id,
+        "turn_id": badge.turn_id,
+        "badge_key": badge.badge_key,
+        "reason": badge.reason,
+        "confidence": badge.confidence,
+        "created_at": badge.created_at.isoformat(),
+    }
+
+
+async def archive_argument(argument_id: str) -> str | None:
+    async with SessionLocal() as session:
+        argument = await session.get(Argument, argument_id)
+        if argument is None or argument.status not in {
+            ArgumentStatus.COMPLETED,
+            ArgumentStatus.FAILED,
+        }:
+            return None
+        if await session.get(ArgumentArchive, argument_id) is not None:
+            return None
+        # The wrapped report is built from the hot turns; never trim them before it exists.
+        report = await session.execute(
+            select(ArgumentReport.id).where(ArgumentReport.argument_id == argument_id)
+        )
+        if report.scalar_one_or_none() is None:
+            return None
+
+        turn_rows = await session.execute(
+            select(Turn).where(Turn.argument_id == argument_id).order_by(Turn.turn_index.asc())
+        )
+        badge_rows = await session.execute(
+            select(BadgeAward)
+            .where(BadgeAward.argument_id == argument_id)
+            .order_by(BadgeAward.created_at.asc())
+        )
+        event_rows = await session.execute(
+            select(*WIRE_EVENT_COLUMNS)
+            .where(TurnEvent.argument_id == argument_id)
+            .order_by(TurnEvent.id.asc())
+        )
+        events = [WireEvent.from_row(row) for row in event_rows]
+        raw = encode_archive(
+            argument_id=argument_id,
+            turns=[_turn_record(turn) for turn in turn_rows.scalars().all()],
+            badges=[_badge_record(badge) for badge in badge_rows.scalars().all()],
+            events=events,
+        )
+        last_event_id = events[-1].id if events else 0
+
+        emoji = TurnEvent.payload["emoji"].as_string()
+        tallies = await session.execute(
+            select(emoji, func.count(TurnEvent.id))
+            .where(TurnEvent.argument_id == argument_id)
+            .where(TurnEvent.event_type == "reaction.added")
+            .where(TurnEvent.id <= last_event_id)
+            .group_by(emoji)
+        )
+
+        digest = hashlib.sha256(raw).hexdigest()
+        compressed = zlib.compress(raw, 6)
+        # Write the blob before trimming anything: a crash in between leaves a harmless orphan.
+        await asyncio.to_thread(get_archive_store().put, digest, compressed)
+
+        session.add(
+            ArgumentArchive(
+                argument_id=argument_id,
+                digest=digest,
+                size_bytes=len(compressed),
+                event_count=len(events),
+                last_event_id=last_event_id,
+                reaction_counts={str(key): int(count) for key, count in tallies.all()},
+                created_at=datetime.now(UTC),
+            )
+        )
+        await session.execute(
+            delete(TurnEvent)
+            .where(TurnEvent.argument_id == argument_id)
+            .where(TurnEvent.id <= last_event_id)
+        )
+        await session.execute(delete(BadgeAward).where(BadgeAward.argument_id == argument_id))
+        await session.execute(delete(Turn).where(Turn.argument_id == argument_id))
+        await session.commit()
+        return digest
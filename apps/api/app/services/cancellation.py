@@ -0,0 +1,90 @@
+"""Cooperative cancellation of running debates.
+
+A cancel request is persisted as an `argument.cancel_requested` event, so it reaches the worker
+running the debate over the event bus (and spectators see it like any other event). The worker
+keeps a CancelWatch subscribed to its argument's events; the watch also checks the database for a
+request persisted before it subscribed, e.g. while the debate was still queued, and again between
+turns, so a request the bus failed to deliver still stops the debate.
+"""
+
+import asyncio
+from contextlib import suppress
+from datetime import UTC, datetime
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import TurnEvent
+from app.db.session import SessionLocal
+from app.services.event_bus import get_event_bus
+from app.services.events import persist_event
+
+CANCEL_EVENT_TYPE = "argument.cancel_requested"
+# orjson emits no whitespace, so the type can be matched on the wire bytes of every event the
+# watch sees without parsing them; turn text cannot forge it because quotes arrive escaped.
+_CANCEL_MARKER = b'"event_type":"argument.cancel_requested"'
+
+
+async def request_cancel(session: AsyncSession, argument_id: str, *, reason: str) -> TurnEvent:
+    return await persist_event(
+        session,
+        argument_id=argument_id,
+        event_type=CANCEL_EVENT_TYPE,
+        payload={"reason": reason},
+    )
+
+
+class CancelWatch:
+    __slots__ = ("_task", "argument_id", "reason", "requested", "requested_at")
+
+    def __init__(self, argument_id: str) -> None:
+        self.argument_id = argument_id
+        self.requested = asyncio.Event()
+        self.requested_at: datetime | None = None
+        self.reason: str | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> "CancelWatch":
+        self._task = asyncio.create_task(self._listen())
+        await self.check()
+        return self
+
+    async def check(self) -> bool:
+        if self.requested.is_set():
+            return True
+        async with SessionLocal() as session:
+            result = await session.execute(
+                select(TurnEvent.payload, TurnEvent.created_at)
+                .where(TurnEvent.argument_id == self.argument_id)
+                .where(TurnEvent.event_type == CANCEL_EVENT_TYPE)
+                .limit(1)
+            )
+            row = result.first()
+        if row is not None:
+            self._mark(row.payload, row.created_at)
+        return self.requested.is_set()
+
+    async def _listen(self) -> None:
+        async for event in get_event_bus().subscribe(self.argument_id):
+            if _CANCEL_MARKER not in event.data:
+                continue
+            data = orjson.loads(event.data)
+            if data["event_type"] == CANCEL_EVENT_TYPE:
+                self._mark(data["payload"], datetime.fromisoformat(data["created_at"]))
+                return
+
+    def _mark(self, payload: dict, created_at: datetime) -> None:
+        if self.requested.is_set():
+            return
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=UTC)
+        self.reason = str(payload.get("reason") or "cancelled")
+        self.requested_at = created_at
+        self.requested.set()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
@@ -1,31 +1,102 @@
-from sqlalchemy import Select, select
+import time
+from datetime import UTC, datetime
+
+from sqlalchemy import Select, event, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.db.models import CreditLedger, User
 
 settings = get_settings()
 
+MAX_KNOWN_USERS = 10_000
+_PENDING_USERS_KEY = "credits_pending_known_users"
+
+
+class KnownUsers:
+    # user_id -> (handle, expires_at) for users whose row is known to be committed. Entries are
+    # only added after commit, so a rolled-back first request never hides a missing user row.
+    def __init__(self, ttl_seconds: float, max_entries: int = MAX_KNOWN_USERS) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[str, tuple[str, float]] = {}
+
+    def matches(self, user_id: str, handle: str | None) -> bool:
+        known = self._entries.get(user_id)
+        if known is None:
+            return False
+        if known[1] < time.monotonic():
+            del self._entries[user_id]
+            return False
+        return not handle or handle == known[0]
+
+    def remember(self, user_id: str, handle: str) -> None:
+        now = time.monotonic()
+        if len(self._entries) >= self.max_entries:
+            for stale_id in [key for key, (_, expires_at) in self._entries.items() if expires_at < now]:
+                del self._entries[stale_id]
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+        self._entries[user_id] = (handle, now + self.ttl_seconds)
+
+    def forget(self, user_id: str) -> None:
+        self._entries.pop(user_id, None)
+
+
+known_users = KnownUsers(settings.user_cache_ttl_seconds)
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_committed_users(session: Session) -> None:
+    for user_id, handle in session.info.pop(_PENDING_USERS_KEY, {}).items():
+        known_users.remember(user_id, handle)
 
-async def ensure_user(session: AsyncSession, user_id: str, handle: str | None = None) -> User:
-    user = await session.get(User, user_id)
-    if user:
-        if handle and handle != user.handle:
-            user.handle = handle
-            await session.flush()
-        return user
-
-    user = User(id=user_id, handle=handle or "anonymous")
-    session.add(user)
-    seed = CreditLedger(
-        user_id=user.id,
-        delta=settings.initial_credits,
-        reason="signup_seed",
-        balance_after=settings.initial_credits,
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_users(session: Session) -> None:
+    session.info.pop(_PENDING_USERS_KEY, None)
+
+
+def _insert_user_if_missing(dialect_name: str, user_id: str, handle: str):
+    insert = pg_insert if dialect_name == "postgresql" else sqlite_insert
+    return (
+        insert(User)
+        .values(id=user_id, handle=handle, created_at=datetime.now(UTC))
+        .on_conflict_do_nothing(index_elements=[User.id])
     )
-    session.add(seed)
-    await session.flush()
-    return user
+
+
+async def ensure_user(session: AsyncSession, user_id: str, handle: str | None = None) -> None:
+    if known_users.matches(user_id, handle):
+        return
+
+    # Insert-or-ignore makes the first-request race safe: concurrent inserts of the same id wait
+    # on the primary key and only the transaction that actually inserted seeds credits.
+    inserted = await session.execute(
+        _insert_user_if_missing(session.bind.dialect.name, user_id, handle or "anonymous")
+    )
+    if inserted.rowcount:
+        session.add(
+            CreditLedger(
+                user_id=user_id,
+                delta=settings.initial_credits,
+                reason="signup_seed",
+                balance_after=settings.initial_credits,
+            )
+        )
+        await session.flush()
+    elif handle:
+        await session.execute(
+            update(User).where(User.id == user_id, User.handle != handle).values(handle=handle)
+        )
+    if handle:
+        session.info.setdefault(_PENDING_USERS_KEY, {})[user_id] = handle
+    else:
+        # The stored handle is unknown here; a later request with a handle re-checks it.
+        known_users.forget(user_id)
 
 
 def _latest_balance_stmt(user_id: str) -> Select[tuple[int]]:
@@ -0,0 +1,387 @@
+"""Cross-process delivery of argument events through a pluggable backend.
+
+`EventBus` hands every event straight to subscribers in its own process and publishes it through
+one `EventBackend` for the other processes. Messages carry the publishing bus's origin tag, so
+the backend's copy is not delivered a second time in the process that sent it. When the backend
+fails, in-process delivery keeps a single-process deployment working. Backends: Redis pub/sub,
+Postgres LISTEN/NOTIFY (no Redis needed), or an in-process stand-in for tests.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import suppress
+from typing import Protocol
+from uuid import uuid4
+
+import asyncpg
+from redis.asyncio import Redis
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.loops import LoopLocal
+from app.core.metrics import EVENT_BUS_PUBLISH_SECONDS
+from app.db.models import TurnEvent
+from app.db.session import SessionLocal
+from app.services.wire import WIRE_EVENT_COLUMNS, WireEvent
+
+settings = get_settings()
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more; bigger events travel as their id alone.
+NOTIFY_PAYLOAD_LIMIT = 7999
+# Publishers notify before their transaction commits, so an id-only event may not be visible yet.
+LOAD_RETRY_DELAYS = (0.0, 0.01, 0.05, 0.1, 0.25, 0.5)
+# Backoff between attempts to resubscribe a relay whose backend subscription failed.
+RELAY_RETRY_DELAYS = (0.5, 1.0, 2.0, 5.0)
+# After a failed publish, events are delivered in-process only for this long before the backend
+# is tried again, so a missing Redis costs one connect attempt per interval rather than per token.
+PUBLISH_RETRY_SECONDS = 5.0
+REDIS_CONNECT_TIMEOUT_SECONDS = 1.0
+
+# (origin tag of the publishing bus, event)
+_Message = tuple[str, WireEvent]
+
+
+def _channel(argument_id: str) -> str:
+    return f"argument:{argument_id}:events"
+
+
+def _frame(origin: str, packed: bytes) -> bytes:
+    return b"%b/%b" % (origin.encode(), packed)
+
+
+def _unframe(raw: bytes) -> tuple[str, bytes]:
+    # Messages from processes that predate origin tags have no "origin/" head; they are never
+    # this process's own, so an empty origin is delivered.
+    slash = raw.find(b"/")
+    if slash < 0 or raw.startswith(b"{") or b":" in raw[:slash]:
+        return "", raw
+    return raw[:slash].decode(), raw[slash + 1 :]
+
+
+class EventBackend(Protocol):
+    # Methods raise on transport failure; EventBus then keeps to in-process delivery. Connections
+    # are per event loop, and close() releases the ones of the running loop.
+    # Subscribers skip events published with `ignore_origin` before doing any work on them.
+    transport: str
+
+    async def close(self) -> None: ...
+
+    async def publish(self, argument_id: str, event: WireEvent, *, origin: str) -> None: ...
+
+    def subscribe(
+        self, argument_id: str, *, ignore_origin: str | None = None
+    ) -> AsyncIterator[WireEvent]: ...
+
+
+class LocalBackend:
+    # Shared by several buses in one process, it stands in for a network backend in tests.
+    transport = "local"
+
+    def __init__(self) -> None:
+        self._queues: dict[str, set[asyncio.Queue[_Message]]] = defaultdict(set)
+
+    async def close(self) -> None:
+        return None
+
+    async def publish(self, argument_id: str, event: WireEvent, *, origin: str) -> None:
+        for queue in self._queues.get(argument_id, ()):
+            queue.put_nowait((origin, event))
+
+    async def subscribe(
+        self, argument_id: str, *, ignore_origin: str | None = None
+    ) -> AsyncIterator[WireEvent]:
+        queue: asyncio.Queue[_Message] = asyncio.Queue()
+        self._queues[argument_id].add(queue)
+        try:
+            while True:
+                origin, event = await queue.get()
+                if origin != ignore_origin:
+                    yield event
+        finally:
+            subscribers = self._queues[argument_id]
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._queues[argument_id]
+
+
+class RedisBackend:
+    transport = "redis"
+
+    def __init__(self, redis_url: str) -> None:
+        self.redis_url = redis_url
+        # Dramatiq actors run each message under their own asyncio.run, so clients are per loop.
+        self._redis: LoopLocal[Redis] = LoopLocal(
+            lambda: Redis.from_url(
+                redis_url,
+                decode_responses=False,
+                socket_connect_timeout=REDIS_CONNECT_TIMEOUT_SECONDS,
+            )
+        )
+
+    def _client(self) -> Redis:
+        return self._redis.get()
+
+    async def close(self) -> None:
+        redis = self._redis.pop()
+        if redis is not None:
+            with suppress(Exception):
+                await redis.aclose()
+
+    async def publish(self, argument_id: str, event: WireEvent, *, origin: str) -> None:
+        await self._client().publish(_channel(argument_id), _frame(origin, event.pack()))
+
+    async def subscribe(
+        self, argument_id: str, *, ignore_origin: str | None = None
+    ) -> AsyncIterator[WireEvent]:
+        pubsub = self._client().pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(_channel(argument_id))
+        try:
+            async for raw_msg in pubsub.listen():
+                data = raw_msg.get("data")
+                if not data:
+                    continue
+                if isinstance(data, str):
+                    data = data.encode("utf-8")
+                origin, packed = _unframe(data)
+                if origin != ignore_origin:
+                    yield WireEvent.unpack(packed)
+        finally:
+            with suppress(Exception):
+                await pubsub.unsubscribe(_channel(argument_id))
+            await pubsub.aclose()
+
+
+class _PostgresLoop:
+    # The connections and subscriber queues of one event loop; asyncpg objects cannot cross loops.
+    __slots__ = ("listener", "lock", "pool", "queues")
+
+    def __init__(self) -> None:
+        self.pool: asyncpg.Pool | None = None
+        self.listener: asyncpg.Connection | None = None
+        self.lock = asyncio.Lock()
+        self.queues: dict[str, set[asyncio.Queue[_Message | None]]] = defaultdict(set)
+
+    def on_notify(self, connection: object, pid: int, channel: str, payload: str) -> None:
+        origin, packed = _unframe(payload.encode("utf-8"))
+        message = (origin, WireEvent.unpack(packed))
+        for queue in self.queues.get(channel, ()):
+            queue.put_nowait(message)
+
+    def on_terminated(self, connection: object) -> None:
+        for subscribers in self.queues.values():
+            for queue in subscribers:
+                queue.put_nowait(None)
+
+
+class PostgresBackend:
+    # One LISTEN connection per event loop carries every subscribed argument's channel and fans
+    # notifications out to local queues; publishes go through a small pool. The API has one loop,
+    # while each worker thread has one per message.
+    transport = "postgres"
+
+    def __init__(
+        self,
+        dsn: str,
+        *,
+        session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+        pool_size: int = 4,
+    ) -> None:
+        self.dsn = dsn
+        self.session_factory = session_factory
+        self.pool_size = pool_size
+        self._loops: LoopLocal[_PostgresLoop] = LoopLocal(_PostgresLoop)
+
+    async def close(self) -> None:
+        state = self._loops.pop()
+        if state is None:
+            return
+        # Wake current subscribers so the bus can move them to in-process delivery.
+        state.on_terminated(None)
+        state.queues.clear()
+        listener, pool = state.listener, state.pool
+        state.listener = None
+        state.pool = None
+        if listener is not None:
+            with suppress(Exception):
+                await listener.close()
+        if pool is not None:
+            with suppress(Exception):
+                await pool.close()
+
+    async def publish(self, argument_id: str, event: WireEvent, *, origin: str) -> None:
+        state = self._loops.get()
+        if state.pool is None:
+            async with state.lock:
+                if state.pool is None:
+                    state.pool = await asyncpg.create_pool(
+                        self.dsn, min_size=1, max_size=self.pool_size
+                    )
+        payload = _frame(origin, event.pack())
+        if len(payload) > NOTIFY_PAYLOAD_LIMIT:
+            payload = _frame(origin, b"%d:" % event.id)
+        await state.pool.execute(
+            "SELECT pg_notify($1, $2)", _channel(argument_id), payload.decode("utf-8")
+        )
+
+    async def subscribe(
+        self, argument_id: str, *, ignore_origin: str | None = None
+    ) -> AsyncIterator[WireEvent]:
+        channel = _channel(argument_id)
+        queue: asyncio.Queue[_Message | None] = asyncio.Queue()
+        state = self._loops.get()
+        async with state.lock:
+            if state.listener is None or state.listener.is_closed():
+                state.listener = await asyncpg.connect(self.dsn)
+                state.listener.add_termination_listener(state.on_terminated)
+                state.queues.clear()
+            if not state.queues[channel]:
+                await state.listener.add_listener(channel, state.on_notify)
+            state.queues[channel].add(queue)
+        try:
+            while True:
+                message = await queue.get()
+                if message is None:
+                    raise ConnectionError("Postgres listener connection closed")
+                origin, event = message
+                if origin == ignore_origin:
+                    continue
+                if not event.data:
+                    event = await self._load(event.id)
+                    if event is None:
+                        continue
+                yield event
+        finally:
+            await self._unsubscribe(state, channel, queue)
+
+    async def _unsubscribe(
+        self, state: _PostgresLoop, channel: str, queue: asyncio.Queue[_Message | None]
+    ) -> None:
+        subscribers = state.queues.get(channel)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if subscribers:
+            return
+        del state.queues[channel]
+        listener = state.listener
+        if listener is not None and not listener.is_closed():
+            with suppress(Exception):
+                await listener.remove_listener(channel, state.on_notify)
+
+    async def _load(self, event_id: int) -> WireEvent | None:
+        for delay in LOAD_RETRY_DELAYS:
+            if delay:
+                await asyncio.sleep(delay)
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    select(*WIRE_EVENT_COLUMNS).where(TurnEvent.id == event_id)
+                )
+                row = result.first()
+            if row is not None:
+                return WireEvent.from_row(row)
+        return None
+
+
+class EventBus:
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        *,
+        backend: EventBackend | None = None,
+        origin: str | None = None,
+    ) -> None:
+        if backend is None and redis_url:
+            backend = RedisBackend(redis_url)
+        self.backend = backend
+        self.origin = origin or uuid4().hex
+        self._queues: dict[str, set[asyncio.Queue[WireEvent]]] = defaultdict(set)
+        self._publish_paused_until = 0.0
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+    async def publish(self, argument_id: str, event: WireEvent) -> None:
+        started = time.perf_counter()
+        # Subscribers in this process get the event without a round trip through the backend.
+        for queue in self._queues.get(argument_id, ()):
+            queue.put_nowait(event)
+        transport = "local"
+        if self.backend is not None and started >= self._publish_paused_until:
+            try:
+                await self.backend.publish(argument_id, event, origin=self.origin)
+                transport = self.backend.transport
+            except Exception:
+                # Other processes miss the event; subscribers here already have it.
+                self._publish_paused_until = time.perf_counter() + PUBLISH_RETRY_SECONDS
+                await self.backend.close()
+        EVENT_BUS_PUBLISH_SECONDS.observe(time.perf_counter() - started, transport=transport)
+
+    async def subscribe(self, argument_id: str) -> AsyncIterator[WireEvent]:
+        queue: asyncio.Queue[WireEvent] = asyncio.Queue()
+        self._queues[argument_id].add(queue)
+        relay = None
+        if self.backend is not None:
+            relay = asyncio.create_task(self._relay(argument_id, queue))
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            if relay is not None:
+                relay.cancel()
+                with suppress(asyncio.CancelledError):
+                    await relay
+            subscribers = self._queues[argument_id]
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._queues[argument_id]
+
+    async def _relay(self, argument_id: str, queue: asyncio.Queue[WireEvent]) -> None:
+        # Feeds events from other processes into a local subscription for as long as it lasts.
+        assert self.backend is not None
+        failures = 0
+        while True:
+            try:
+                async for event in self.backend.subscribe(argument_id, ignore_origin=self.origin):
+                    failures = 0
+                    queue.put_nowait(event)
+            except Exception:
+                # Events published in this process keep arriving while the backend is unavailable.
+                await self.backend.close()
+            await asyncio.sleep(RELAY_RETRY_DELAYS[min(failures, len(RELAY_RETRY_DELAYS) - 1)])
+            failures += 1
+
+
+def asyncpg_dsn(database_url: str) -> str:
+    url = make_url(database_url)
+    if url.get_backend_name() != "postgresql":
+        raise ValueError("EVENT_BUS_BACKEND=postgres needs a PostgreSQL DATABASE_URL")
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def create_event_bus() -> EventBus:
+    backend = settings.event_bus_backend.strip().lower()
+    if backend == "postgres":
+        return EventBus(backend=PostgresBackend(asyncpg_dsn(settings.database_url)))
+    if backend == "local":
+        return EventBus()
+    return EventBus(settings.redis_url)
+
+
+_event_bus: EventBus | None = None
+
+
+def set_event_bus(event_bus: EventBus) -> None:
+    global _event_bus
+    _event_bus = event_bus
+
+
+def get_event_bus() -> EventBus:
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = create_event_bus()
+    return _event_bus
@@ -0,0 +1,144 @@
+"""Per-process fan-out of argument events to stream connections in coalesced, pre-encoded frames."""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
+from app.core.config import get_settings
+from app.core.metrics import STREAM_DISCONNECTS
+from app.services.event_bus import get_event_bus
+from app.services.wire import WireEvent
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class Frame:
+    # Events that arrived within one coalescing window. Event bytes come pre-encoded from the bus;
+    # the batch array and text views are built lazily, once, and shared by every connection.
+    __slots__ = ("_batch_bytes", "_batch_text", "_event_texts", "events")
+
+    def __init__(self, events: list[WireEvent]) -> None:
+        self.events = events
+        self._batch_bytes: bytes | None = None
+        self._batch_text: str | None = None
+        self._event_texts: list[str] | None = None
+
+    @property
+    def batch_bytes(self) -> bytes:
+        if self._batch_bytes is None:
+            self._batch_bytes = b"[" + b",".join(event.data for event in self.events) + b"]"
+        return self._batch_bytes
+
+    def chunks(self, *, batch: bool) -> list[bytes]:
+        if batch:
+            return [self.batch_bytes]
+        return [event.data for event in self.events]
+
+    def texts(self, *, batch: bool) -> list[str]:
+        if batch:
+            if self._batch_text is None:
+                self._batch_text = self.batch_bytes.decode("utf-8")
+            return [self._batch_text]
+        if self._event_texts is None:
+            self._event_texts = [event.data.decode("utf-8") for event in self.events]
+        return self._event_texts
+
+
+def close_subscriber(queue: "asyncio.Queue[Frame | None]") -> None:
+    # None ends the stream; frames the subscriber has not taken yet are dropped to make room.
+    while not queue.empty():
+        queue.get_nowait()
+    queue.put_nowait(None)
+
+
+class ArgumentFanout:
+    def __init__(self, argument_id: str, window_seconds: float) -> None:
+        self.argument_id = argument_id
+        self.window_seconds = window_seconds
+        self.subscribers: set[asyncio.Queue[Frame | None]] = set()
+        self.closed = False
+        self._pending: list[WireEvent] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._reader: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self._reader = asyncio.create_task(self._read())
+        self._reader.add_done_callback(self._on_reader_done)
+
+    def _on_reader_done(self, task: asyncio.Task[None]) -> None:
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            logger.warning("Fan-out reader for %s failed", self.argument_id, exc_info=error)
+        # The bus subscription failed or ended: connections are closed so clients reconnect
+        # (and resync from a snapshot) instead of waiting on a reader that is gone.
+        self.closed = True
+        self._flush()
+        for queue in self.subscribers:
+            close_subscriber(queue)
+            STREAM_DISCONNECTS.inc(reason="reader_exit")
+        self.subscribers.clear()
+
+    async def stop(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._reader is not None:
+            self._reader.cancel()
+            with suppress(asyncio.CancelledError, Exception):
+                await self._reader
+
+    async def _read(self) -> None:
+        # One bus subscription per argument per process, shared by every local connection.
+        async for event in get_event_bus().subscribe(self.argument_id):
+            self._pending.append(event)
+            if self.window_seconds <= 0:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = asyncio.get_running_loop().call_later(
+                    self.window_seconds, self._flush
+                )
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        if not self._pending:
+            return
+        frame = Frame(self._pending)
+        self._pending = []
+        for queue in list(self.subscribers):
+            if queue.full():
+                # A client this far behind is disconnected rather than buffered without bound.
+                self.subscribers.discard(queue)
+                close_subscriber(queue)
+                STREAM_DISCONNECTS.inc(reason="slow_consumer")
+                continue
+            queue.put_nowait(frame)
+
+
+class FanoutHub:
+    def __init__(self) -> None:
+        self._fanouts: dict[str, ArgumentFanout] = {}
+
+    @asynccontextmanager
+    async def attach(self, argument_id: str) -> AsyncIterator[asyncio.Queue[Frame | None]]:
+        # The queue yields None once the server ends the stream.
+        fanout = self._fanouts.get(argument_id)
+        if fanout is None or fanout.closed:
+            fanout = ArgumentFanout(argument_id, settings.stream_coalesce_ms / 1000.0)
+            self._fanouts[argument_id] = fanout
+            fanout.start()
+        queue: asyncio.Queue[Frame | None] = asyncio.Queue(settings.stream_max_pending_frames)
+        fanout.subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            fanout.subscribers.discard(queue)
+            if not fanout.subscribers and self._fanouts.get(argument_id) is fanout:
+                del self._fanouts[argument_id]
+                await fanout.stop()
+
+
+fanout_hub = FanoutHub()
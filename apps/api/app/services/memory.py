@@ -0,0 +1,131 @@
+"""Rolling per-argument conversation memory rendered under a fixed token budget.
+
+The last few turns are kept verbatim. Older turns are folded into an extractive digest: each one
+contributes the sentence that adds the most new vocabulary, so points that were already made are
+not repeated back to the model. Folding is incremental and rendering is bounded by the budget,
+so prompt size stays flat however long the debate runs.
+"""
+
+import re
+from collections import deque
+
+RECENT_TURNS = 4
+# Memory gets a few turns' worth of the argument's own generation budget.
+BUDGET_TURNS = 4
+MIN_WORD_LENGTH = 4
+
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[a-z0-9']+")
+_STOPWORDS = frozenset(
+    {
+        "about", "after", "also", "because", "been", "before", "being", "cannot", "could", "does",
+        "doing", "from", "have", "here", "into", "just", "like", "more", "most", "much", "only",
+        "other", "over", "same", "should", "still", "than", "that", "their", "them", "then", "there",
+        "these", "they", "this", "those", "through", "very", "what", "when", "where", "which",
+        "while", "will", "with", "would", "your",
+    }
+)
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English; deliberately cheap and provider-agnostic.
+    return len(text) // 4 + 1
+
+
+def memory_budget(target_max_tokens: int) -> int:
+    return max(1, target_max_tokens) * BUDGET_TURNS
+
+
+def _content_words(text: str) -> set[str]:
+    return {
+        word
+        for word in _WORD.findall(text.lower())
+        if len(word) >= MIN_WORD_LENGTH and word not in _STOPWORDS
+    }
+
+
+def _truncate(text: str, budget_tokens: int) -> str:
+    if estimate_tokens(text) <= budget_tokens:
+        return text
+    return text[: max(0, budget_tokens - 1) * 4].rsplit(" ", 1)[0] + " ..."
+
+
+class ConversationMemory:
+    __slots__ = ("_digest", "_digest_tokens", "_recent", "_seen", "budget_tokens", "recent_turns")
+
+    def __init__(self, budget_tokens: int, recent_turns: int = RECENT_TURNS) -> None:
+        self.budget_tokens = budget_tokens
+        self.recent_turns = recent_turns
+        self._recent: deque[tuple[str, str]] = deque()
+        self._digest: deque[str] = deque()
+        self._digest_tokens = 0
+        self._seen: set[str] = set()
+
+    def add(self, speaker: str, text: str) -> None:
+        self._recent.append((speaker, text))
+        while len(self._recent) > self.recent_turns:
+            self._fold(*self._recent.popleft())
+
+    def _fold(self, speaker: str, text: str) -> None:
+        best, best_words = None, set()
+        for sentence in _SENTENCE_BREAK.split(text.strip()):
+            novel = _content_words(sentence) - self._seen
+            if len(novel) > len(best_words):
+                best, best_words = sentence, novel
+        if best is None:
+            # Nothing new was said; a repeated point does not earn digest space.
+            return
+        self._seen |= best_words
+        line = f"- {speaker}: {_truncate(best, self.budget_tokens // 4)}"
+        self._digest.append(line)
+        self._digest_tokens += estimate_tokens(line)
+        # The digest never needs more than the whole budget, so its upkeep is bounded too.
+        while self._digest_tokens > self.budget_tokens and len(self._digest) > 1:
+            self._digest_tokens -= estimate_tokens(self._digest.popleft())
+
+    def to_dict(self) -> dict:
+        return {
+            "budget_tokens": self.budget_tokens,
+            "recent_turns": self.recent_turns,
+            "recent": [list(turn) for turn in self._recent],
+            "digest": list(self._digest),
+            "seen": sorted(self._seen),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ConversationMemory":
+        memory = cls(data["budget_tokens"], data["recent_turns"])
+        memory._recent.extend((speaker, text) for speaker, text in data["recent"])
+        memory._digest.extend(data["digest"])
+        memory._digest_tokens = sum(estimate_tokens(line) for line in memory._digest)
+        memory._seen.update(data["seen"])
+        return memory
+
+    def render(self) -> str:
+        remaining = self.budget_tokens
+        recent: list[str] = []
+        for speaker, text in reversed(self._recent):
+            line = f"{speaker}: {text}"
+            cost = estimate_tokens(line)
+            if cost > remaining:
+                if not recent:
+                    recent.append(_truncate(line, remaining))
+                remaining = 0
+                break
+            recent.append(line)
+            remaining -= cost
+
+        digest: list[str] = []
+        for line in reversed(self._digest):
+            cost = estimate_tokens(line)
+            if cost > remaining:
+                break
+            digest.append(line)
+            remaining -= cost
+
+        sections = []
+        if digest:
+            sections.append("Earlier points (condensed):\n" + "\n".join(reversed(digest)))
+        if recent:
+            sections.append("Recent turns:\n" + "\n".join(reversed(recent)))
+        return "\n\n".join(sections)
@@ -0,0 +1,246 @@
+"""Versioned cache of encoded argument responses, served with strong ETags.
+
+Every argument has a generation number that is bumped after any commit touching the argument,
+its participants or its report. Entries remember the generation they were built from and are
+ignored once it moves on, so a reader racing a writer can never pin a stale body. The commit
+hooks that track touched arguments are registered here, on every SQLAlchemy session.
+"""
+
+import asyncio
+import hashlib
+import itertools
+from collections import Counter, OrderedDict
+from collections.abc import Sequence
+from contextlib import suppress
+
+from redis.asyncio import Redis
+from sqlalchemy import Delete, Update, event, select
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.config import get_settings
+from app.core.loops import LoopLocal
+from app.db.models import Argument, ArgumentParticipant, ArgumentReport
+
+settings = get_settings()
+
+MAX_LOCAL_ENTRIES = 4096
+_TOUCHED_ARGUMENTS_KEY = "response_cache_touched_arguments"
+# Entities that cached responses are built from, with the column naming their argument.
+_CACHED_SOURCES = {
+    Argument: Argument.id,
+    ArgumentParticipant: ArgumentParticipant.argument_id,
+    ArgumentReport: ArgumentReport.argument_id,
+}
+
+
+class CachedResponse:
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+        self.etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison function.
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
+class ResponseCache:
+    def __init__(self, redis_url: str | None, ttl_seconds: int) -> None:
+        self.redis_url = redis_url
+        # Dramatiq actors run each message under their own asyncio.run, so clients are per loop.
+        self._redis: LoopLocal[Redis] = LoopLocal(
+            lambda: Redis.from_url(redis_url, decode_responses=False)
+        )
+        self.ttl_seconds = ttl_seconds
+        # Generations are drawn from one counter and never reused, so forgetting an argument's
+        # generation (eviction, key expiry) can only cause misses, never stale hits.
+        self._sequence = itertools.count(1)
+        self._generations: OrderedDict[str, int] = OrderedDict()
+        self._entries: OrderedDict[tuple[str, str], tuple[int, CachedResponse]] = OrderedDict()
+        self._pending: set[asyncio.Task[None]] = set()
+        self._inflight: Counter[str] = Counter()
+
+    def _redis_client(self) -> Redis | None:
+        return self._redis.get() if self.redis_url else None
+
+    async def _reset_redis(self) -> None:
+        # This call falls back to the in-process cache; the next one tries Redis again.
+        redis = self._redis.pop()
+        if redis is not None:
+            with suppress(Exception):
+                await redis.aclose()
+
+    def _generation_key(self, argument_id: str) -> str:
+        return f"cache:argument:{argument_id}:generation"
+
+    def _entry_key(self, kind: str, argument_id: str) -> str:
+        return f"cache:argument:{argument_id}:{kind}"
+
+    async def lookup(self, kind: str, argument_id: str) -> tuple[CachedResponse | None, int]:
+        if self.ttl_seconds <= 0:
+            return None, 0
+        redis = self._redis_client()
+        if redis is not None and self._inflight[argument_id]:
+            # This process committed a change whose Redis bump has not landed yet.
+            return None, 0
+        if redis is not None:
+            try:
+                raw_generation, raw_entry = await redis.mget(
+                    self._generation_key(argument_id), self._entry_key(kind, argument_id)
+                )
+            except Exception:
+                await self._reset_redis()
+            else:
+                generation = int(raw_generation or 0)
+                if raw_entry is None:
+                    return None, generation
+                stored_generation, _, body = raw_entry.partition(b"\n")
+                if int(stored_generation) != generation:
+                    return None, generation
+                return CachedResponse(body), generation
+
+        generation = self._generations.get(argument_id, 0)
+        stored = self._entries.get((kind, argument_id))
+        if stored is None or stored[0] != generation:
+            return None, generation
+        self._entries.move_to_end((kind, argument_id))
+        return stored[1], generation
+
+    async def store(
+        self, kind: str, argument_id: str, generation: int, body: bytes
+    ) -> CachedResponse:
+        cached = CachedResponse(body)
+        if self.ttl_seconds <= 0:
+            return cached
+        redis = self._redis_client()
+        if redis is not None:
+            try:
+                await redis.set(
+                    self._entry_key(kind, argument_id),
+                    b"%d\n%b" % (generation, body),
+                    ex=self.ttl_seconds,
+                )
+                return cached
+            except Exception:
+                await self._reset_redis()
+
+        self._entries[(kind, argument_id)] = (generation, cached)
+        self._entries.move_to_end((kind, argument_id))
+        while len(self._entries) > MAX_LOCAL_ENTRIES:
+            self._entries.popitem(last=False)
+        return cached
+
+    async def invalidate(self, argument_ids: Sequence[str]) -> None:
+        redis = self._redis_client()
+        if redis is not None:
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    for _ in argument_ids:
+                        pipe.incr("cache:argument:generation_sequence")
+                    generations = await pipe.execute()
+                async with redis.pipeline(transaction=False) as pipe:
+                    for argument_id, generation in zip(argument_ids, generations, strict=True):
+                        pipe.set(
+                            self._generation_key(argument_id), generation, ex=self.ttl_seconds * 2
+                        )
+                    await pipe.execute()
+                return
+            except Exception:
+                await self._reset_redis()
+
+        for argument_id in argument_ids:
+            self._bump_local(argument_id)
+
+    def _bump_local(self, argument_id: str) -> None:
+        self._generations[argument_id] = next(self._sequence)
+        self._generations.move_to_end(argument_id)
+        while len(self._generations) > MAX_LOCAL_ENTRIES:
+            self._generations.popitem(last=False)
+
+    def invalidate_later(self, argument_ids: set[str]) -> None:
+        # Called from synchronous SQLAlchemy commit hooks. Local generations move immediately;
+        # the Redis round trip is scheduled on the running loop.
+        ids = sorted(argument_ids)
+        for argument_id in ids:
+            self._bump_local(argument_id)
+        if not self.redis_url:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._inflight.update(ids)
+        task = loop.create_task(self.invalidate(ids))
+        self._pending.add(task)
+        task.add_done_callback(lambda done: self._settle(done, ids))
+
+    def _settle(self, task: asyncio.Task[None], argument_ids: list[str]) -> None:
+        self._pending.discard(task)
+        self._inflight.subtract(argument_ids)
+        self._inflight += Counter()
+
+    async def drain(self) -> None:
+        # asyncio.run cancels tasks still pending when its coroutine returns, so worker actors
+        # wait here for the Redis bumps of their last commits.
+        loop = asyncio.get_running_loop()
+        pending = [task for task in list(self._pending) if task.get_loop() is loop]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+_response_cache: ResponseCache | None = None
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_touched_arguments(session: Session, flush_context: object, instances: object) -> None:
+    touched = session.info.setdefault(_TOUCHED_ARGUMENTS_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Argument):
+            touched.add(obj.id)
+        elif isinstance(obj, ArgumentParticipant | ArgumentReport):
+            touched.add(obj.argument_id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_touched_arguments(state: ORMExecuteState) -> None:
+    # Bulk update()/delete() statements bypass flush; their rows are looked up before they run.
+    if not (state.is_update or state.is_delete):
+        return
+    statement = state.statement
+    if not isinstance(statement, Update | Delete):
+        return
+    column = _CACHED_SOURCES.get(statement.entity_description["entity"])
+    if column is None:
+        return
+    affected = select(column)
+    if statement.whereclause is not None:
+        affected = affected.where(statement.whereclause)
+    touched = state.session.info.setdefault(_TOUCHED_ARGUMENTS_KEY, set())
+    touched.update(state.session.execute(affected, state.parameters).scalars())
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cached_responses(session: Session) -> None:
+    # Bumped only after commit: invalidating earlier would let a reader re-cache the old rows.
+    touched = session.info.pop(_TOUCHED_ARGUMENTS_KEY, None)
+    if touched:
+        touched.discard(None)
+        get_response_cache().invalidate_later(touched)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_touched_arguments(session: Session) -> None:
+    session.info.pop(_TOUCHED_ARGUMENTS_KEY, None)
+
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(settings.redis_url, settings.response_cache_ttl_seconds)
+    return _response_cache
@@ -0,0 +1,179 @@
+"""Age-based retention for turn_events: per-type TTLs, chunked deletes, monthly partitions.
+
+    cd apps/api
+    python -m app.services.retention
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import get_settings
+from app.db.models import TurnEvent
+from app.db.session import SessionLocal
+
+settings = get_settings()
+
+PARTITION_NAME = re.compile(r"^turn_events_p(\d{4})_(\d{2})$")
+PARTITIONS_AHEAD = 2
+
+
+@dataclass(slots=True)
+class RetentionPlan:
+    cutoffs: dict[str, datetime]
+    # Applies to every event type not named in the per-type settings.
+    default_cutoff: datetime | None
+    named_types: frozenset[str]
+    # Whole partitions ending before this can be dropped; only set when every type expires.
+    detach_before: datetime | None
+
+
+def build_plan(
+    retention_days: dict[str, int], *, default_days: int, now: datetime
+) -> RetentionPlan:
+    cutoffs = {
+        event_type: now - timedelta(days=days)
+        for event_type, days in retention_days.items()
+        if days > 0
+    }
+    detach_before = None
+    if default_days > 0 and all(days > 0 for days in retention_days.values()):
+        detach_before = now - timedelta(days=max([default_days, *retention_days.values()]))
+    return RetentionPlan(
+        cutoffs=cutoffs,
+        default_cutoff=now - timedelta(days=default_days) if default_days > 0 else None,
+        named_types=frozenset(retention_days),
+        detach_before=detach_before,
+    )
+
+
+def _month_start(value: datetime, offset: int = 0) -> datetime:
+    month = value.year * 12 + value.month - 1 + offset
+    return datetime(month // 12, month % 12 + 1, 1, tzinfo=UTC)
+
+
+async def _is_partitioned(session: AsyncSession) -> bool:
+    if session.bind.dialect.name != "postgresql":
+        return False
+    row = await session.execute(
+        text(
+            "select 1 from pg_partitioned_table pt join pg_class c on c.oid = pt.partrelid "
+            "where c.relname = 'turn_events'"
+        )
+    )
+    return row.scalar_one_or_none() is not None
+
+
+async def _create_partition(session: AsyncSession, start: datetime, end: datetime) -> None:
+    name = f"turn_events_p{start:%Y_%m}"
+    exists = await session.execute(text("select to_regclass(:name)"), {"name": name})
+    if exists.scalar_one_or_none() is not None:
+        return
+    # Attaching a month fails while the default partition holds rows in it, so those rows move
+    # into the new table first. The lock keeps writers from adding more until the attach is done.
+    bounds = f"from ('{start.isoformat()}') to ('{end.isoformat()}')"
+    await session.execute(text("lock table turn_events_default in access exclusive mode"))
+    await session.execute(text(f"create table {name} (like turn_events including defaults)"))
+    await session.execute(
+        text(
+            f"with moved as (delete from turn_events_default where created_at >= :start "
+            f"and created_at < :end returning *) insert into {name} select * from moved"
+        ),
+        {"start": start, "end": end},
+    )
+    await session.execute(
+        text(f"alter table turn_events attach partition {name} for values {bounds}")
+    )
+    await session.commit()
+
+
+async def _manage_partitions(session: AsyncSession, plan: RetentionPlan, now: datetime) -> int:
+    for offset in range(PARTITIONS_AHEAD + 1):
+        await _create_partition(session, _month_start(now, offset), _month_start(now, offset + 1))
+    if plan.detach_before is None:
+        return 0
+
+    rows = await session.execute(
+        text(
+            "select c.relname from pg_inherits i join pg_class c on c.oid = i.inhrelid "
+            "join pg_class p on p.oid = i.inhparent where p.relname = 'turn_events'"
+        )
+    )
+    detached = 0
+    for (name,) in rows.all():
+        match = PARTITION_NAME.match(name)
+        if not match:
+            continue
+        month_end = _month_start(datetime(int(match[1]), int(match[2]), 1, tzinfo=UTC), 1)
+        if month_end > plan.detach_before:
+            continue
+        # Detaching is a catalog change; no rows are touched, whatever the partition holds.
+        await session.execute(text(f"alter table turn_events detach partition {name}"))
+        await session.execute(text(f"drop table {name}"))
+        await session.commit()
+        detached += 1
+    return detached
+
+
+async def _delete_in_batches(
+    session_factory: async_sessionmaker[AsyncSession],
+    condition: ColumnElement[bool],
+    batch_size: int,
+) -> int:
+    # Each chunk is its own short transaction so writers are never blocked for long.
+    deleted = 0
+    while True:
+        async with session_factory() as session:
+            chunk = select(TurnEvent.id).where(condition).limit(batch_size)
+            result = await session.execute(
+                delete(TurnEvent)
+                .where(TurnEvent.id.in_(chunk))
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+        await asyncio.sleep(0)
+
+
+async def purge_expired_events(
+    *,
+    now: datetime | None = None,
+    session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+) -> dict[str, int]:
+    now = now or datetime.now(UTC)
+    plan = build_plan(
+        settings.event_retention_days,
+        default_days=settings.event_retention_default_days,
+        now=now,
+    )
+    batch_size = max(1, settings.event_retention_batch_size)
+    counts: dict[str, int] = {}
+
+    async with session_factory() as session:
+        if await _is_partitioned(session):
+            counts["partitions_detached"] = await _manage_partitions(session, plan, now)
+
+    for event_type, cutoff in plan.cutoffs.items():
+        counts[event_type] = await _delete_in_batches(
+            session_factory,
+            (TurnEvent.event_type == event_type) & (TurnEvent.created_at < cutoff),
+            batch_size,
+        )
+    if plan.default_cutoff is not None:
+        counts["*"] = await _delete_in_batches(
+            session_factory,
+            TurnEvent.event_type.not_in(plan.named_types) & (TurnEvent.created_at < plan.default_cutoff),
+            batch_size,
+        )
+    return counts
+
+
+if __name__ == "__main__":
+    print(asyncio.run(purge_expired_events()))
@@ -0,0 +1,176 @@
+"""Materialized per-argument stream state so late joiners get one frame instead of a replay."""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import ArgumentArchive, ArgumentSnapshot, TurnEvent
+
+# Tokens and reactions are folded lazily; every other event type checkpoints the snapshot row,
+# so the unfolded tail is bounded by a single turn's tokens. Checkpoints skip token rows: each
+# token run ends in turn.final, which carries the full text. Events the API persists mid-debate
+# are lazy too, so only the debate runner checkpoints: an API checkpoint could fold past runner
+# events that are not committed yet and skip them for good.
+LAZY_EVENT_TYPES = frozenset({"turn.token", "reaction.added", "argument.cancel_requested"})
+
+
+def empty_state() -> dict:
+    return {
+        "phase": None,
+        "meta": None,
+        "turns": [],
+        "partial_turn": None,
+        "badges": [],
+        "reactions": {},
+        "completed": None,
+        "error": None,
+    }
+
+
+def apply_event(state: dict, *, event_type: str, payload: dict, turn_index: int | None) -> dict:
+    if event_type == "turn.token":
+        partial = state["partial_turn"]
+        if partial is None or partial["turn_index"] != turn_index:
+            partial = state["partial_turn"] = {
+                "turn_index": turn_index,
+                "speaker_participant_id": payload.get("speaker_participant_id"),
+                "content": "",
+            }
+        partial["content"] += str(payload.get("token", ""))
+    elif event_type == "turn.final":
+        state["turns"].append(
+            {
+                "turn_id": payload.get("turn_id"),
+                "turn_index": turn_index,
+                "speaker_participant_id": payload.get("speaker_participant_id"),
+                "content": payload.get("content", ""),
+                "phase": payload.get("phase"),
+            }
+        )
+        state["partial_turn"] = None
+    elif event_type == "turn.meta":
+        state["meta"] = payload
+        if payload.get("state") == "thinking":
+            state["partial_turn"] = {
+                "turn_index": turn_index,
+                "speaker_participant_id": payload.get("speaker_participant_id"),
+                "content": "",
+            }
+    elif event_type == "phase.changed":
+        state["phase"] = payload.get("phase")
+    elif event_type == "badge.awarded":
+        state["badges"].append(payload)
+    elif event_type == "reaction.added":
+        emoji = str(payload.get("emoji", ""))
+        state["reactions"][emoji] = state["reactions"].get(emoji, 0) + 1
+    elif event_type == "argument.completed":
+        state["completed"] = payload
+        state["partial_turn"] = None
+    elif event_type == "error":
+        state["error"] = payload.get("message")
+    return state
+
+
+async def _fold_tail(
+    session: AsyncSession,
+    state: dict,
+    *,
+    argument_id: str,
+    after_event_id: int,
+    upto_event_id: int | None = None,
+    skip_tokens: bool = False,
+) -> int:
+    query = (
+        select(TurnEvent.id, TurnEvent.event_type, TurnEvent.payload, TurnEvent.turn_index)
+        .where(TurnEvent.argument_id == argument_id)
+        .where(TurnEvent.id > after_event_id)
+        .order_by(TurnEvent.id.asc())
+    )
+    if upto_event_id is not None:
+        query = query.where(TurnEvent.id <= upto_event_id)
+    if skip_tokens:
+        query = query.where(TurnEvent.event_type != "turn.token")
+    last_event_id = after_event_id
+    for event_id, event_type, payload, turn_index in (await session.execute(query)).all():
+        apply_event(state, event_type=event_type, payload=payload or {}, turn_index=turn_index)
+        last_event_id = event_id
+    return last_event_id
+
+
+async def _stored_snapshot(session: AsyncSession, argument_id: str) -> tuple[dict, int]:
+    # Plain columns, not an entity: a snapshot cached in the identity map may be older than the row.
+    row = await session.execute(
+        select(ArgumentSnapshot.state, ArgumentSnapshot.last_event_id).where(
+            ArgumentSnapshot.argument_id == argument_id
+        )
+    )
+    stored = row.one_or_none()
+    return (stored[0], stored[1]) if stored else (empty_state(), 0)
+
+
+def _upsert_snapshot(dialect_name: str, argument_id: str, state: dict, last_event_id: int):
+    # Only the debate runner checkpoints (see LAZY_EVENT_TYPES); the guard still keeps a stale
+    # writer from moving the checkpoint back, and a first insert race becomes an update.
+    insert = pg_insert if dialect_name == "postgresql" else sqlite_insert
+    statement = insert(ArgumentSnapshot).values(
+        argument_id=argument_id,
+        last_event_id=last_event_id,
+        state=state,
+        updated_at=datetime.now(UTC),
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[ArgumentSnapshot.argument_id],
+        set_={
+            "last_event_id": statement.excluded.last_event_id,
+            "state": statement.excluded.state,
+            "updated_at": statement.excluded.updated_at,
+        },
+        where=ArgumentSnapshot.last_event_id < statement.excluded.last_event_id,
+    )
+
+
+async def refresh_snapshot(session: AsyncSession, *, argument_id: str, upto_event_id: int) -> None:
+    state, last_event_id = await _stored_snapshot(session, argument_id)
+    if last_event_id >= upto_event_id:
+        return
+    last_event_id = await _fold_tail(
+        session,
+        state,
+        argument_id=argument_id,
+        after_event_id=last_event_id,
+        upto_event_id=upto_event_id,
+        skip_tokens=True,
+    )
+    await session.execute(
+        _upsert_snapshot(session.bind.dialect.name, argument_id, state, last_event_id)
+    )
+
+
+async def load_snapshot(session: AsyncSession, argument_id: str) -> tuple[dict, int]:
+    state, last_event_id = await _stored_snapshot(session, argument_id)
+    last_event_id = await _fold_tail(
+        session, state, argument_id=argument_id, after_event_id=last_event_id
+    )
+
+    # Reactions are persisted by the API concurrently with the debate runner's checkpoints, so
+    # the stored tallies can miss a racing write. Recount them up to the same event id cutoff.
+    emoji = TurnEvent.payload["emoji"].as_string()
+    tallies = await session.execute(
+        select(emoji, func.count(TurnEvent.id))
+        .where(TurnEvent.argument_id == argument_id)
+        .where(TurnEvent.event_type == "reaction.added")
+        .where(TurnEvent.id <= last_event_id)
+        .group_by(emoji)
+    )
+    reactions = {str(key): int(count) for key, count in tallies.all()}
+    # Archived arguments keep the tallies of their trimmed reaction rows on the archive row.
+    archived = await session.execute(
+        select(ArgumentArchive.reaction_counts).where(ArgumentArchive.argument_id == argument_id)
+    )
+    for key, count in (archived.scalar_one_or_none() or {}).items():
+        reactions[key] = reactions.get(key, 0) + int(count)
+    state["reactions"] = reactions
+    return state, last_event_id
@@ -0,0 +1,199 @@
+"""Per-argument execution timelines exported as Chrome trace-event JSON."""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext, suppress
+from contextvars import ContextVar
+from itertools import islice
+
+import orjson
+from redis.asyncio import Redis
+
+from app.core.config import get_settings
+from app.core.loops import LoopLocal
+
+settings = get_settings()
+
+_NULL_SPAN = nullcontext()
+_current_trace: ContextVar["ArgumentTrace | None"] = ContextVar("argument_trace", default=None)
+_redis: LoopLocal[Redis] = LoopLocal(
+    lambda: Redis.from_url(settings.redis_url, decode_responses=False)
+)
+
+
+def _chrome_document(argument_id: str, pid: int, events: list[dict], *, dropped: bool) -> dict:
+    return {
+        "traceEvents": [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": f"argument {argument_id}"},
+            },
+            *events,
+        ],
+        "displayTimeUnit": "ms",
+        "otherData": {"argument_id": argument_id, "dropped_oldest": dropped},
+    }
+
+
+class ArgumentTrace:
+    __slots__ = ("_origin_us", "_pid", "_tid", "appended", "argument_id", "events", "flushed")
+
+    def __init__(self, argument_id: str, capacity: int) -> None:
+        self.argument_id = argument_id
+        self.events: deque[dict] = deque(maxlen=capacity)
+        # Counts of events ever recorded and already exported, so flushes only send new ones.
+        self.appended = 0
+        self.flushed = 0
+        self._origin_us = time.time_ns() // 1000 - time.perf_counter_ns() // 1000
+        self._pid = os.getpid()
+        self._tid = threading.get_ident()
+
+    def _now_us(self) -> int:
+        return self._origin_us + time.perf_counter_ns() // 1000
+
+    def _append(self, event: dict) -> None:
+        self.events.append(event)
+        self.appended += 1
+
+    @contextmanager
+    def span(self, name: str, **args: object) -> Iterator[None]:
+        started = self._now_us()
+        try:
+            yield
+        finally:
+            self._append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": started,
+                    "dur": self._now_us() - started,
+                    "pid": self._pid,
+                    "tid": self._tid,
+                    "args": args,
+                }
+            )
+
+    def instant(self, name: str, **args: object) -> None:
+        self._append(
+            {
+                "name": name,
+                "ph": "i",
+                "s": "t",
+                "ts": self._now_us(),
+                "pid": self._pid,
+                "tid": self._tid,
+                "args": args,
+            }
+        )
+
+    def unflushed(self) -> list[dict]:
+        # Events recorded since the last flush that the ring buffer still holds, oldest first.
+        count = min(self.appended - self.flushed, len(self.events))
+        return list(islice(reversed(self.events), count))[::-1]
+
+    def to_chrome(self) -> dict:
+        return _chrome_document(
+            self.argument_id,
+            self._pid,
+            list(self.events),
+            dropped=len(self.events) == self.events.maxlen,
+        )
+
+
+class TraceStore:
+    def __init__(self, max_arguments: int) -> None:
+        self.max_arguments = max_arguments
+        self._traces: OrderedDict[str, ArgumentTrace] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, argument_id: str, capacity: int) -> ArgumentTrace:
+        trace = ArgumentTrace(argument_id, capacity)
+        with self._lock:
+            self._traces.pop(argument_id, None)
+            self._traces[argument_id] = trace
+            while len(self._traces) > self.max_arguments:
+                self._traces.popitem(last=False)
+        return trace
+
+    def get(self, argument_id: str) -> ArgumentTrace | None:
+        with self._lock:
+            return self._traces.get(argument_id)
+
+
+trace_store = TraceStore(max_arguments=settings.debate_trace_max_arguments)
+
+
+def start_trace(argument_id: str) -> ArgumentTrace | None:
+    if not settings.debate_trace_enabled:
+        return None
+    trace = trace_store.start(argument_id, settings.debate_trace_capacity)
+    _current_trace.set(trace)
+    return trace
+
+
+def current_trace() -> ArgumentTrace | None:
+    return _current_trace.get()
+
+
+def span(name: str, **args: object) -> AbstractContextManager[None]:
+    trace = _current_trace.get()
+    if trace is None:
+        return _NULL_SPAN
+    return trace.span(name, **args)
+
+
+def instant(name: str, **args: object) -> None:
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.instant(name, **args)
+
+
+def _trace_key(argument_id: str) -> str:
+    return f"argument:{argument_id}:trace:events"
+
+
+async def flush_trace(trace: ArgumentTrace) -> None:
+    # Debates usually run in the Dramatiq worker, so the API reads traces back from Redis. Each
+    # flush appends only the events recorded since the previous one to a capped Redis list.
+    if not settings.redis_url:
+        return
+    upto = trace.appended
+    events = trace.unflushed()
+    if not events and trace.flushed:
+        return
+    key = _trace_key(trace.argument_id)
+    with suppress(Exception):
+        pipe = _redis.get().pipeline(transaction=True)
+        if not trace.flushed:
+            # A retried run starts a new timeline.
+            pipe.delete(key)
+        if events:
+            pipe.rpush(key, *(orjson.dumps(event) for event in events))
+            pipe.ltrim(key, -settings.debate_trace_capacity, -1)
+        pipe.expire(key, settings.debate_trace_ttl_seconds)
+        await pipe.execute()
+        trace.flushed = upto
+
+
+async def load_trace(argument_id: str) -> dict | None:
+    local = trace_store.get(argument_id)
+    if local is not None:
+        return local.to_chrome()
+    if not settings.redis_url:
+        return None
+    with suppress(Exception):
+        raw = await _redis.get().lrange(_trace_key(argument_id), 0, -1)
+        if raw:
+            events = [orjson.loads(item) for item in raw]
+            return _chrome_document(
+                argument_id,
+                events[0]["pid"],
+                events,
+                dropped=len(events) >= settings.debate_trace_capacity,
+            )
+    return None
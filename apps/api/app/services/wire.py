@@ -0,0 +1,74 @@
+"""Wire encoding of persisted events, shared by the event bus, stream replay and the archive."""
+
+from datetime import datetime
+
+import orjson
+from sqlalchemy import Row
+
+from app.db.models import TurnEvent
+
+# Exactly what WireEvent.from_row reads; replay paths select these instead of whole entities.
+WIRE_EVENT_COLUMNS = (
+    TurnEvent.id,
+    TurnEvent.argument_id,
+    TurnEvent.event_type,
+    TurnEvent.payload,
+    TurnEvent.turn_index,
+    TurnEvent.created_at,
+)
+
+
+class WireEvent:
+    # A persisted event already encoded for the wire. Only the id travels next to the bytes, so
+    # fan-out can filter and forward without ever parsing JSON.
+    __slots__ = ("data", "id")
+
+    def __init__(self, event_id: int, data: bytes) -> None:
+        self.id = event_id
+        self.data = data
+
+    @classmethod
+    def from_row(cls, event: TurnEvent | Row) -> "WireEvent":
+        return encode_wire_event(
+            event_id=event.id,
+            argument_id=event.argument_id,
+            event_type=event.event_type,
+            payload=event.payload,
+            turn_index=event.turn_index,
+            created_at=event.created_at,
+        )
+
+    def pack(self) -> bytes:
+        return b"%d:%b" % (self.id, self.data)
+
+    @classmethod
+    def unpack(cls, raw: bytes) -> "WireEvent":
+        if raw.startswith(b"{"):
+            # Processes older than the packed format publish the bare event JSON.
+            return cls(int(orjson.loads(raw)["id"]), raw)
+        head, _, data = raw.partition(b":")
+        return cls(int(head), data)
+
+
+def encode_wire_event(
+    *,
+    event_id: int,
+    argument_id: str,
+    event_type: str,
+    payload: dict,
+    turn_index: int | None,
+    created_at: datetime,
+) -> WireEvent:
+    return WireEvent(
+        event_id,
+        orjson.dumps(
+            {
+                "id": event_id,
+                "argument_id": argument_id,
+                "event_type": event_type,
+                "payload": payload,
+                "turn_index": turn_index,
+                "created_at": created_at.isoformat(),
+            }
+        ),
+    )
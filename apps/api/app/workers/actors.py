@@ -1,29 +1,130 @@
 import asyncio
+import threading
+import time
+from collections.abc import Coroutine
+from contextlib import suppress
+from typing import Any, TypeVar
 
 import dramatiq
 from dramatiq.brokers.redis import RedisBroker
 from dramatiq.brokers.stub import StubBroker
+from dramatiq.middleware import Middleware
+from redis import Redis
 
 from app.core.config import get_settings
-from app.workers.runtime import run_argument, run_postprocess
+from app.core.metrics import start_metrics_server
+from app.services.archive import archive_argument
+from app.services.event_bus import get_event_bus
+from app.services.response_cache import get_response_cache
+from app.services.retention import purge_expired_events
+from app.workers.runtime import ADMISSION_POLL_SECONDS, run_argument, run_postprocess
+from app.workers.sharding import queue_for_argument, shard_queue_name
 
 settings = get_settings()
 
+T = TypeVar("T")
+
+
+class WorkerMetricsExporter(Middleware):
+    # The API imports this module to enqueue messages; only worker processes boot a Worker, so
+    # only they bind WORKER_METRICS_PORT.
+    def after_worker_boot(self, broker: dramatiq.Broker, worker: dramatiq.Worker) -> None:
+        if settings.worker_metrics_port:
+            start_metrics_server(settings.worker_metrics_port)
+
+
+RETENTION_SCHEDULE_KEY = "maintenance:retention:scheduled"
+
+
+class RetentionScheduler(Middleware):
+    # Every worker process runs the loop; the Redis key lets one of them enqueue retention_actor
+    # per EVENT_RETENTION_INTERVAL_SECONDS across the whole deployment.
+    def after_worker_boot(self, broker: dramatiq.Broker, worker: dramatiq.Worker) -> None:
+        if settings.event_retention_interval_seconds > 0 and settings.redis_url:
+            threading.Thread(target=self._run, name="retention-scheduler", daemon=True).start()
+
+    def _run(self) -> None:
+        interval = settings.event_retention_interval_seconds
+        redis = Redis.from_url(settings.redis_url)
+        while True:
+            with suppress(Exception):
+                if redis.set(RETENTION_SCHEDULE_KEY, b"1", nx=True, ex=interval):
+                    retention_actor.send()
+            time.sleep(min(interval, 60))
+
+
 if settings.redis_url:
     dramatiq.set_broker(RedisBroker(url=settings.redis_url))
 else:
     dramatiq.set_broker(StubBroker())
+dramatiq.get_broker().add_middleware(WorkerMetricsExporter())
+dramatiq.get_broker().add_middleware(RetentionScheduler())
+
+
+def _run_settled(coroutine: Coroutine[Any, Any, T]) -> T:
+    async def settled() -> T:
+        try:
+            return await coroutine
+        finally:
+            # Cache invalidations from the last commits are still in flight; asyncio.run would
+            # cancel them on return and leave the API serving stale responses.
+            await get_response_cache().drain()
+            # The loop ends with this message; its bus connections cannot be reused or closed later.
+            await get_event_bus().close()
+
+    return asyncio.run(settled())
 
 
 @dramatiq.actor(queue_name="debate_run", max_retries=3, min_backoff=3000)
-def run_argument_actor(argument_id: str) -> None:
-    asyncio.run(run_argument(argument_id))
-    postprocess_actor.send(argument_id)
+def run_argument_actor(argument_id: str, reported_position: int | None = None) -> None:
+    queued = _run_settled(run_argument(argument_id, reported_position=reported_position))
+    if queued is not None:
+        # Still waiting for an admission slot: free this thread and try again shortly.
+        send_for_argument(
+            run_argument_actor,
+            argument_id,
+            queued.position,
+            delay=int(ADMISSION_POLL_SECONDS * 1000),
+        )
+        return
+    send_for_argument(postprocess_actor, argument_id)
 
 
 @dramatiq.actor(queue_name="postprocess", max_retries=2, min_backoff=3000)
 def postprocess_actor(argument_id: str) -> None:
-    asyncio.run(run_postprocess(argument_id))
+    _run_settled(run_postprocess(argument_id))
+    if settings.archive_enabled:
+        send_for_argument(archive_actor, argument_id)
+
+
+@dramatiq.actor(queue_name="archive", max_retries=3, min_backoff=10000)
+def archive_actor(argument_id: str) -> None:
+    _run_settled(archive_argument(argument_id))
+
+
+SHARDED_ACTORS = (run_argument_actor, postprocess_actor, archive_actor)
+
+if settings.debate_shards > 1:
+    for shard in range(settings.debate_shards):
+        for actor in SHARDED_ACTORS:
+            dramatiq.get_broker().declare_queue(shard_queue_name(actor.queue_name, shard))
+
+
+def send_for_argument(
+    actor: dramatiq.Actor, argument_id: str, *args: Any, delay: int | None = None
+) -> None:
+    # Sharded deployments pin every stage of an argument to one shard, so the worker that ran the
+    # debate also builds its report and archive. Retries stay on the message's queue.
+    message = actor.message(argument_id, *args)
+    queue_name = queue_for_argument(actor.queue_name, argument_id)
+    if queue_name != message.queue_name:
+        message = message.copy(queue_name=queue_name)
+    actor.broker.enqueue(message, delay=delay)
+
+
+@dramatiq.actor(queue_name="maintenance", max_retries=1)
+def retention_actor() -> None:
+    _run_settled(purge_expired_events())
 
 
 @dramatiq.actor(queue_name="media", max_retries=1)
@@ -0,0 +1,267 @@
+"""Compact per-debate runtime state, independent of ORM objects and the database session.
+
+Everything a running debate needs between turns lives here: seat prompt context derived once
+at start, claim usage as per-seat bitmasks, stop counters, the conversation memory and the
+argument's progress columns (phase, turn count, token usage), which the runner writes back with
+plain UPDATEs. The state serializes to a plain dict, so a debate can be checkpointed or moved
+between workers.
+"""
+
+from collections.abc import Iterable
+
+from app.services.argument_engine import PACE_DELAYS
+from app.services.memory import ConversationMemory, memory_budget
+
+DEFAULT_POINTS = (
+    "I refuse to yield this ground",
+    "This tradeoff is unacceptable",
+    "The burden of proof is unmet",
+)
+DEFAULT_STANCE = "I stand by my position"
+POINTS_PER_SEAT = 3
+BADGE_COOLDOWN_TURNS = 2
+
+
+def extract_points(snapshot: dict | None) -> tuple[str, ...]:
+    if not snapshot:
+        return DEFAULT_POINTS
+    points = snapshot.get("defend_points") or []
+    cleaned = [str(item).strip() for item in points if str(item).strip()]
+    if len(cleaned) < POINTS_PER_SEAT:
+        cleaned.extend(["This is still unresolved"] * (POINTS_PER_SEAT - len(cleaned)))
+    return tuple(cleaned[:POINTS_PER_SEAT])
+
+
+def extract_stance(snapshot: dict | None) -> str:
+    if not snapshot:
+        return DEFAULT_STANCE
+    return str(snapshot.get("stance") or DEFAULT_STANCE)
+
+
+class SeatContext:
+    # Prompt context for one seat, derived from its persona snapshot once per debate.
+    __slots__ = ("participant_id", "points", "seat_order", "stance", "user_id")
+
+    def __init__(
+        self,
+        participant_id: str,
+        user_id: str,
+        seat_order: int,
+        stance: str,
+        points: tuple[str, ...],
+    ) -> None:
+        self.participant_id = participant_id
+        self.user_id = user_id
+        self.seat_order = seat_order
+        self.stance = stance
+        self.points = points
+
+    @classmethod
+    def from_participant(cls, participant) -> "SeatContext":
+        return cls(
+            participant.id,
+            participant.user_id,
+            participant.seat_order,
+            extract_stance(participant.persona_snapshot),
+            extract_points(participant.persona_snapshot),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "participant_id": self.participant_id,
+            "user_id": self.user_id,
+            "seat_order": self.seat_order,
+            "stance": self.stance,
+            "points": list(self.points),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SeatContext":
+        return cls(
+            data["participant_id"],
+            data["user_id"],
+            data["seat_order"],
+            data["stance"],
+            tuple(data["points"]),
+        )
+
+
+class DebateState:
+    __slots__ = (
+        "argument_id",
+        "badge_cooldown",
+        "badges_so_far",
+        "claim_usage",
+        "completion_tokens",
+        "composure",
+        "delay",
+        "done_streak",
+        "evidence_mode",
+        "max_turns",
+        "memory",
+        "phase",
+        "previous_turn_text",
+        "prompt_tokens",
+        "seats",
+        "stagnation_hits",
+        "target_max_tokens",
+        "target_min_tokens",
+        "turn_count",
+        "win_condition",
+    )
+
+    def __init__(
+        self,
+        *,
+        argument_id: str,
+        seats: tuple[SeatContext, ...],
+        max_turns: int,
+        target_min_tokens: int,
+        target_max_tokens: int,
+        composure: int,
+        evidence_mode: str,
+        win_condition: str,
+        delay: float,
+        phase: str,
+        turn_count: int = 0,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+    ) -> None:
+        self.argument_id = argument_id
+        self.seats = seats
+        self.max_turns = max_turns
+        self.target_min_tokens = target_min_tokens
+        self.target_max_tokens = target_max_tokens
+        self.composure = composure
+        self.evidence_mode = evidence_mode
+        self.win_condition = win_condition
+        self.delay = delay
+        self.phase = phase
+        self.turn_count = turn_count
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        # Bit i of claim_usage[seat] is set once that seat has argued points[i].
+        self.claim_usage = [0] * len(seats)
+        self.done_streak = [0] * len(seats)
+        self.previous_turn_text: str | None = None
+        self.stagnation_hits = 0
+        self.badge_cooldown = 0
+        self.badges_so_far = 0
+        self.memory = ConversationMemory(memory_budget(target_max_tokens))
+
+    @classmethod
+    def start(cls, argument, participants: Iterable, *, pace_delay_scale: float) -> "DebateState":
+        # Reads plain values off the argument and participants; no ORM object is retained.
+        controls = argument.controls or {}
+        return cls(
+            argument_id=argument.id,
+            seats=tuple(SeatContext.from_participant(participant) for participant in participants),
+            max_turns=int(argument.max_turns),
+            target_min_tokens=int(argument.target_min_tokens),
+            target_max_tokens=int(argument.target_max_tokens),
+            composure=int(controls.get("argument_composure", 45)),
+            evidence_mode=controls.get("evidence_mode", "FREEFORM"),
+            win_condition=controls.get("win_condition", "BE_RIGHT"),
+            delay=PACE_DELAYS.get(controls.get("pace_mode", "NORMAL"), 0.03) * pace_delay_scale,
+            phase=argument.phase.value,
+            turn_count=int(argument.turn_count or 0),
+            prompt_tokens=int(argument.prompt_tokens or 0),
+            completion_tokens=int(argument.completion_tokens or 0),
+        )
+
+    def choose_claim(self, seat: int, turn_index: int) -> tuple[int, bool, bool]:
+        """Return (point index, is_new_claim, done_hint) and mark the point as used."""
+        context = self.seats[seat]
+        used = self.claim_usage[seat]
+        unused = next((idx for idx in range(len(context.points)) if not used >> idx & 1), None)
+        if unused is None:
+            chosen = (turn_index + context.seat_order) % len(context.points)
+            done_hint = turn_index > int(self.max_turns * 0.6)
+        else:
+            chosen = unused
+            done_hint = False
+        is_new_claim = not used >> chosen & 1
+        self.claim_usage[seat] = used | 1 << chosen
+        return chosen, is_new_claim, done_hint
+
+    def record_turn(
+        self, seat: int, text: str, *, similarity: float, is_new_claim: bool, done_hint: bool
+    ) -> None:
+        if similarity > 0.9 and not is_new_claim:
+            self.stagnation_hits += 1
+        else:
+            self.stagnation_hits = max(0, self.stagnation_hits - 1)
+        if done_hint and not is_new_claim:
+            self.done_streak[seat] += 1
+        else:
+            self.done_streak[seat] = 0
+        self.previous_turn_text = text
+        self.memory.add(self.seats[seat].user_id, text)
+
+    def record_usage(
+        self, turn_index: int, prompt_tokens: int | None, completion_tokens: int | None
+    ) -> None:
+        self.turn_count = turn_index
+        self.prompt_tokens += prompt_tokens or 0
+        self.completion_tokens += completion_tokens or 0
+
+    def record_badge(self, awarded: bool) -> None:
+        if awarded:
+            self.badges_so_far += 1
+            self.badge_cooldown = BADGE_COOLDOWN_TURNS
+        else:
+            self.badge_cooldown = max(0, self.badge_cooldown - 1)
+
+    def should_stop(self) -> bool:
+        everyone_done = all(streak >= 2 for streak in self.done_streak)
+        return everyone_done or self.stagnation_hits >= 2
+
+    def to_dict(self) -> dict:
+        return {
+            "argument_id": self.argument_id,
+            "seats": [seat.to_dict() for seat in self.seats],
+            "max_turns": self.max_turns,
+            "target_min_tokens": self.target_min_tokens,
+            "target_max_tokens": self.target_max_tokens,
+            "composure": self.composure,
+            "evidence_mode": self.evidence_mode,
+            "win_condition": self.win_condition,
+            "delay": self.delay,
+            "phase": self.phase,
+            "turn_count": self.turn_count,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "claim_usage": list(self.claim_usage),
+            "done_streak": list(self.done_streak),
+            "previous_turn_text": self.previous_turn_text,
+            "stagnation_hits": self.stagnation_hits,
+            "badge_cooldown": self.badge_cooldown,
+            "badges_so_far": self.badges_so_far,
+            "memory": self.memory.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DebateState":
+        state = cls(
+            argument_id=data["argument_id"],
+            seats=tuple(SeatContext.from_dict(seat) for seat in data["seats"]),
+            max_turns=data["max_turns"],
+            target_min_tokens=data["target_min_tokens"],
+            target_max_tokens=data["target_max_tokens"],
+            composure=data["composure"],
+            evidence_mode=data["evidence_mode"],
+            win_condition=data["win_condition"],
+            delay=data["delay"],
+            phase=data["phase"],
+            turn_count=data["turn_count"],
+            prompt_tokens=data["prompt_tokens"],
+            completion_tokens=data["completion_tokens"],
+        )
+        state.claim_usage = list(data["claim_usage"])
+        state.done_streak = list(data["done_streak"])
+        state.previous_turn_text = data["previous_turn_text"]
+        state.stagnation_hits = data["stagnation_hits"]
+        state.badge_cooldown = data["badge_cooldown"]
+        state.badges_so_far = data["badges_so_far"]
+        state.memory = ConversationMemory.from_dict(data["memory"])
+        return state
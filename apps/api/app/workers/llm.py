@@ -1,20 +1,54 @@
+import math
+import time
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+
 from openai import AsyncOpenAI
 
 from app.core.config import get_settings
+from app.core.metrics import (
+    LLM_COMPLETION_TOKENS,
+    LLM_GENERATE_SECONDS,
+    LLM_PROMPT_TOKENS,
+    LLM_TEMPLATE_FALLBACKS,
+)
 from app.db.models import ArgumentPhase
+from app.services.tracing import instant, span
 
 settings = get_settings()
 
+SYSTEM_PROMPT = (
+    "You are an argument agent in AaS. Stay concise, witty, and useful. "
+    "No personal attacks. Keep claims tight and respond directly."
+)
+# The completion cap sits a little above the shape's target so turns can finish their sentence.
+GENERATION_HEADROOM = 1.25
+
+
+@dataclass(slots=True)
+class GeneratedTurn:
+    text: str
+    # Token counts as reported by the provider; None for template turns or missing usage.
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    # Prompt tokens the provider served from its prefix cache.
+    cached_prompt_tokens: int | None = None
+
+
+def completion_budget(target_max_tokens: int) -> int:
+    return math.ceil(max(1, target_max_tokens) * GENERATION_HEADROOM)
+
 
 def _build_client() -> AsyncOpenAI | None:
     provider = settings.resolved_model_provider()
+    base_url = (settings.llm_base_url or "").strip() or None
     if provider == "gemini" and settings.gemini_api_key:
         return AsyncOpenAI(
             api_key=settings.gemini_api_key,
-            base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+            base_url=base_url or "https://generativelanguage.googleapis.com/v1beta/openai/",
         )
     if provider == "openai" and settings.openai_api_key:
-        return AsyncOpenAI(api_key=settings.openai_api_key)
+        return AsyncOpenAI(api_key=settings.openai_api_key, base_url=base_url)
     return None
 
 
@@ -77,6 +111,50 @@ def build_turn_text(
     ).strip()
 
 
+def build_prompt_messages(
+    *,
+    speaker_handle: str,
+    stance: str,
+    chosen_point: str,
+    conversation: str | None,
+    win_condition: str,
+    phase: ArgumentPhase,
+    evidence_mode: str,
+    turn_index: int,
+    max_turns: int,
+    target_min_tokens: int,
+    target_max_tokens: int,
+) -> list[dict[str, str]]:
+    # Providers cache prompts by exact prefix. Everything fixed for a speaker within one argument
+    # goes first, byte-identical on every turn; fields that change per turn only come after it.
+    static_prefix = (
+        f"{SYSTEM_PROMPT}\n\n"
+        f"Speaker: {speaker_handle}\n"
+        f"Stance: {stance}\n"
+        f"Win condition: {win_condition}\n"
+        f"Evidence mode: {evidence_mode}\n"
+        f"The argument runs for at most {max_turns} turns.\n"
+        f"Each turn should be {target_min_tokens}-{target_max_tokens} tokens long.\n"
+        f"If truly done, end with: I have nothing meaningfully new after this turn."
+    )
+    volatile_suffix = (
+        f"Conversation so far:\n{conversation or 'N/A'}\n\n"
+        f"Phase: {phase.value}\n"
+        f"Point to defend: {chosen_point}\n"
+        f"Turn {turn_index} of {max_turns}."
+    )
+    return [
+        {"role": "system", "content": static_prefix},
+        {"role": "user", "content": volatile_suffix},
+    ]
+
+
+def _cached_prompt_tokens(usage: object) -> int | None:
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None)
+    return int(cached) if cached is not None else None
+
+
 async def generate_turn_text(
     *,
     speaker_handle: str,
@@ -89,50 +167,80 @@ async def generate_turn_text(
     turn_index: int,
     max_turns: int,
     done_hint: bool,
-) -> str:
-    fallback = build_turn_text(
+    target_min_tokens: int,
+    target_max_tokens: int,
+    conversation: str | None = None,
+) -> GeneratedTurn:
+    started = time.perf_counter()
+    fallback = GeneratedTurn(
+        build_turn_text(
+            speaker_handle=speaker_handle,
+            stance=stance,
+            chosen_point=chosen_point,
+            opponent_last_turn=opponent_last_turn,
+            win_condition=win_condition,
+            phase=phase,
+            evidence_mode=evidence_mode,
+            turn_index=turn_index,
+            max_turns=max_turns,
+            done_hint=done_hint,
+        )
+    )
+
+    if _client is None:
+        LLM_GENERATE_SECONDS.observe(time.perf_counter() - started, outcome="template")
+        LLM_TEMPLATE_FALLBACKS.inc(reason="no_client")
+        return fallback
+
+    messages = build_prompt_messages(
         speaker_handle=speaker_handle,
         stance=stance,
         chosen_point=chosen_point,
-        opponent_last_turn=opponent_last_turn,
+        conversation=conversation or opponent_last_turn,
         win_condition=win_condition,
         phase=phase,
         evidence_mode=evidence_mode,
         turn_index=turn_index,
         max_turns=max_turns,
-        done_hint=done_hint,
-    )
-
-    if _client is None:
-        return fallback
-
-    system_prompt = (
-        "You are an argument agent in AaS. Stay concise, witty, and useful. "
-        "No personal attacks. Keep claims tight and respond directly."
-    )
-    user_prompt = (
-        f"Speaker: {speaker_handle}\n"
-        f"Stance: {stance}\n"
-        f"Point to defend: {chosen_point}\n"
-        f"Opponent last turn: {opponent_last_turn or 'N/A'}\n"
-        f"Phase: {phase.value}\n"
-        f"Win condition: {win_condition}\n"
-        f"Evidence mode: {evidence_mode}\n"
-        f"Turn {turn_index} of {max_turns}.\n"
-        f"If truly done, end with: I have nothing meaningfully new after this turn."
+        target_min_tokens=target_min_tokens,
+        target_max_tokens=target_max_tokens,
     )
 
     try:
-        response = await _client.chat.completions.create(
-            model=settings.resolved_model_name(),
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            max_tokens=320,
-            temperature=0.9,
-        )
+        # The streaming-response wrapper returns once headers arrive, which splits time to first
+        # byte (queueing and generation on the provider) from reading the body.
+        with span("llm.request", turn_index=turn_index):
+            async with AsyncExitStack() as stack:
+                with span("llm.first_byte", turn_index=turn_index):
+                    raw = await stack.enter_async_context(
+                        _client.chat.completions.with_streaming_response.create(
+                            model=settings.resolved_model_name(),
+                            messages=messages,
+                            max_tokens=completion_budget(target_max_tokens),
+                            temperature=0.9,
+                        )
+                    )
+                response = await raw.parse()
         content = (response.choices[0].message.content or "").strip()
-        return content or fallback
+        instant("llm.complete", turn_index=turn_index)
     except Exception:
+        LLM_GENERATE_SECONDS.observe(time.perf_counter() - started, outcome="error")
+        LLM_TEMPLATE_FALLBACKS.inc(reason="error")
         return fallback
+
+    LLM_GENERATE_SECONDS.observe(time.perf_counter() - started, outcome="live")
+    generated = GeneratedTurn(content)
+    usage = response.usage
+    if usage is not None:
+        generated.prompt_tokens = usage.prompt_tokens
+        generated.completion_tokens = usage.completion_tokens
+        generated.cached_prompt_tokens = _cached_prompt_tokens(usage)
+        cached = generated.cached_prompt_tokens or 0
+        LLM_PROMPT_TOKENS.inc(cached, cache="hit")
+        LLM_PROMPT_TOKENS.inc(max(0, usage.prompt_tokens - cached), cache="miss")
+        LLM_COMPLETION_TOKENS.inc(usage.completion_tokens)
+    if not content:
+        LLM_TEMPLATE_FALLBACKS.inc(reason="empty")
+        # The empty completion was still billed; keep its counts on the fallback turn.
+        generated.text = fallback.text
+    return generated
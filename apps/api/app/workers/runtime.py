@@ -1,52 +1,294 @@
 import asyncio
-from collections import defaultdict
+import time
+from collections.abc import Coroutine
+from contextlib import suppress
+from dataclasses import dataclass
 from datetime import UTC, datetime
+from typing import TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import Argument, ArgumentParticipant, ArgumentPhase, ArgumentReport, ArgumentStatus, BadgeAward, Turn
+from app.core.config import get_settings
+from app.core.metrics import (
+    DEBATE_CANCEL_SECONDS,
+    DEBATE_QUEUE_WAIT_SECONDS,
+    MODERATION_FLAGS,
+    RUNNING_DEBATES,
+)
+from app.db.models import (
+    Argument,
+    ArgumentArchive,
+    ArgumentParticipant,
+    ArgumentPhase,
+    ArgumentReport,
+    ArgumentStatus,
+    BadgeAward,
+    Turn,
+)
 from app.db.session import SessionLocal
-from app.services.argument_engine import PACE_DELAYS, compute_phase, cosine_similarity
+from app.services.admission import AdmissionController, get_admission_controller
+from app.services.argument_engine import compute_phase, cosine_similarity
 from app.services.badges import maybe_award_badge
+from app.services.cancellation import CancelWatch
 from app.services.events import persist_event
 from app.services.moderation import moderate_text
 from app.services.reporting import build_wrapped_report
+from app.services.tracing import current_trace, flush_trace, instant, span, start_trace
+from app.workers.debate_state import DebateState
 from app.workers.langgraph_scheduler import generate_turn_schedule
-from app.workers.llm import generate_turn_text, get_llm_metadata
-
-
-def _extract_points(snapshot: dict | None) -> list[str]:
-    if not snapshot:
-        return ["I refuse to yield this ground", "This tradeoff is unacceptable", "The burden of proof is unmet"]
-    points = snapshot.get("defend_points") or []
-    cleaned = [str(item).strip() for item in points if str(item).strip()]
-    if len(cleaned) < 3:
-        cleaned.extend(["This is still unresolved"] * (3 - len(cleaned)))
-    return cleaned[:3]
-
-
-def _extract_stance(snapshot: dict | None) -> str:
-    if not snapshot:
-        return "I stand by my position"
-    return str(snapshot.get("stance") or "I stand by my position")
-
-
-async def run_argument(argument_id: str) -> None:
+from app.workers.llm import GeneratedTurn, generate_turn_text, get_llm_metadata
+
+settings = get_settings()
+
+ADMISSION_POLL_SECONDS = 1.0
+
+T = TypeVar("T")
+
+
+class DebateCancelled(Exception):
+    pass
+
+
+@dataclass(slots=True)
+class Queued:
+    # run_argument returns this while the debate waits for a running slot; the caller runs it
+    # again after ADMISSION_POLL_SECONDS, passing the position back so it is announced on change.
+    position: int | None
+
+
+class _PrefetchedTurn:
+    __slots__ = ("chosen_idx", "done_hint", "is_new_claim", "task")
+
+    def __init__(
+        self, chosen_idx: int, is_new_claim: bool, done_hint: bool, task: asyncio.Task[GeneratedTurn]
+    ) -> None:
+        self.chosen_idx = chosen_idx
+        self.is_new_claim = is_new_claim
+        self.done_hint = done_hint
+        self.task = task
+
+
+def _generate(
+    state: DebateState,
+    seat: int,
+    *,
+    turn_index: int,
+    phase: ArgumentPhase,
+    chosen_idx: int,
+    done_hint: bool,
+    with_history: bool = True,
+) -> Coroutine[None, None, GeneratedTurn]:
+    speaker = state.seats[seat]
+    return generate_turn_text(
+        speaker_handle=speaker.user_id,
+        stance=speaker.stance,
+        chosen_point=speaker.points[chosen_idx],
+        opponent_last_turn=state.previous_turn_text if with_history else None,
+        win_condition=state.win_condition,
+        phase=phase,
+        evidence_mode=state.evidence_mode,
+        turn_index=turn_index,
+        max_turns=state.max_turns,
+        done_hint=done_hint,
+        target_min_tokens=state.target_min_tokens,
+        target_max_tokens=state.target_max_tokens,
+        conversation=state.memory.render() if with_history else None,
+    )
+
+
+def _start_opening_round(state: DebateState, turn_schedule: list[int]) -> dict[int, _PrefetchedTurn]:
+    # Opening statements do not depend on each other, so the first turn of every seat is generated
+    # concurrently up front and the results are then paced out in schedule order.
+    prefetched: dict[int, _PrefetchedTurn] = {}
+    seen: set[int] = set()
+    for turn_index, seat in enumerate(turn_schedule, start=1):
+        phase = compute_phase(turn_index, state.max_turns)
+        if seat in seen or phase != ArgumentPhase.OPENING:
+            break
+        seen.add(seat)
+        chosen_idx, is_new_claim, done_hint = state.choose_claim(seat, turn_index)
+        task = asyncio.create_task(
+            _generate(
+                state,
+                seat,
+                turn_index=turn_index,
+                phase=phase,
+                chosen_idx=chosen_idx,
+                done_hint=done_hint,
+                with_history=False,
+            )
+        )
+        prefetched[turn_index] = _PrefetchedTurn(chosen_idx, is_new_claim, done_hint, task)
+    # Unused prefetches must not outlive the debate, including one cancelled mid-turn.
+    current = asyncio.current_task()
+    if current is not None:
+        current.add_done_callback(lambda _: [turn.task.cancel() for turn in prefetched.values()])
+    return prefetched
+
+
+async def _admit(
+    admission: AdmissionController, argument_id: str, reported_position: int | None
+) -> bool | Queued:
+    # One admission attempt: True once a running slot is held, False when the argument is no
+    # longer runnable, otherwise the queue state, announced to spectators when it changed. Worker
+    # threads are not held while queued; the actor re-sends itself with a delay instead.
+    async with SessionLocal() as session:
+        result = await session.execute(
+            select(Argument.status, Argument.audience_mode, Argument.started_at).where(
+                Argument.id == argument_id
+            )
+        )
+        row = result.one_or_none()
+    if row is None or row.status != ArgumentStatus.RUNNING:
+        return False
+
+    priority = bool(row.audience_mode)
+    started_at = row.started_at
+    if started_at is not None and started_at.tzinfo is None:
+        started_at = started_at.replace(tzinfo=UTC)
+    queued_at = started_at.timestamp() if started_at is not None else time.time()
+    await admission.enqueue(argument_id, queued_at=queued_at, priority=priority)
+    if not await admission.try_acquire(argument_id):
+        position = await admission.position(argument_id)
+        if position is not None and position != reported_position:
+            async with SessionLocal() as session:
+                await persist_event(
+                    session,
+                    argument_id=argument_id,
+                    event_type="turn.meta",
+                    payload={"state": "queued", "position": position},
+                )
+                await session.commit()
+        return Queued(position if position is not None else reported_position)
+
+    DEBATE_QUEUE_WAIT_SECONDS.observe(
+        max(0.0, time.time() - queued_at), lane="priority" if priority else "standard"
+    )
+    return True
+
+
+async def _renew_lease(admission: AdmissionController, argument_id: str) -> None:
+    while True:
+        await asyncio.sleep(admission.lease_seconds / 3)
+        await admission.renew(argument_id)
+
+
+async def _unless_cancelled(coro: Coroutine[None, None, T], watch: CancelWatch) -> T:
+    # Runs coro as a task and cancels it, along with any LLM request or pacing sleep it is
+    # awaiting, as soon as a cancel request arrives.
+    task = asyncio.create_task(coro)
+    waiter = asyncio.create_task(watch.requested.wait())
+    try:
+        await asyncio.wait((task, waiter), return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    finally:
+        waiter.cancel()
+    if not task.done():
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+        raise DebateCancelled
+    return task.result()
+
+
+async def _finalize_cancelled(argument_id: str, watch: CancelWatch) -> None:
     async with SessionLocal() as session:
         argument = await session.get(Argument, argument_id)
         if not argument or argument.status != ArgumentStatus.RUNNING:
             return
+        argument.status = ArgumentStatus.COMPLETED
+        argument.ended_at = datetime.now(UTC)
+        await persist_event(
+            session,
+            argument_id=argument_id,
+            event_type="argument.completed",
+            payload={
+                "turn_count": argument.turn_count,
+                "reason": "cancelled",
+                "cancel_reason": watch.reason,
+                "prompt_tokens": argument.prompt_tokens,
+                "completion_tokens": argument.completion_tokens,
+            },
+            turn_index=argument.turn_count,
+        )
+        await session.commit()
+    if watch.requested_at is not None:
+        waited = argument.ended_at - watch.requested_at
+        DEBATE_CANCEL_SECONDS.observe(max(0.0, waited.total_seconds()))
+
+
+async def run_argument(argument_id: str, *, reported_position: int | None = None) -> Queued | None:
+    admission = get_admission_controller()
+    watch = await CancelWatch(argument_id).start()
+    trace = None
+    queued = None
+    try:
+        try:
+            admitted = await _unless_cancelled(
+                _admit(admission, argument_id, reported_position), watch
+            )
+            if isinstance(admitted, Queued):
+                queued = admitted
+            elif admitted:
+                # Started once admitted, so queued attempts do not overwrite each other's trace.
+                trace = start_trace(argument_id)
+                lease = asyncio.create_task(_renew_lease(admission, argument_id))
+                try:
+                    with RUNNING_DEBATES.track():
+                        await _unless_cancelled(_run_argument(argument_id, watch), watch)
+                finally:
+                    lease.cancel()
+        finally:
+            if queued is None:
+                await admission.release(argument_id)
+    except DebateCancelled:
+        await _finalize_cancelled(argument_id, watch)
+    finally:
+        await watch.stop()
+        if trace is not None:
+            await flush_trace(trace)
+    return queued
+
+
+async def _run_argument(argument_id: str, watch: CancelWatch) -> None:
+    async with SessionLocal() as session:
+        # Plain columns, not the entity: nothing the debate loop holds is tied to the session.
+        row = await session.execute(
+            select(
+                Argument.id,
+                Argument.status,
+                Argument.phase,
+                Argument.controls,
+                Argument.max_turns,
+                Argument.target_min_tokens,
+                Argument.target_max_tokens,
+                Argument.turn_count,
+                Argument.prompt_tokens,
+                Argument.completion_tokens,
+            ).where(Argument.id == argument_id)
+        )
+        argument = row.one_or_none()
+        if not argument or argument.status != ArgumentStatus.RUNNING:
+            return
+        progress = update(Argument).where(Argument.id == argument_id)
 
         result = await session.execute(
-            select(ArgumentParticipant)
+            select(
+                ArgumentParticipant.id,
+                ArgumentParticipant.user_id,
+                ArgumentParticipant.seat_order,
+                ArgumentParticipant.persona_snapshot,
+            )
             .where(ArgumentParticipant.argument_id == argument_id)
             .where(ArgumentParticipant.ready.is_(True))
             .order_by(ArgumentParticipant.seat_order.asc())
         )
-        participants = list(result.scalars().all())
+        participants = result.all()
         if len(participants) < 2:
-            argument.status = ArgumentStatus.FAILED
+            await session.execute(progress.values(status=ArgumentStatus.FAILED))
             await persist_event(
                 session,
                 argument_id=argument_id,
@@ -56,80 +298,64 @@ async def run_argument(argument_id: str) -> None:
             await session.commit()
             return
 
-        controls = argument.controls or {}
-        composure = int(controls.get("argument_composure", 45))
-        pace_mode = controls.get("pace_mode", "NORMAL")
-        evidence_mode = controls.get("evidence_mode", "FREEFORM")
-        win_condition = controls.get("win_condition", "BE_RIGHT")
-
-        delay = PACE_DELAYS.get(pace_mode, 0.03)
-        max_turns = int(argument.max_turns)
-        turn_schedule = generate_turn_schedule(len(participants), max_turns)
+        state = DebateState.start(argument, participants, pace_delay_scale=settings.pace_delay_scale)
+        max_turns = state.max_turns
+        turn_schedule = generate_turn_schedule(len(state.seats), max_turns)
         llm_metadata = get_llm_metadata()
-
-        claim_usage: dict[str, set[int]] = defaultdict(set)
-        done_streak: dict[str, int] = defaultdict(int)
-        previous_turn_text: str | None = None
-        stagnation_hits = 0
-        badge_cooldown = 0
-        badges_so_far = 0
+        opening = _start_opening_round(state, turn_schedule) if settings.parallel_opening_round else {}
 
         await persist_event(
             session,
             argument_id=argument_id,
             event_type="phase.changed",
-            payload={"phase": argument.phase.value},
+            payload={"phase": state.phase},
         )
         await session.commit()
 
         for turn_index, speaker_idx in enumerate(turn_schedule, start=1):
-            speaker = participants[speaker_idx]
+            if await watch.check():
+                raise DebateCancelled
+            speaker = state.seats[speaker_idx]
             phase = compute_phase(turn_index, max_turns)
-            if argument.phase != phase:
-                argument.phase = phase
+            instant("turn.start", turn_index=turn_index, seat_order=speaker.seat_order)
+            if state.phase != phase.value:
+                state.phase = phase.value
+                await session.execute(progress.values(phase=phase))
                 await persist_event(
                     session,
                     argument_id=argument_id,
                     event_type="phase.changed",
-                    payload={"phase": argument.phase.value},
+                    payload={"phase": state.phase},
                     turn_index=turn_index,
                 )
                 await session.commit()
 
-            points = _extract_points(speaker.persona_snapshot)
-            stance = _extract_stance(speaker.persona_snapshot)
-
-            unused_claim_idx = next((idx for idx in range(len(points)) if idx not in claim_usage[speaker.id]), None)
-            if unused_claim_idx is None:
-                chosen_idx = (turn_index + speaker.seat_order) % len(points)
-                done_hint = turn_index > int(max_turns * 0.6)
-            else:
-                chosen_idx = unused_claim_idx
-                done_hint = False
-
-            chosen_point = points[chosen_idx]
-            is_new_claim = chosen_idx not in claim_usage[speaker.id]
-            claim_usage[speaker.id].add(chosen_idx)
-
-            generated = await generate_turn_text(
-                speaker_handle=speaker.user_id,
-                stance=stance,
-                chosen_point=chosen_point,
-                opponent_last_turn=previous_turn_text,
-                win_condition=win_condition,
-                phase=phase,
-                evidence_mode=evidence_mode,
-                turn_index=turn_index,
-                max_turns=max_turns,
-                done_hint=done_hint,
-            )
-            moderated_text, was_flagged = moderate_text(generated)
+            prefetched = opening.pop(turn_index, None)
+            with span("llm", turn_index=turn_index):
+                if prefetched is not None:
+                    chosen_idx = prefetched.chosen_idx
+                    is_new_claim, done_hint = prefetched.is_new_claim, prefetched.done_hint
+                    generated = await prefetched.task
+                else:
+                    chosen_idx, is_new_claim, done_hint = state.choose_claim(speaker_idx, turn_index)
+                    generated = await _generate(
+                        state,
+                        speaker_idx,
+                        turn_index=turn_index,
+                        phase=phase,
+                        chosen_idx=chosen_idx,
+                        done_hint=done_hint,
+                    )
+            with span("moderation", turn_index=turn_index):
+                moderated_text, was_flagged = moderate_text(generated.text)
+            if was_flagged:
+                MODERATION_FLAGS.inc()
 
             await persist_event(
                 session,
                 argument_id=argument_id,
                 event_type="turn.meta",
-                payload={"speaker_participant_id": speaker.id, "state": "thinking"},
+                payload={"speaker_participant_id": speaker.participant_id, "state": "thinking"},
                 turn_index=turn_index,
             )
             await session.commit()
@@ -137,46 +363,52 @@ async def run_argument(argument_id: str) -> None:
             token_buffer = []
             for token in moderated_text.split():
                 token_buffer.append(token)
-                await persist_event(
-                    session,
-                    argument_id=argument_id,
-                    event_type="turn.token",
-                    payload={
-                        "speaker_participant_id": speaker.id,
-                        "token": f"{token} ",
-                    },
-                    turn_index=turn_index,
-                )
-                await session.commit()
-                await asyncio.sleep(delay)
+                with span("persist.token", turn_index=turn_index):
+                    await persist_event(
+                        session,
+                        argument_id=argument_id,
+                        event_type="turn.token",
+                        payload={
+                            "speaker_participant_id": speaker.participant_id,
+                            "token": f"{token} ",
+                        },
+                        turn_index=turn_index,
+                    )
+                    await session.commit()
+                with span("pacing.sleep"):
+                    await asyncio.sleep(state.delay)
 
             final_text = " ".join(token_buffer).strip()
-            similarity = cosine_similarity(previous_turn_text or "", final_text)
-            if similarity > 0.9 and not is_new_claim:
-                stagnation_hits += 1
-            else:
-                stagnation_hits = max(0, stagnation_hits - 1)
-
-            if done_hint and not is_new_claim:
-                done_streak[speaker.id] += 1
-            else:
-                done_streak[speaker.id] = 0
+            similarity = cosine_similarity(state.previous_turn_text or "", final_text)
 
             turn = Turn(
                 argument_id=argument_id,
                 turn_index=turn_index,
-                speaker_participant_id=speaker.id,
+                speaker_participant_id=speaker.participant_id,
                 phase=phase,
                 content=final_text,
                 metrics={
                     "similarity_to_previous": similarity,
                     "is_new_claim": is_new_claim,
                     "was_flagged": was_flagged,
+                    "prompt_tokens": generated.prompt_tokens,
+                    "completion_tokens": generated.completion_tokens,
                 },
-                model_metadata=llm_metadata,
+                model_metadata=(
+                    llm_metadata
+                    if generated.cached_prompt_tokens is None
+                    else {**llm_metadata, "cached_prompt_tokens": generated.cached_prompt_tokens}
+                ),
             )
             session.add(turn)
-            argument.turn_count = turn_index
+            state.record_usage(turn_index, generated.prompt_tokens, generated.completion_tokens)
+            await session.execute(
+                progress.values(
+                    turn_count=state.turn_count,
+                    prompt_tokens=state.prompt_tokens,
+                    completion_tokens=state.completion_tokens,
+                )
+            )
             await session.flush()
 
             await persist_event(
@@ -185,23 +417,26 @@ async def run_argument(argument_id: str) -> None:
                 event_type="turn.final",
                 payload={
                     "turn_id": turn.id,
-                    "speaker_participant_id": speaker.id,
+                    "speaker_participant_id": speaker.participant_id,
                     "content": final_text,
                     "phase": phase.value,
                 },
                 turn_index=turn_index,
             )
 
-            badge = maybe_award_badge(
-                turn_text=final_text,
-                previous_turn_text=previous_turn_text,
-                evidence_mode=evidence_mode,
-                composure=composure,
-                turn_index=turn_index,
-                cooldown_remaining=badge_cooldown,
-                badges_so_far=badges_so_far,
-            )
-            if badge and badge.confidence >= 0.68:
+            with span("badge", turn_index=turn_index):
+                badge = maybe_award_badge(
+                    turn_text=final_text,
+                    previous_turn_text=state.previous_turn_text,
+                    evidence_mode=state.evidence_mode,
+                    composure=state.composure,
+                    turn_index=turn_index,
+                    cooldown_remaining=state.badge_cooldown,
+                    badges_so_far=state.badges_so_far,
+                )
+            awarded = badge is not None and badge.confidence >= 0.68
+            state.record_badge(awarded)
+            if awarded:
                 badge_row = BadgeAward(
                     argument_id=argument_id,
                     turn_id=turn.id,
@@ -210,8 +445,6 @@ async def run_argument(argument_id: str) -> None:
                     confidence=badge.confidence,
                 )
                 session.add(badge_row)
-                badges_so_far += 1
-                badge_cooldown = 2
                 await session.flush()
                 await persist_event(
                     session,
@@ -226,24 +459,38 @@ async def run_argument(argument_id: str) -> None:
                     },
                     turn_index=turn_index,
                 )
-            else:
-                badge_cooldown = max(0, badge_cooldown - 1)
 
-            previous_turn_text = final_text
-            await session.commit()
+            state.record_turn(
+                speaker_idx,
+                final_text,
+                similarity=similarity,
+                is_new_claim=is_new_claim,
+                done_hint=done_hint,
+            )
+            with span("persist.final", turn_index=turn_index):
+                await session.commit()
 
-            everyone_done = all(done_streak[p.id] >= 2 for p in participants)
-            if everyone_done or stagnation_hits >= 2:
+            trace = current_trace()
+            if trace is not None:
+                await flush_trace(trace)
+
+            if state.should_stop():
                 break
 
-        argument.status = ArgumentStatus.COMPLETED
-        argument.ended_at = datetime.now(UTC)
+        await session.execute(
+            progress.values(status=ArgumentStatus.COMPLETED, ended_at=datetime.now(UTC))
+        )
         await persist_event(
             session,
             argument_id=argument_id,
             event_type="argument.completed",
-            payload={"turn_count": argument.turn_count, "reason": "natural_stop"},
-            turn_index=argument.turn_count,
+            payload={
+                "turn_count": state.turn_count,
+                "reason": "natural_stop",
+                "prompt_tokens": state.prompt_tokens,
+                "completion_tokens": state.completion_tokens,
+            },
+            turn_index=state.turn_count,
         )
         await session.commit()
 
@@ -253,6 +500,9 @@ async def run_postprocess(argument_id: str) -> None:
         argument = await session.get(Argument, argument_id)
         if not argument:
             return
+        # Archived arguments no longer have hot turns; their report was built before trimming.
+        if await session.get(ArgumentArchive, argument_id) is not None:
+            return
 
         turn_rows = await session.execute(
             select(Turn)
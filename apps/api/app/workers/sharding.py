@@ -0,0 +1,55 @@
+"""Consistent-hash placement of arguments onto worker shards.
+
+With `DEBATE_SHARDS` above 1, every stage of an argument (run, postprocess, archive) is sent to
+`<queue>.<shard>`, so the worker process consuming that shard keeps its per-argument state warm.
+Shards sit on a hash ring with virtual nodes: changing the shard count moves only about 1/n of
+arguments to a different shard instead of reshuffling all of them.
+"""
+
+import hashlib
+from bisect import bisect_right
+from functools import lru_cache
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+VIRTUAL_NODES = 128
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    __slots__ = ("_points", "_shards", "size")
+
+    def __init__(self, size: int, virtual_nodes: int = VIRTUAL_NODES) -> None:
+        points = sorted(
+            (_hash(f"shard-{shard}#{replica}"), shard)
+            for shard in range(size)
+            for replica in range(virtual_nodes)
+        )
+        self.size = size
+        self._points = [point for point, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard_for(self, key: str) -> int:
+        index = bisect_right(self._points, _hash(key))
+        return self._shards[index % len(self._points)]
+
+
+@lru_cache(maxsize=8)
+def get_ring(size: int) -> HashRing:
+    return HashRing(size)
+
+
+def shard_queue_name(queue_name: str, shard: int) -> str:
+    return f"{queue_name}.{shard}"
+
+
+def queue_for_argument(queue_name: str, argument_id: str, shards: int | None = None) -> str:
+    shards = settings.debate_shards if shards is None else shards
+    if shards <= 1:
+        return queue_name
+    return shard_queue_name(queue_name, get_ring(shards).shard_for(argument_id))
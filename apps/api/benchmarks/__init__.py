@@ -0,0 +1 @@
+"""Benchmark harnesses for the API and worker hot paths."""
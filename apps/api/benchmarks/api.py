@@ -0,0 +1,167 @@
+"""Request-level benchmark for read endpoints against a seeded SQLite database.
+
+Seeds one completed argument with a large event log, then times GET requests through the ASGI
+app in-process (no sockets), so the numbers isolate query, validation and serialization cost.
+
+    cd apps/api
+    python -m benchmarks.api --events 5000 --save-baseline
+    python -m benchmarks.api --events 5000 --compare --threshold 15
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from benchmarks.baseline import compare, format_report, load_baseline, save_baseline
+from benchmarks.load import _configure_environment, _percentile
+
+CREATOR = {"x-user-id": "bench-creator", "x-user-handle": "creator"}
+
+
+async def _seed(*, events: int, turns: int) -> str:
+    from app.db.models import (
+        Argument,
+        ArgumentParticipant,
+        ArgumentPhase,
+        ArgumentStatus,
+        Turn,
+        TurnEvent,
+        User,
+    )
+    from app.db.session import SessionLocal, init_db
+
+    await init_db()
+    started = datetime.now(UTC) - timedelta(hours=1)
+    async with SessionLocal() as session:
+        session.add_all(
+            [User(id="bench-creator", handle="creator"), User(id="bench-other", handle="other")]
+        )
+        argument = Argument(
+            creator_user_id="bench-creator",
+            topic="Benchmarks should be boring",
+            status=ArgumentStatus.COMPLETED,
+            phase=ArgumentPhase.RESOLUTION,
+            controls={"audience_mode": False},
+            max_turns=turns,
+            turn_count=turns,
+            started_at=started,
+            ended_at=started + timedelta(minutes=30),
+        )
+        session.add(argument)
+        await session.flush()
+        seats = [
+            ArgumentParticipant(
+                argument_id=argument.id,
+                user_id=user_id,
+                seat_order=seat,
+                ready=True,
+                persona_snapshot={"stance": "Benchmarks", "defend_points": ["a", "b", "c"]},
+            )
+            for seat, user_id in enumerate(("bench-creator", "bench-other"))
+        ]
+        session.add_all(seats)
+        await session.flush()
+        for index in range(1, turns + 1):
+            session.add(
+                Turn(
+                    argument_id=argument.id,
+                    turn_index=index,
+                    speaker_participant_id=seats[index % 2].id,
+                    phase=ArgumentPhase.ESCALATION,
+                    content="Benchmark turn content " * 12,
+                    metrics={"tokens": 60},
+                    model_metadata={"provider": "template"},
+                    created_at=started + timedelta(seconds=index),
+                )
+            )
+        for event_id in range(events):
+            session.add(
+                TurnEvent(
+                    argument_id=argument.id,
+                    turn_index=event_id // 40 + 1,
+                    event_type="turn.token",
+                    payload={"token": "word ", "speaker_participant_id": seats[event_id % 2].id},
+                    created_at=started + timedelta(milliseconds=event_id),
+                )
+            )
+        await session.commit()
+        return argument.id
+
+
+async def _time_requests(client, path: str, requests: int) -> list[float]:
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get(path, headers=CREATOR)
+        timings.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+    return timings
+
+
+async def run_benchmark(*, events: int, turns: int, requests: int) -> dict[str, float]:
+    import httpx
+
+    from app.main import app
+
+    argument_id = await _seed(events=events, turns=turns)
+    endpoints = {
+        "get_turns": f"/v1/arguments/{argument_id}/turns",
+        "get_argument": f"/v1/arguments/{argument_id}",
+        "my_arguments": "/v1/me/arguments",
+    }
+    metrics: dict[str, float] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, path in endpoints.items():
+            await _time_requests(client, path, 3)
+            timings = await _time_requests(client, path, requests)
+            metrics[f"{name}_mean_ms"] = statistics.fmean(timings)
+            metrics[f"{name}_p50_ms"] = _percentile(timings, 50)
+            metrics[f"{name}_p95_ms"] = _percentile(timings, 95)
+    return metrics
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--requests", type=int, default=30, help="timed requests per endpoint")
+    parser.add_argument("--name", default=None, help="baseline name (default: api-<events>)")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="fail on regression vs baseline")
+    parser.add_argument("--threshold", type=float, default=15.0, help="allowed slowdown in percent")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="aas-bench-") as workdir:
+        _configure_environment(Path(workdir) / "bench.db")
+        # Caches would turn the repeated GETs into no-ops; this benchmark measures the real path.
+        os.environ["RESPONSE_CACHE_TTL_SECONDS"] = "0"
+        metrics = asyncio.run(
+            run_benchmark(events=args.events, turns=args.turns, requests=args.requests)
+        )
+
+    name = args.name or f"api-{args.events}"
+    baseline = load_baseline(name)
+    baseline_metrics = baseline["metrics"] if baseline else None
+    regressions = []
+    if args.compare and baseline_metrics:
+        regressions = compare(metrics, baseline_metrics, threshold_pct=args.threshold)
+
+    print(format_report(metrics, baseline_metrics, regressions))
+    if args.save_baseline:
+        params = {"events": args.events, "turns": args.turns, "requests": args.requests}
+        print(f"saved baseline to {save_baseline(name, metrics, params=params)}")
+    if args.compare and not baseline_metrics:
+        print(f"no baseline named {name}; run with --save-baseline first", file=sys.stderr)
+        return 2
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
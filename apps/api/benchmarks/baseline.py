@@ -0,0 +1,84 @@
+"""Baseline persistence and regression comparison shared by the benchmark harnesses."""
+
+import platform
+import sys
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+import orjson
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+
+@dataclass(slots=True)
+class Regression:
+    metric: str
+    baseline: float
+    current: float
+    change_pct: float
+
+
+def baseline_path(name: str) -> Path:
+    return BASELINE_DIR / f"{name}.json"
+
+
+def save_baseline(name: str, metrics: dict[str, float], *, params: dict | None = None) -> Path:
+    BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+    path = baseline_path(name)
+    document = {
+        "name": name,
+        "recorded_at": datetime.now(UTC).isoformat(),
+        "python": sys.version.split()[0],
+        "machine": platform.platform(),
+        "params": params or {},
+        "metrics": metrics,
+    }
+    path.write_bytes(orjson.dumps(document, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+    return path
+
+
+def load_baseline(name: str) -> dict | None:
+    path = baseline_path(name)
+    if not path.exists():
+        return None
+    return orjson.loads(path.read_bytes())
+
+
+def compare(
+    current: dict[str, float],
+    baseline: dict[str, float],
+    *,
+    threshold_pct: float,
+    higher_is_better: set[str] = frozenset(),
+) -> list[Regression]:
+    regressions: list[Regression] = []
+    for metric, before in baseline.items():
+        after = current.get(metric)
+        if after is None or not before:
+            continue
+        change_pct = (after - before) / abs(before) * 100.0
+        worse = -change_pct if metric in higher_is_better else change_pct
+        if worse > threshold_pct:
+            regressions.append(Regression(metric, before, after, change_pct))
+    return regressions
+
+
+def format_report(
+    current: dict[str, float],
+    baseline: dict[str, float] | None,
+    regressions: list[Regression],
+) -> str:
+    flagged = {item.metric for item in regressions}
+    width = max((len(metric) for metric in current), default=10)
+    lines = [f"{'metric':<{width}}  {'current':>14}  {'baseline':>14}  {'change':>9}"]
+    for metric, value in current.items():
+        before = baseline.get(metric) if baseline else None
+        if before:
+            change = f"{(value - before) / abs(before) * 100.0:+8.1f}%"
+        else:
+            change = "         -"
+        marker = "  REGRESSION" if metric in flagged else ""
+        before_text = f"{before:>14.6g}" if before is not None else f"{'-':>14}"
+        lines.append(f"{metric:<{width}}  {value:>14.6g}  {before_text}  {change}{marker}")
+    return "\n".join(lines)
@@ -0,0 +1,179 @@
+"""Publish-to-delivery latency of the event bus, run the same way against every backend.
+
+Each argument gets several subscribers on a second bus, standing in for another process, so
+deliveries cross the backend; `--colocated` subscribes on the publishing bus instead. Events are
+published one round per argument at a time, and each delivery is timed from just before
+`publish`. Redis and Postgres need a server:
+
+    cd apps/api
+    python -m benchmarks.event_bus --backend local
+    python -m benchmarks.event_bus --backend redis --url redis://localhost:6379/15 --colocated
+    python -m benchmarks.event_bus --backend redis --url redis://localhost:6379/15
+    python -m benchmarks.event_bus --backend postgres --url postgresql+asyncpg://aas@localhost/aas
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from contextlib import suppress
+
+import orjson
+
+from app.services.event_bus import (
+    EventBus,
+    LocalBackend,
+    PostgresBackend,
+    RedisBackend,
+    asyncpg_dsn,
+)
+from app.services.wire import WireEvent
+from benchmarks.baseline import compare, format_report, load_baseline, save_baseline
+from benchmarks.load import _percentile
+
+HIGHER_IS_BETTER = frozenset({"deliveries_per_s"})
+
+
+def _create_buses(backend: str, url: str | None, *, colocated: bool) -> tuple[EventBus, EventBus]:
+    # Returns (publisher, subscriber) buses.
+    if backend == "local":
+        shared = LocalBackend()
+        publisher = EventBus(backend=shared)
+        return publisher, publisher if colocated else EventBus(backend=shared)
+    if not url:
+        raise SystemExit(f"--url is required for the {backend} backend")
+    if backend == "redis":
+        publisher = EventBus(backend=RedisBackend(url))
+        return publisher, publisher if colocated else EventBus(backend=RedisBackend(url))
+    publisher = EventBus(backend=PostgresBackend(asyncpg_dsn(url)))
+    subscriber = EventBus(backend=PostgresBackend(asyncpg_dsn(url)))
+    return publisher, publisher if colocated else subscriber
+
+
+async def run_benchmark(
+    publisher: EventBus,
+    subscriber: EventBus,
+    *,
+    arguments: int,
+    subscribers: int,
+    events: int,
+    payload_bytes: int,
+) -> dict[str, float]:
+    # Event id 0 is a probe published until a subscription is live; timed events start at 1.
+    argument_ids = [f"bench-{index}" for index in range(arguments)]
+    sent_at: dict[tuple[str, int], float] = {}
+    latencies_ms: list[float] = []
+    live: list[asyncio.Event] = []
+
+    async def consume(argument_id: str, ready: asyncio.Event) -> None:
+        seen = 0
+        async for event in subscriber.subscribe(argument_id):
+            if event.id == 0:
+                ready.set()
+                continue
+            latencies_ms.append((time.perf_counter() - sent_at[argument_id, event.id]) * 1000)
+            seen += 1
+            if seen == events:
+                return
+
+    tasks = []
+    for argument_id in argument_ids:
+        for _ in range(subscribers):
+            ready = asyncio.Event()
+            live.append(ready)
+            tasks.append(asyncio.create_task(consume(argument_id, ready)))
+    probe = WireEvent(0, b"{}")
+    while not all(ready.is_set() for ready in live):
+        for argument_id in argument_ids:
+            await publisher.publish(argument_id, probe)
+        with suppress(TimeoutError):
+            await asyncio.wait_for(asyncio.gather(*(ready.wait() for ready in live)), 0.05)
+
+    publish_ms: list[float] = []
+    started = time.perf_counter()
+    for event_id in range(1, events + 1):
+        for argument_id in argument_ids:
+            event = WireEvent(event_id, orjson.dumps({"id": event_id, "text": "x" * payload_bytes}))
+            sent_at[argument_id, event_id] = time.perf_counter()
+            await publisher.publish(argument_id, event)
+            publish_ms.append((time.perf_counter() - sent_at[argument_id, event_id]) * 1000)
+        # Debates publish between awaits; let subscribers run instead of timing a backlog.
+        await asyncio.sleep(0)
+    await asyncio.wait_for(asyncio.gather(*tasks), 60)
+    elapsed = time.perf_counter() - started
+    await publisher.close()
+    if subscriber is not publisher:
+        await subscriber.close()
+
+    return {
+        "publish_mean_ms": statistics.fmean(publish_ms),
+        "delivery_p50_ms": _percentile(latencies_ms, 50),
+        "delivery_p95_ms": _percentile(latencies_ms, 95),
+        "delivery_p99_ms": _percentile(latencies_ms, 99),
+        "deliveries_per_s": len(latencies_ms) / elapsed,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=("local", "redis", "postgres"), default="local")
+    parser.add_argument("--url", default=None, help="Redis URL or PostgreSQL database URL")
+    parser.add_argument(
+        "--colocated", action="store_true", help="subscribe in the publishing process"
+    )
+    parser.add_argument("--arguments", type=int, default=20)
+    parser.add_argument("--subscribers", type=int, default=2, help="subscribers per argument")
+    parser.add_argument("--events", type=int, default=200, help="events per argument")
+    parser.add_argument("--payload-bytes", type=int, default=200)
+    parser.add_argument(
+        "--name", default=None, help="baseline name (default: event-bus-<backend>[-colocated])"
+    )
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="fail on regression vs baseline")
+    parser.add_argument("--threshold", type=float, default=15.0, help="allowed regression in percent")
+    args = parser.parse_args(argv)
+
+    publisher, subscriber = _create_buses(args.backend, args.url, colocated=args.colocated)
+    metrics = asyncio.run(
+        run_benchmark(
+            publisher,
+            subscriber,
+            arguments=args.arguments,
+            subscribers=args.subscribers,
+            events=args.events,
+            payload_bytes=args.payload_bytes,
+        )
+    )
+
+    suffix = "-colocated" if args.colocated else ""
+    name = args.name or f"event-bus-{args.backend}{suffix}"
+    baseline = load_baseline(name)
+    baseline_metrics = baseline["metrics"] if baseline else None
+    regressions = []
+    if args.compare and baseline_metrics:
+        regressions = compare(
+            metrics,
+            baseline_metrics,
+            threshold_pct=args.threshold,
+            higher_is_better=HIGHER_IS_BETTER,
+        )
+
+    print(format_report(metrics, baseline_metrics, regressions))
+    if args.save_baseline:
+        params = {
+            "arguments": args.arguments,
+            "subscribers": args.subscribers,
+            "events": args.events,
+            "payload_bytes": args.payload_bytes,
+            "colocated": args.colocated,
+        }
+        print(f"saved baseline to {save_baseline(name, metrics, params=params)}")
+    if args.compare and not baseline_metrics:
+        print(f"no baseline named {name}; run with --save-baseline first", file=sys.stderr)
+        return 2
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,216 @@
+"""Stand-in for an OpenAI-compatible chat-completions provider, for load tests and CI.
+
+Serves `POST /v1/chat/completions` (streaming and non-streaming) with deterministic text derived
+from the request, latencies drawn from a named profile, optional 429/500 injection and a simulated
+prefix cache that reports `cached_tokens` for repeated system messages. Point the API at it with:
+
+    cd apps/api
+    python -m benchmarks.fake_llm --port 8700 --profile realistic --error-429 0.02
+    MODEL_PROVIDER=openai OPENAI_API_KEY=fake LLM_BASE_URL=http://127.0.0.1:8700/v1 uvicorn app.main:app
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+import orjson
+from fastapi import FastAPI, Request
+from fastapi.responses import Response, StreamingResponse
+
+
+@dataclass(frozen=True, slots=True)
+class LatencyProfile:
+    # Time to first token is lognormal around the median; tokens then arrive at a fixed rate.
+    ttft_median_s: float
+    ttft_sigma: float
+    tokens_per_second: float
+
+
+PROFILES: dict[str, LatencyProfile] = {
+    "instant": LatencyProfile(0.0, 0.0, 0.0),
+    "fast": LatencyProfile(0.15, 0.3, 150.0),
+    "realistic": LatencyProfile(0.45, 0.5, 60.0),
+    "slow": LatencyProfile(1.5, 0.6, 25.0),
+}
+
+WORDS = (
+    "evidence", "tradeoff", "burden", "claim", "outcome", "signal", "premise", "counter",
+    "receipts", "logic", "overlap", "flaw", "frame", "point", "stakes", "record", "cost",
+    "benefit", "risk", "history", "incentive", "pattern", "context", "principle",
+)
+# Providers only cache long prefixes, in fixed-size blocks.
+CACHE_MIN_TOKENS = 1024
+CACHE_BLOCK_TOKENS = 128
+MAX_CACHED_PREFIXES = 10_000
+
+
+@dataclass(slots=True)
+class FakeLLMConfig:
+    profile: str = "instant"
+    error_429_rate: float = 0.0
+    error_500_rate: float = 0.0
+    seed: int = 0
+    # Default completion length when the request sets no max_tokens.
+    default_completion_tokens: int = 120
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _request_seed(body: dict) -> int:
+    digest = hashlib.blake2b(orjson.dumps(body.get("messages", [])), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _completion_words(body: dict, config: FakeLLMConfig) -> list[str]:
+    # The same messages always produce the same text, independent of latency or error draws.
+    rng = random.Random(_request_seed(body) ^ config.seed)
+    limit = int(body.get("max_completion_tokens") or body.get("max_tokens") or 0)
+    count = config.default_completion_tokens if limit <= 0 else rng.randint(max(1, limit * 3 // 4), limit)
+    words = [rng.choice(WORDS) for _ in range(count)]
+    words[0] = words[0].capitalize()
+    words[-1] += "."
+    return words
+
+
+def create_app(config: FakeLLMConfig | None = None) -> FastAPI:
+    config = config or FakeLLMConfig()
+    profile = PROFILES[config.profile]
+    rng = random.Random(config.seed)
+    prefixes: OrderedDict[bytes, None] = OrderedDict()
+    app = FastAPI(title="fake-llm")
+    app.state.config = config
+    app.state.requests = 0
+
+    def cached_tokens(messages: list[dict]) -> int:
+        if not messages or messages[0].get("role") != "system":
+            return 0
+        prefix = str(messages[0].get("content") or "")
+        key = hashlib.blake2b(prefix.encode(), digest_size=16).digest()
+        seen = key in prefixes
+        prefixes[key] = None
+        prefixes.move_to_end(key)
+        while len(prefixes) > MAX_CACHED_PREFIXES:
+            prefixes.popitem(last=False)
+        tokens = _estimate_tokens(prefix)
+        if not seen or tokens < CACHE_MIN_TOKENS:
+            return 0
+        return tokens // CACHE_BLOCK_TOKENS * CACHE_BLOCK_TOKENS
+
+    def error_response() -> Response | None:
+        draw = rng.random()
+        if draw < config.error_429_rate:
+            body = {"error": {"message": "Rate limit reached", "type": "rate_limit_error"}}
+            return Response(orjson.dumps(body), status_code=429, media_type="application/json")
+        if draw < config.error_429_rate + config.error_500_rate:
+            body = {"error": {"message": "Injected failure", "type": "server_error"}}
+            return Response(orjson.dumps(body), status_code=500, media_type="application/json")
+        return None
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request) -> Response:
+        app.state.requests += 1
+        body = orjson.loads(await request.body())
+        failure = error_response()
+        if failure is not None:
+            return failure
+
+        messages = body.get("messages", [])
+        words = _completion_words(body, config)
+        prompt_tokens = sum(_estimate_tokens(str(message.get("content") or "")) for message in messages)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(words),
+            "total_tokens": prompt_tokens + len(words),
+            "prompt_tokens_details": {"cached_tokens": cached_tokens(messages)},
+        }
+        ttft = profile.ttft_median_s * rng.lognormvariate(0.0, profile.ttft_sigma) if profile.ttft_median_s else 0.0
+        per_token = 1.0 / profile.tokens_per_second if profile.tokens_per_second else 0.0
+        completion_id = f"chatcmpl-fake-{app.state.requests}"
+        created = int(time.time())
+        model = body.get("model", "fake-model")
+
+        if not body.get("stream"):
+            await asyncio.sleep(ttft + per_token * len(words))
+            return Response(
+                orjson.dumps(
+                    {
+                        "id": completion_id,
+                        "object": "chat.completion",
+                        "created": created,
+                        "model": model,
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": " ".join(words)},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": usage,
+                    }
+                ),
+                media_type="application/json",
+            )
+
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+        def chunk(delta: dict | None, finish_reason: str | None = None, **extra: object) -> bytes:
+            choices = [] if delta is None else [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": choices,
+                **extra,
+            }
+            return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+        async def stream() -> AsyncIterator[bytes]:
+            await asyncio.sleep(ttft)
+            yield chunk({"role": "assistant", "content": ""})
+            for index, word in enumerate(words):
+                if index:
+                    await asyncio.sleep(per_token)
+                yield chunk({"content": word if index == 0 else f" {word}"})
+            yield chunk({}, "stop")
+            if include_usage:
+                # As with OpenAI, the usage chunk comes last and carries no choices.
+                yield chunk(None, usage=usage)
+            yield b"data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+def main(argv: list[str] | None = None) -> int:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8700)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="realistic")
+    parser.add_argument("--error-429", type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument("--error-500", type=float, default=0.0, help="fraction of requests answered 500")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = FakeLLMConfig(
+        profile=args.profile,
+        error_429_rate=args.error_429,
+        error_500_rate=args.error_500,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,386 @@
+"""End-to-end load generator: concurrent debates with live spectators against the real app.
+
+Runs the FastAPI app under uvicorn in-process on a loopback port, backed by a throwaway SQLite
+database, the in-process event bus (no Redis) and the template LLM with zero pacing. Each debate
+goes through create/invite/join/persona/ready/start while M spectators per debate stream it over
+WebSocket or SSE. `--llm-profile` swaps the template LLM for the live OpenAI client talking to
+the bundled fake provider (`benchmarks.fake_llm`) at that latency profile.
+
+    cd apps/api
+    python -m benchmarks.load --debates 20 --spectators 10
+    python -m benchmarks.load --debates 20 --spectators 10 --llm-profile realistic --llm-error-429 0.02
+    python -m benchmarks.load --debates 20 --spectators 10 --save-baseline
+    python -m benchmarks.load --debates 20 --spectators 10 --compare --threshold 15
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+import orjson
+
+from benchmarks.baseline import compare, format_report, load_baseline, save_baseline
+from benchmarks.fake_llm import PROFILES, FakeLLMConfig, create_app
+
+HIGHER_IS_BETTER = {"debates_per_sec", "events_per_sec"}
+COMPARED_METRICS = (
+    "debates_per_sec",
+    "events_per_sec",
+    "fanout_p50_ms",
+    "fanout_p95_ms",
+    "fanout_p99_ms",
+    "db_rows_total",
+    "peak_rss_mb",
+)
+PERSONA = {
+    "stance": "Benchmarks should be boring",
+    "defend_points": [
+        "Reproducible numbers beat anecdotes",
+        "Regressions hide in the tail latencies",
+        "Baselines only matter if you compare against them",
+    ],
+}
+
+
+@dataclass
+class LoadStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    events_delivered: int = 0
+    incomplete_spectators: int = 0
+
+
+def _configure_environment(db_path: Path, llm_base_url: str | None = None) -> None:
+    # Must run before any `app` import: settings are read once at import time.
+    os.environ.update(
+        {
+            "DATABASE_URL": f"sqlite+aiosqlite:///{db_path}",
+            "REDIS_URL": "",
+            "INLINE_DEBATE_RUNNER": "true",
+            "SPECTATOR_SSE_ENABLED": "true",
+            "PACE_DELAY_SCALE": "0",
+            "GEMINI_API_KEY": "",
+            "OPENAI_API_KEY": "fake" if llm_base_url else "",
+            "MODEL_PROVIDER": "openai" if llm_base_url else "",
+            "LLM_BASE_URL": llm_base_url or "",
+        }
+    )
+
+
+def _loopback_socket() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    return sock
+
+
+async def _serve(app, sock: socket.socket):
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", lifespan="on"))
+    task = asyncio.create_task(server.serve(sockets=[sock]))
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    return server, task
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[rank]
+
+
+def _record_frame(raw: str | bytes, stats: LoadStats) -> bool:
+    received = time.time()
+    decoded = orjson.loads(raw)
+    events = decoded if isinstance(decoded, list) else [decoded]
+    completed = False
+    for event in events:
+        created_at = event.get("created_at")
+        if created_at:
+            stats.latencies_ms.append((received - datetime.fromisoformat(created_at).timestamp()) * 1000)
+        stats.events_delivered += 1
+        completed = completed or event.get("event_type") == "argument.completed"
+    return completed
+
+
+async def _spectate_ws(url: str, ready: asyncio.Event, stats: LoadStats) -> None:
+    from websockets.asyncio.client import connect
+
+    async with connect(url, max_size=None) as websocket:
+        ready.set()
+        async for raw in websocket:
+            if _record_frame(raw, stats):
+                return
+
+
+async def _spectate_sse(client, url: str, ready: asyncio.Event, stats: LoadStats) -> None:
+    async with client.stream("GET", url) as response:
+        ready.set()
+        async for line in response.aiter_lines():
+            if line.startswith("data: ") and _record_frame(line[6:], stats):
+                return
+
+
+async def _run_debate(
+    client,
+    *,
+    index: int,
+    ws_base: str,
+    spectators: int,
+    transport: str,
+    batch: bool,
+    timeout: float,
+    stats: LoadStats,
+) -> None:
+    creator = {"x-user-id": f"bench-{index}-a", "x-user-handle": f"bench{index}a"}
+    challenger = {"x-user-id": f"bench-{index}-b", "x-user-handle": f"bench{index}b"}
+
+    created = await client.post(
+        "/v1/arguments",
+        json={
+            "topic": f"Load test argument #{index}",
+            "controls": {"audience_mode": True, "pace_mode": "FAST"},
+        },
+        headers=creator,
+    )
+    created.raise_for_status()
+    argument_id = created.json()["id"]
+
+    invite = await client.post(
+        f"/v1/arguments/{argument_id}/invites", json={"role": "participant"}, headers=creator
+    )
+    joined = await client.post(
+        f"/v1/arguments/{argument_id}/join", json={"token": invite.json()["token"]}, headers=challenger
+    )
+    joined.raise_for_status()
+    audience = await client.post(
+        f"/v1/arguments/{argument_id}/invites", json={"role": "spectator"}, headers=creator
+    )
+    audience_token = audience.json()["token"]
+
+    for headers in (creator, challenger):
+        persona = await client.put(
+            f"/v1/arguments/{argument_id}/participants/me/persona", json=PERSONA, headers=headers
+        )
+        persona.raise_for_status()
+        ready = await client.post(f"/v1/arguments/{argument_id}/ready", headers=headers)
+        ready.raise_for_status()
+
+    ready_events = [asyncio.Event() for _ in range(spectators)]
+    flags = "&batch=1" if batch else ""
+    if transport == "ws":
+        url = f"{ws_base}/v1/arguments/{argument_id}/stream?audienceToken={audience_token}{flags}"
+        tasks = [asyncio.create_task(_spectate_ws(url, event, stats)) for event in ready_events]
+    else:
+        url = f"/v1/arguments/{argument_id}/spectate?audience_token={audience_token}{flags}"
+        tasks = [asyncio.create_task(_spectate_sse(client, url, event, stats)) for event in ready_events]
+    await asyncio.gather(*(event.wait() for event in ready_events))
+    # Connected sockets still need a moment to register their bus subscription.
+    await asyncio.sleep(0.2)
+
+    started = await client.post(f"/v1/arguments/{argument_id}/start", json={}, headers=creator)
+    started.raise_for_status()
+
+    if tasks:
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        stats.incomplete_spectators += len(pending)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            task.result()
+        return
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        view = await client.get(f"/v1/arguments/{argument_id}", headers=creator)
+        if view.json()["status"] in {"completed", "failed"}:
+            return
+        await asyncio.sleep(0.05)
+
+
+async def _count_rows() -> dict[str, int]:
+    from sqlalchemy import func, select
+
+    from app.db.base import Base
+    from app.db.session import SessionLocal
+
+    counts: dict[str, int] = {}
+    async with SessionLocal() as session:
+        for table in Base.metadata.sorted_tables:
+            result = await session.execute(select(func.count()).select_from(table))
+            counts[table.name] = int(result.scalar_one())
+    return counts
+
+
+async def run_load(
+    *,
+    debates: int,
+    spectators: int,
+    transport: str,
+    batch: bool,
+    timeout: float,
+    llm: tuple[FakeLLMConfig, socket.socket] | None = None,
+) -> tuple[dict[str, float], dict[str, int]]:
+    import httpx
+
+    from app.main import app
+
+    llm_server = None
+    if llm is not None:
+        llm_config, llm_sock = llm
+        llm_server = await _serve(create_app(llm_config), llm_sock)
+    sock = _loopback_socket()
+    port = sock.getsockname()[1]
+    server, server_task = await _serve(app, sock)
+
+    stats = LoadStats()
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", timeout=timeout, limits=limits
+        ) as client:
+            started = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    _run_debate(
+                        client,
+                        index=index,
+                        ws_base=f"ws://127.0.0.1:{port}",
+                        spectators=spectators,
+                        transport=transport,
+                        batch=batch,
+                        timeout=timeout,
+                        stats=stats,
+                    )
+                    for index in range(debates)
+                )
+            )
+            wall_seconds = time.perf_counter() - started
+        # Let inline postprocess tasks finish before counting rows.
+        await asyncio.sleep(0.2)
+        rows = await _count_rows()
+    finally:
+        server.should_exit = True
+        await server_task
+        if llm_server is not None:
+            llm_server[0].should_exit = True
+            await llm_server[1]
+
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_rss_kb //= 1024
+    metrics = {
+        "debates": float(debates),
+        "spectators_per_debate": float(spectators),
+        "wall_seconds": wall_seconds,
+        "debates_per_sec": debates / wall_seconds if wall_seconds else 0.0,
+        "events_delivered": float(stats.events_delivered),
+        "events_per_sec": stats.events_delivered / wall_seconds if wall_seconds else 0.0,
+        "fanout_p50_ms": _percentile(stats.latencies_ms, 50),
+        "fanout_p95_ms": _percentile(stats.latencies_ms, 95),
+        "fanout_p99_ms": _percentile(stats.latencies_ms, 99),
+        "fanout_mean_ms": statistics.fmean(stats.latencies_ms) if stats.latencies_ms else 0.0,
+        "incomplete_spectators": float(stats.incomplete_spectators),
+        "db_rows_total": float(sum(rows.values())),
+        "peak_rss_mb": peak_rss_kb / 1024.0,
+    }
+    return metrics, rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--debates", type=int, default=10)
+    parser.add_argument("--spectators", type=int, default=5, help="spectators per debate")
+    parser.add_argument("--transport", choices=("ws", "sse"), default="ws")
+    parser.add_argument("--batch", action="store_true", help="request coalesced array frames")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-debate timeout in seconds")
+    parser.add_argument("--name", default=None, help="baseline name (default: e2e-<transport>)")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="fail on regression vs baseline")
+    parser.add_argument("--threshold", type=float, default=15.0, help="allowed regression in percent")
+    parser.add_argument(
+        "--llm-profile", choices=sorted(PROFILES), default=None, help="use the fake provider"
+    )
+    parser.add_argument("--llm-error-429", type=float, default=0.0)
+    parser.add_argument("--llm-error-500", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    llm = None
+    llm_base_url = None
+    if args.llm_profile:
+        llm_sock = _loopback_socket()
+        llm_base_url = f"http://127.0.0.1:{llm_sock.getsockname()[1]}/v1"
+        llm_config = FakeLLMConfig(
+            profile=args.llm_profile,
+            error_429_rate=args.llm_error_429,
+            error_500_rate=args.llm_error_500,
+        )
+        llm = (llm_config, llm_sock)
+
+    with tempfile.TemporaryDirectory(prefix="aas-bench-") as workdir:
+        _configure_environment(Path(workdir) / "bench.db", llm_base_url)
+        metrics, rows = asyncio.run(
+            run_load(
+                debates=args.debates,
+                spectators=args.spectators,
+                transport=args.transport,
+                batch=args.batch,
+                timeout=args.timeout,
+                llm=llm,
+            )
+        )
+
+    name = args.name or (
+        f"e2e-{args.transport}{'-batch' if args.batch else ''}"
+        f"{f'-llm-{args.llm_profile}' if args.llm_profile else ''}"
+    )
+    params = {
+        "debates": args.debates,
+        "spectators": args.spectators,
+        "transport": args.transport,
+        "batch": args.batch,
+    }
+    if args.llm_profile:
+        params["llm"] = {
+            "profile": args.llm_profile,
+            "error_429": args.llm_error_429,
+            "error_500": args.llm_error_500,
+        }
+    baseline = load_baseline(name)
+    baseline_metrics = baseline["metrics"] if baseline else None
+    regressions = []
+    if args.compare and baseline_metrics:
+        if baseline.get("params") != params:
+            print(f"warning: baseline {name} was recorded with {baseline.get('params')}", file=sys.stderr)
+        regressions = compare(
+            {key: metrics[key] for key in COMPARED_METRICS},
+            {key: baseline_metrics[key] for key in COMPARED_METRICS if key in baseline_metrics},
+            threshold_pct=args.threshold,
+            higher_is_better=HIGHER_IS_BETTER,
+        )
+
+    print(format_report(metrics, baseline_metrics, regressions))
+    print("rows: " + ", ".join(f"{table}={count}" for table, count in rows.items()))
+    if args.save_baseline:
+        print(f"saved baseline to {save_baseline(name, metrics, params=params)}")
+    if args.compare and not baseline_metrics:
+        print(f"no baseline named {name}; run with --save-baseline first", file=sys.stderr)
+        return 2
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
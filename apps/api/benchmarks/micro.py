@@ -0,0 +1,174 @@
+"""Micro-benchmarks for the pure-Python engine functions that run on every turn or debate.
+
+    cd apps/api
+    python -m benchmarks.micro --save-baseline
+    python -m benchmarks.micro --compare --threshold 20
+    python -m benchmarks.micro --filter cosine
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from app.db.models import ArgumentPhase, Turn
+from app.services.argument_engine import compute_phase, cosine_similarity
+from app.services.badges import maybe_award_badge
+from app.services.moderation import moderate_text
+from app.services.reporting import build_wrapped_report
+from app.workers.langgraph_scheduler import generate_turn_schedule
+from app.workers.llm import build_turn_text
+from benchmarks.baseline import compare, format_report, load_baseline, save_baseline
+
+VOCABULARY = (
+    "evidence", "claim", "tradeoff", "burden", "proof", "outcome", "signal", "market", "policy",
+    "risk", "cost", "benefit", "incentive", "history", "precedent", "context", "nuance",
+    "exception", "rule", "pattern", "data", "source", "stat", "momentum", "pressure", "concession",
+    "overlap", "logic", "frame", "premise", "conclusion", "rebuttal", "counter",
+)
+
+
+@dataclass(slots=True)
+class Case:
+    name: str
+    func: Callable[[], object]
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(VOCABULARY) for _ in range(count))
+
+
+def _turns(rng: random.Random, count: int, participants: int) -> list[Turn]:
+    return [
+        Turn(
+            argument_id="bench",
+            turn_index=idx + 1,
+            speaker_participant_id=f"participant-{idx % participants}",
+            phase=compute_phase(idx + 1, count),
+            content=_words(rng, 120),
+            metrics={},
+            model_metadata={},
+        )
+        for idx in range(count)
+    ]
+
+
+def build_cases() -> list[Case]:
+    rng = random.Random(1234)
+    short_a, short_b = _words(rng, 60), _words(rng, 60)
+    long_a, long_b = _words(rng, 4000), _words(rng, 4000)
+    disjoint_a = " ".join(f"alpha{idx}" for idx in range(4000))
+    disjoint_b = " ".join(f"beta{idx}" for idx in range(4000))
+    clean_turn = _words(rng, 120)
+    long_clean_turn = _words(rng, 6000)
+    flagged_turn = clean_turn + " you absolute moron"
+    badge_turn = "Building on that, " + _words(rng, 80) + "."
+    turns_small = _turns(rng, 8, 2)
+    turns_large = _turns(rng, 1000, 4)
+    badges = [{"badge_key": "mic_drop", "reason": "r", "confidence": 0.8}] * 4
+
+    def badge_call(text: str) -> Callable[[], object]:
+        return lambda: maybe_award_badge(
+            turn_text=text,
+            previous_turn_text=clean_turn,
+            evidence_mode="FREEFORM",
+            composure=40,
+            turn_index=5,
+            cooldown_remaining=0,
+            badges_so_far=1,
+        )
+
+    return [
+        Case("cosine_similarity.turn_60w", lambda: cosine_similarity(short_a, short_b)),
+        Case("cosine_similarity.long_4000w", lambda: cosine_similarity(long_a, long_b)),
+        Case("cosine_similarity.disjoint_4000w", lambda: cosine_similarity(disjoint_a, disjoint_b)),
+        Case("moderate_text.clean_120w", lambda: moderate_text(clean_turn)),
+        Case("moderate_text.clean_6000w", lambda: moderate_text(long_clean_turn)),
+        Case("moderate_text.flagged", lambda: moderate_text(flagged_turn)),
+        Case("maybe_award_badge.typical", badge_call(badge_turn)),
+        Case("maybe_award_badge.long_6000w", badge_call(long_clean_turn)),
+        Case(
+            "build_turn_text.typical",
+            lambda: build_turn_text(
+                speaker_handle="bench-user",
+                stance="I stand by my position",
+                chosen_point="The burden of proof is unmet",
+                opponent_last_turn=clean_turn,
+                win_condition="FIND_OVERLAP",
+                phase=ArgumentPhase.ESCALATION,
+                evidence_mode="RECEIPTS_PREFERRED",
+                turn_index=5,
+                max_turns=14,
+                done_hint=True,
+            ),
+        ),
+        Case(
+            "compute_phase.1000_turns",
+            lambda: [compute_phase(idx, 1000) for idx in range(1, 1001)],
+        ),
+        Case("generate_turn_schedule.2p_8t", lambda: generate_turn_schedule(2, 8)),
+        Case("generate_turn_schedule.4p_1000t", lambda: generate_turn_schedule(4, 1000)),
+        Case(
+            "build_wrapped_report.8_turns",
+            lambda: build_wrapped_report("Benchmark topic", turns_small, badges),
+        ),
+        Case(
+            "build_wrapped_report.1000_turns_4p",
+            lambda: build_wrapped_report("Benchmark topic", turns_large, badges),
+        ),
+    ]
+
+
+def measure(case: Case, *, min_seconds: float, repeat: int) -> float:
+    timer = timeit.Timer(case.func)
+    loops = 1
+    while True:
+        elapsed = timer.timeit(loops)
+        if elapsed >= min_seconds:
+            break
+        loops *= 10 if elapsed < min_seconds / 10 else 2
+    # Best of N is the least noisy estimator of the achievable cost.
+    best = min(timer.repeat(repeat=repeat, number=loops))
+    return best / loops * 1_000_000
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--min-seconds", type=float, default=0.2, help="target time per sample")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--name", default="micro")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="fail on regression vs baseline")
+    parser.add_argument("--threshold", type=float, default=20.0, help="allowed slowdown in percent")
+    args = parser.parse_args(argv)
+
+    results: dict[str, float] = {}
+    for case in build_cases():
+        if args.filter and args.filter not in case.name:
+            continue
+        results[f"{case.name}_us"] = measure(case, min_seconds=args.min_seconds, repeat=args.repeat)
+
+    baseline = load_baseline(args.name)
+    baseline_metrics = baseline["metrics"] if baseline else None
+    regressions = []
+    if args.compare and baseline_metrics:
+        regressions = compare(results, baseline_metrics, threshold_pct=args.threshold)
+
+    print(format_report(results, baseline_metrics, regressions))
+    if args.save_baseline:
+        merged = {**(baseline_metrics or {}), **results} if args.filter else results
+        print(f"saved baseline to {save_baseline(args.name, merged)}")
+    if args.compare and not baseline_metrics:
+        print(f"no baseline named {args.name}; run with --save-baseline first", file=sys.stderr)
+        return 2
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than baseline by more than {args.threshold}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,28 @@
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+
+SessionFactory = async_sessionmaker[AsyncSession]
+
+
+@pytest.fixture
+def sqlite_sessions(
+    tmp_path,
+) -> Callable[[], AbstractAsyncContextManager[SessionFactory]]:
+    # Engines belong to the event loop that opened them, so tests enter this inside their own
+    # asyncio.run; the file-backed database lets several connections see each other's commits.
+    @asynccontextmanager
+    async def open_sessions() -> AsyncIterator[SessionFactory]:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            yield async_sessionmaker(engine, expire_on_commit=False)
+        finally:
+            await engine.dispose()
+
+    return open_sessions
@@ -0,0 +1,110 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.admission import AdmissionController
+from app.workers import actors
+from app.workers.runtime import Queued
+
+
+def _controller(*, global_limit: int = 1, local_limit: int = 0) -> AdmissionController:
+    return AdmissionController(
+        None, global_limit=global_limit, local_limit=local_limit, lease_seconds=60
+    )
+
+
+def test_global_cap_admits_in_queue_order() -> None:
+    admission = _controller()
+
+    async def scenario() -> list:
+        now = time.time()
+        await admission.enqueue("first", queued_at=now - 5, priority=False)
+        await admission.enqueue("second", queued_at=now - 1, priority=False)
+        steps = [await admission.try_acquire("second"), await admission.try_acquire("first")]
+        steps.append(await admission.position("second"))
+        steps.append(await admission.try_acquire("second"))
+        await admission.release("first")
+        steps.append(await admission.try_acquire("second"))
+        steps.append(await admission.position("second"))
+        return steps
+
+    assert asyncio.run(scenario()) == [False, True, 1, False, True, None]
+
+
+def test_priority_lane_goes_first_and_is_not_counted_as_standard_wait() -> None:
+    admission = _controller()
+
+    async def scenario() -> tuple:
+        now = time.time()
+        await admission.enqueue("holder", queued_at=now, priority=False)
+        assert await admission.try_acquire("holder")
+        await admission.enqueue("standard", queued_at=now - 40, priority=False)
+        await admission.enqueue("audience", queued_at=now, priority=True)
+        positions = (await admission.position("audience"), await admission.position("standard"))
+        await admission.release("holder")
+        admitted = (await admission.try_acquire("standard"), await admission.try_acquire("audience"))
+        return positions, admitted, await admission.standard_wait_seconds()
+
+    positions, admitted, waited = asyncio.run(scenario())
+    assert positions == (1, 2)
+    assert admitted == (False, True)
+    assert 39 < waited < 45
+
+
+def test_local_cap_and_expired_leases() -> None:
+    admission = _controller(global_limit=0, local_limit=1)
+    admission.lease_seconds = -1
+
+    async def scenario() -> list[bool]:
+        steps = [await admission.try_acquire("a"), await admission.try_acquire("b")]
+        await admission.release("a")
+        steps.append(await admission.try_acquire("b"))
+        # With a global cap, an expired lease no longer holds its slot.
+        admission.global_limit, admission.local_limit = 1, 0
+        steps.append(await admission.try_acquire("c"))
+        return steps
+
+    assert asyncio.run(scenario()) == [True, False, True, True]
+
+
+def test_redis_failure_falls_back_per_call_and_retries() -> None:
+    admission = AdmissionController(
+        "redis://127.0.0.1:1/0", global_limit=1, local_limit=0, lease_seconds=60
+    )
+    clients: list[object] = []
+
+    async def scenario() -> tuple[bool, bool]:
+        clients.append(admission._redis_client())
+        first = await admission.try_acquire("a")
+        clients.append(admission._redis_client())
+        return first, await admission.try_acquire("b")
+
+    assert asyncio.run(scenario()) == (True, False)
+    assert admission.redis_url == "redis://127.0.0.1:1/0"
+    assert clients[0] is not clients[1]
+
+
+def test_queued_debate_frees_the_worker_thread_and_retries_later(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    outcomes = [Queued(3), None]
+    calls: list[tuple] = []
+    sent: list[tuple] = []
+
+    async def fake_run_argument(argument_id: str, *, reported_position: int | None = None):
+        calls.append((argument_id, reported_position))
+        return outcomes.pop(0)
+
+    monkeypatch.setattr(actors, "run_argument", fake_run_argument)
+    monkeypatch.setattr(
+        actors.run_argument_actor.broker,
+        "enqueue",
+        lambda message, delay=None: sent.append((message.actor_name, message.args, delay)),
+    )
+
+    actors.run_argument_actor("arg-1")
+    assert sent == [("run_argument_actor", ("arg-1", 3), 1000)]
+    actors.run_argument_actor(*sent[0][1])
+    assert calls == [("arg-1", None), ("arg-1", 3)]
+    assert sent[1] == ("postprocess_actor", ("arg-1",), None)
@@ -0,0 +1,27 @@
+import hashlib
+import zlib
+
+import orjson
+
+from app.services.archive import LocalArchiveStore, decode_archive, encode_archive
+from app.services.wire import WireEvent
+
+
+def test_archive_round_trip_keeps_wire_bytes() -> None:
+    events = [WireEvent(7, orjson.dumps({"id": 7, "payload": {"text": "a\nb"}})), WireEvent(9, b'{"id":9}')]
+    raw = encode_archive(argument_id="arg-1", turns=[{"id": "t1"}], badges=[], events=events)
+    archived = decode_archive(raw)
+    assert archived.last_event_id == 9
+    assert archived.turns == [{"id": "t1"}]
+    assert [(event.id, event.data) for event in archived.events] == [(7, events[0].data), (9, b'{"id":9}')]
+
+
+def test_local_store_is_content_addressed(tmp_path) -> None:
+    store = LocalArchiveStore(tmp_path)
+    raw = encode_archive(argument_id="arg-1", turns=[], badges=[], events=[])
+    digest = hashlib.sha256(raw).hexdigest()
+    store.put(digest, zlib.compress(raw))
+    store.put(digest, zlib.compress(raw))
+    assert store.path(digest).parent.name == digest[:2]
+    assert len(list(tmp_path.rglob("*"))) == 2
+    assert store.get(digest) == raw
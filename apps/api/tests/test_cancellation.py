@@ -0,0 +1,92 @@
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+
+from app.db.models import Argument, TurnEvent, User
+from app.services import cancellation
+from app.services.cancellation import CANCEL_EVENT_TYPE, CancelWatch
+from app.services.event_bus import EventBus, set_event_bus
+from app.services.wire import encode_wire_event
+from app.workers import runtime
+
+
+def _event(event_id: int, event_type: str, payload: dict):
+    return encode_wire_event(
+        event_id=event_id,
+        argument_id="arg-1",
+        event_type=event_type,
+        payload=payload,
+        turn_index=None,
+        created_at=datetime.now(UTC),
+    )
+
+
+def test_watch_ignores_other_events_and_marks_cancel_requests() -> None:
+    bus = EventBus(None)
+    set_event_bus(bus)
+
+    async def scenario() -> CancelWatch:
+        watch = CancelWatch("arg-1")
+        listener = asyncio.create_task(watch._listen())
+        await asyncio.sleep(0)
+        forged = {"token": '"event_type":"argument.cancel_requested"'}
+        await bus.publish("arg-1", _event(1, "turn.token", forged))
+        await asyncio.sleep(0)
+        assert not watch.requested.is_set()
+        await bus.publish("arg-1", _event(2, CANCEL_EVENT_TYPE, {"reason": "admin"}))
+        await asyncio.wait_for(listener, 1)
+        return watch
+
+    watch = asyncio.run(scenario())
+    assert watch.requested.is_set() and watch.reason == "admin"
+
+
+def test_cancel_aborts_the_awaited_work_promptly() -> None:
+    aborted = asyncio.Event()
+
+    async def slow_turn() -> str:
+        try:
+            await asyncio.sleep(30)
+        finally:
+            aborted.set()
+        return "never"
+
+    async def scenario() -> None:
+        watch = CancelWatch("arg-1")
+        asyncio.get_running_loop().call_later(0.01, watch.requested.set)
+        await asyncio.wait_for(runtime._unless_cancelled(slow_turn(), watch), 1)
+
+    with pytest.raises(runtime.DebateCancelled):
+        asyncio.run(scenario())
+    assert aborted.is_set()
+
+
+def test_check_finds_a_request_the_bus_never_delivered(sqlite_sessions, monkeypatch) -> None:
+    set_event_bus(EventBus(None))
+
+    async def scenario() -> tuple[bool, bool, str | None]:
+        async with sqlite_sessions() as session_factory:
+            monkeypatch.setattr(cancellation, "SessionLocal", session_factory)
+            async with session_factory() as session:
+                argument = Argument(creator_user_id="u-1", topic="cancel")
+                session.add_all([User(id="u-1", handle="one"), argument])
+                await session.commit()
+
+            watch = await CancelWatch(argument.id).start()
+            before = await watch.check()
+            # Written straight to the table, as if the publish to other workers had been lost.
+            async with session_factory() as session:
+                session.add(
+                    TurnEvent(
+                        argument_id=argument.id,
+                        event_type=CANCEL_EVENT_TYPE,
+                        payload={"reason": "initiator"},
+                    )
+                )
+                await session.commit()
+            after = await watch.check()
+            await watch.stop()
+        return before, after, watch.reason
+
+    assert asyncio.run(scenario()) == (False, True, "initiator")
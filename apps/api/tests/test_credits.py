@@ -0,0 +1,41 @@
+import asyncio
+
+from sqlalchemy import func, select
+
+from app.db.models import CreditLedger, User
+from app.services import credits
+from app.services.credits import KnownUsers, ensure_user
+
+
+def test_known_users_match_handle_and_forget() -> None:
+    cache = KnownUsers(ttl_seconds=60)
+    cache.remember("u1", "alice")
+    assert cache.matches("u1", "alice")
+    assert cache.matches("u1", None)
+    assert not cache.matches("u1", "bob")
+    cache.forget("u1")
+    assert not cache.matches("u1", "alice")
+
+
+def test_concurrent_first_requests_seed_credits_once(sqlite_sessions, monkeypatch) -> None:
+    monkeypatch.setattr(credits, "known_users", KnownUsers(ttl_seconds=60))
+
+    async def scenario() -> tuple[int, str]:
+        async with sqlite_sessions() as session_factory:
+
+            async def first_request(handle: str) -> None:
+                async with session_factory() as session:
+                    await ensure_user(session, "u1", handle)
+                    await session.commit()
+
+            await asyncio.gather(*(first_request("alice") for _ in range(5)))
+            await first_request("alice-renamed")
+            async with session_factory() as session:
+                seeds = await session.scalar(select(func.count(CreditLedger.id)))
+                handle = await session.scalar(select(User.handle).where(User.id == "u1"))
+        return seeds, handle
+
+    seeds, handle = asyncio.run(scenario())
+    assert seeds == 1
+    assert handle == "alice-renamed"
+    assert credits.known_users.matches("u1", "alice-renamed")
@@ -0,0 +1,95 @@
+import asyncio
+from types import SimpleNamespace
+
+import orjson
+
+from app.db.models import ArgumentPhase
+from app.workers import runtime
+from app.workers.debate_state import DEFAULT_POINTS, DebateState
+from app.workers.llm import GeneratedTurn
+
+
+def _state() -> DebateState:
+    argument = SimpleNamespace(
+        id="arg-1",
+        controls={"pace_mode": "FAST", "evidence_mode": "RECEIPTS_PREFERRED"},
+        max_turns=10,
+        target_min_tokens=80,
+        target_max_tokens=140,
+        phase=ArgumentPhase.OPENING,
+        turn_count=0,
+        prompt_tokens=None,
+        completion_tokens=0,
+    )
+    participants = [
+        SimpleNamespace(
+            id="p-a",
+            user_id="alice",
+            seat_order=0,
+            persona_snapshot={"stance": "Cats", "defend_points": ["quiet", "clean"]},
+        ),
+        SimpleNamespace(id="p-b", user_id="bob", seat_order=1, persona_snapshot=None),
+    ]
+    return DebateState.start(argument, participants, pace_delay_scale=1.0)
+
+
+def test_start_precomputes_seat_context() -> None:
+    state = _state()
+    assert state.seats[0].points == ("quiet", "clean", "This is still unresolved")
+    assert state.seats[1].points == DEFAULT_POINTS
+    assert state.delay == 0.01
+    assert not hasattr(state, "__dict__")
+
+
+def test_claims_are_used_once_before_repeating() -> None:
+    state = _state()
+    assert [state.choose_claim(0, turn) for turn in (1, 3, 5)] == [
+        (0, True, False),
+        (1, True, False),
+        (2, True, False),
+    ]
+    assert state.choose_claim(0, 7) == (1, False, True)
+
+
+def test_state_round_trips_through_json() -> None:
+    state = _state()
+    state.choose_claim(0, 1)
+    state.record_turn(0, "Cats are quiet. Dogs bark.", similarity=0.1, is_new_claim=True, done_hint=False)
+    state.record_badge(True)
+    restored = DebateState.from_dict(orjson.loads(orjson.dumps(state.to_dict())))
+    assert restored.to_dict() == state.to_dict()
+    assert restored.memory.render() == state.memory.render()
+
+
+def test_stops_when_every_seat_is_done() -> None:
+    state = _state()
+    for _ in range(2):
+        for seat in (0, 1):
+            state.record_turn(seat, "again", similarity=0.0, is_new_claim=False, done_hint=True)
+    assert state.should_stop()
+
+
+def test_opening_round_generates_every_seat_concurrently(monkeypatch) -> None:
+    in_flight = peak = 0
+    prompts: list[tuple[int, str | None]] = []
+
+    async def fake_generate(**kwargs) -> GeneratedTurn:
+        nonlocal in_flight, peak
+        prompts.append((kwargs["turn_index"], kwargs["opponent_last_turn"]))
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return GeneratedTurn(f"opening {kwargs['turn_index']}")
+
+    monkeypatch.setattr(runtime, "generate_turn_text", fake_generate)
+    state = _state()
+    state.previous_turn_text = "ignored in openings"
+
+    async def scenario() -> list[str]:
+        prefetched = runtime._start_opening_round(state, [0, 1, 0, 1])
+        return [(await prefetched[turn].task).text for turn in sorted(prefetched)]
+
+    assert asyncio.run(scenario()) == ["opening 1", "opening 2"]
+    assert peak == 2
+    assert prompts == [(1, None), (2, None)]
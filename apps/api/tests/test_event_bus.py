@@ -0,0 +1,368 @@
+import asyncio
+import os
+import threading
+from collections.abc import Callable
+from contextlib import suppress
+
+import orjson
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.db.models import Argument, TurnEvent, User
+from app.services.event_bus import (
+    PUBLISH_RETRY_SECONDS,
+    EventBus,
+    LocalBackend,
+    PostgresBackend,
+    RedisBackend,
+    _channel,
+    _frame,
+    _unframe,
+    asyncpg_dsn,
+)
+from app.services.wire import WireEvent
+
+# Network backends join the conformance run when a server is provided, e.g.
+#   TEST_REDIS_URL=redis://localhost:6379/15
+#   TEST_POSTGRES_URL=postgresql+asyncpg://aas@localhost/aas_test
+REDIS_URL = os.environ.get("TEST_REDIS_URL")
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+
+def _postgres_backend() -> PostgresBackend:
+    engine = create_async_engine(POSTGRES_URL)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    return PostgresBackend(asyncpg_dsn(POSTGRES_URL), session_factory=session_factory)
+
+
+BACKENDS: dict[str, Callable[[], object]] = {
+    "local": LocalBackend,
+    "redis": lambda: RedisBackend(REDIS_URL),
+    "postgres": _postgres_backend,
+}
+
+
+@pytest.fixture(params=sorted(BACKENDS))
+def make_bus(request) -> Callable[[], EventBus]:
+    # Each bus plays one process; local buses share a single in-process transport.
+    if request.param == "redis" and not REDIS_URL:
+        pytest.skip("TEST_REDIS_URL not set")
+    if request.param == "postgres" and not POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL not set")
+    if request.param == "local":
+        shared = LocalBackend()
+        return lambda: EventBus(backend=shared)
+    return lambda: EventBus(backend=BACKENDS[request.param]())
+
+
+def _event(event_id: int, size: int = 0) -> WireEvent:
+    return WireEvent(event_id, orjson.dumps({"id": event_id, "text": "x" * size}))
+
+
+async def _collect(
+    bus: EventBus, argument_id: str, count: int, *, via: EventBus | None = None
+) -> tuple[asyncio.Task, list[WireEvent]]:
+    # Probes with id 0 are published on `via` until the subscription is live, then filtered out.
+    received: list[WireEvent] = []
+    live = asyncio.Event()
+
+    async def consume() -> None:
+        async for event in bus.subscribe(argument_id):
+            if event.id == 0:
+                live.set()
+                continue
+            received.append(event)
+            if len(received) == count:
+                return
+
+    task = asyncio.create_task(consume())
+    while not live.is_set():
+        await (via or bus).publish(argument_id, _event(0))
+        with suppress(TimeoutError):
+            await asyncio.wait_for(live.wait(), 0.02)
+    return task, received
+
+
+async def _drain(buses: list[EventBus], *tasks: asyncio.Task) -> None:
+    try:
+        await asyncio.wait_for(asyncio.gather(*tasks), 5)
+    finally:
+        for bus in buses:
+            await bus.close()
+
+
+def test_ordered_delivery_to_every_subscriber_of_an_argument(make_bus) -> None:
+    async def scenario() -> tuple[list[int], list[int], list[int], list[int]]:
+        publisher, remote = make_bus(), make_bus()
+        first, first_events = await _collect(remote, "arg-1", 20, via=publisher)
+        second, second_events = await _collect(remote, "arg-1", 20, via=publisher)
+        local, local_events = await _collect(publisher, "arg-1", 20)
+        other, other_events = await _collect(remote, "arg-2", 1, via=publisher)
+        for event_id in range(1, 21):
+            await publisher.publish("arg-1", _event(event_id))
+        await publisher.publish("arg-2", _event(99))
+        await _drain([publisher, remote], first, second, local, other)
+        return (
+            [event.id for event in first_events],
+            [event.id for event in second_events],
+            [event.id for event in local_events],
+            [event.id for event in other_events],
+        )
+
+    first, second, local, other = asyncio.run(scenario())
+    # The publisher's own subscriber gets each event once, not again from the backend.
+    assert first == second == local == list(range(1, 21))
+    assert other == [99]
+
+
+def test_events_larger_than_a_notify_payload_arrive_intact(make_bus) -> None:
+    async def scenario() -> bytes:
+        publisher, remote = make_bus(), make_bus()
+        event = _event(7, size=20_000)
+        if isinstance(remote.backend, PostgresBackend):
+            # Postgres passes this one by id, so the row has to exist like a persisted event.
+            async with remote.backend.session_factory() as session:
+                await session.run_sync(lambda sync: Base.metadata.create_all(sync.connection()))
+                argument = Argument(creator_user_id="u-big", topic="big events")
+                session.add_all([User(id="u-big", handle="big"), argument])
+                await session.flush()
+                payload = {"text": "x" * 20_000}
+                row = TurnEvent(argument_id=argument.id, event_type="turn.final", payload=payload)
+                session.add(row)
+                await session.commit()
+                event = WireEvent.from_row(row)
+        task, received = await _collect(remote, "arg-big", 1, via=publisher)
+        await publisher.publish("arg-big", event)
+        await _drain([publisher, remote], task)
+        return received[0].data
+
+    data = asyncio.run(scenario())
+    assert len(data) > 8000
+
+
+def test_postgres_resolves_id_only_notifications_from_the_database(sqlite_sessions) -> None:
+    async def scenario() -> WireEvent:
+        async with sqlite_sessions() as session_factory:
+            backend = PostgresBackend("postgresql://unused", session_factory=session_factory)
+
+            async def insert_later() -> None:
+                # The publisher's transaction commits after its NOTIFY went out.
+                await asyncio.sleep(0.02)
+                async with session_factory() as session:
+                    payload = {"text": "y" * 9000}
+                    session.add(
+                        TurnEvent(argument_id="arg-1", event_type="turn.final", payload=payload)
+                    )
+                    await session.commit()
+
+            inserting = asyncio.create_task(insert_later())
+            loaded = await backend._load(1)
+            await inserting
+        return loaded
+
+    loaded = asyncio.run(scenario())
+    assert loaded.id == 1
+    assert orjson.loads(loaded.data)["payload"] == {"text": "y" * 9000}
+
+
+def test_postgres_backend_keeps_each_event_loop_apart(monkeypatch) -> None:
+    class FakeConnection:
+        def __init__(self) -> None:
+            self.loop = asyncio.get_running_loop()
+            self.listeners: dict[str, Callable] = {}
+            self.closed = False
+
+        def add_termination_listener(self, callback: Callable) -> None:
+            return None
+
+        def is_closed(self) -> bool:
+            return self.closed
+
+        async def add_listener(self, channel: str, callback: Callable) -> None:
+            self.listeners[channel] = callback
+
+        async def remove_listener(self, channel: str, callback: Callable) -> None:
+            self.listeners.pop(channel, None)
+
+        async def close(self) -> None:
+            self.closed = True
+
+    connections: list[FakeConnection] = []
+
+    async def connect(dsn: str) -> FakeConnection:
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    monkeypatch.setattr("app.services.event_bus.asyncpg.connect", connect)
+    backend = PostgresBackend("postgresql://aas@localhost/aas")
+    channel = _channel("arg-1")
+    both_subscribed = threading.Barrier(2, timeout=5)
+    received: dict[int, int] = {}
+
+    async def worker(event_id: int) -> None:
+        # Stands in for a dramatiq thread running a message under its own event loop.
+        stream = backend.subscribe("arg-1")
+        first = asyncio.ensure_future(anext(stream))
+        loop = asyncio.get_running_loop()
+        while not any(c.loop is loop and channel in c.listeners for c in connections):
+            await asyncio.sleep(0.001)
+        await asyncio.to_thread(both_subscribed.wait)
+        own = next(c for c in connections if c.loop is loop)
+        payload = _frame("other", _event(event_id).pack()).decode()
+        own.listeners[channel](own, 1, channel, payload)
+        received[event_id] = (await asyncio.wait_for(first, 1)).id
+        await stream.aclose()
+        await backend.close()
+
+    threads = [
+        threading.Thread(target=asyncio.run, args=(worker(event_id),), daemon=True)
+        for event_id in (1, 2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert received == {1: 1, 2: 2}
+    assert len(connections) == 2
+    assert all(connection.closed for connection in connections)
+
+
+def test_bus_falls_back_to_local_delivery_when_the_backend_fails() -> None:
+    class BrokenBackend:
+        transport = "broken"
+        closed = 0
+
+        async def close(self) -> None:
+            self.closed += 1
+
+        async def publish(self, argument_id: str, event: WireEvent, *, origin: str) -> None:
+            raise ConnectionError("down")
+
+        async def subscribe(self, argument_id: str, *, ignore_origin: str | None = None):
+            raise ConnectionError("down")
+            yield
+
+    async def scenario() -> list[int]:
+        bus = EventBus(backend=BrokenBackend())
+        task, received = await _collect(bus, "arg-1", 2)
+        await bus.publish("arg-1", _event(1))
+        await bus.publish("arg-1", _event(2))
+        await asyncio.wait_for(task, 1)
+        assert bus.backend.closed >= 2
+        return [event.id for event in received]
+
+    assert asyncio.run(scenario()) == [1, 2]
+
+
+def test_publish_skips_a_failed_backend_for_a_while() -> None:
+    class DownBackend:
+        transport = "down"
+        attempts = 0
+
+        async def close(self) -> None:
+            return None
+
+        async def publish(self, argument_id: str, event: WireEvent, *, origin: str) -> None:
+            self.attempts += 1
+            raise ConnectionError("refused")
+
+        async def subscribe(self, argument_id: str, *, ignore_origin: str | None = None):
+            await asyncio.Event().wait()
+            yield
+
+    async def scenario() -> list[int]:
+        bus = EventBus(backend=DownBackend())
+        attempts = []
+        for event_id in range(1, 4):
+            await bus.publish("arg-1", _event(event_id))
+        attempts.append(bus.backend.attempts)
+        bus._publish_paused_until -= PUBLISH_RETRY_SECONDS  # as if the pause had run out
+        await bus.publish("arg-1", _event(4))
+        await bus.publish("arg-1", _event(5))
+        attempts.append(bus.backend.attempts)
+        return attempts
+
+    # Tokens keep flowing locally without a connect attempt each; the backend is retried later.
+    assert asyncio.run(scenario()) == [1, 2]
+
+
+def test_relay_resubscribes_after_the_backend_subscription_fails(monkeypatch) -> None:
+    monkeypatch.setattr("app.services.event_bus.RELAY_RETRY_DELAYS", (0.0,))
+
+    class FlakyBackend:
+        transport = "flaky"
+        subscribes = 0
+
+        async def close(self) -> None:
+            return None
+
+        async def publish(self, argument_id: str, event: WireEvent, *, origin: str) -> None:
+            return None
+
+        async def subscribe(self, argument_id: str, *, ignore_origin: str | None = None):
+            self.subscribes += 1
+            if self.subscribes < 3:
+                raise ConnectionError("down")
+            yield _event(7)
+            await asyncio.Event().wait()
+
+    async def scenario() -> tuple[int, int]:
+        bus = EventBus(backend=FlakyBackend())
+        async for event in bus.subscribe("arg-1"):
+            return event.id, bus.backend.subscribes
+        raise AssertionError("subscription ended")
+
+    assert asyncio.run(asyncio.wait_for(scenario(), 1)) == (7, 3)
+
+
+def test_same_process_subscribers_do_not_wait_for_the_backend() -> None:
+    class SlowBackend:
+        transport = "slow"
+
+        def __init__(self) -> None:
+            self.origins: list[str] = []
+            self.release = asyncio.Event()
+
+        async def close(self) -> None:
+            return None
+
+        async def publish(self, argument_id: str, event: WireEvent, *, origin: str) -> None:
+            self.origins.append(origin)
+            await self.release.wait()
+
+        async def subscribe(self, argument_id: str, *, ignore_origin: str | None = None):
+            await asyncio.Event().wait()
+            yield
+
+    async def scenario() -> tuple[list[int], list[str], str]:
+        bus = EventBus(backend=SlowBackend())
+        received: list[int] = []
+
+        async def consume() -> None:
+            async for event in bus.subscribe("arg-1"):
+                received.append(event.id)
+                return
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        publishing = asyncio.create_task(bus.publish("arg-1", _event(1)))
+        await asyncio.wait_for(task, 1)
+        assert not publishing.done()
+        bus.backend.release.set()
+        await publishing
+        return received, bus.backend.origins, bus.origin
+
+    received, origins, origin = asyncio.run(scenario())
+    assert received == [1]
+    assert origins == [origin]
+
+
+def test_older_wire_formats_are_still_understood() -> None:
+    legacy = orjson.dumps({"id": 5, "event_type": "turn.token", "payload": {"token": "a/b:c"}})
+    for raw in (legacy, b"5:" + legacy, b"abc123/5:" + legacy):
+        origin, packed = _unframe(raw)
+        event = WireEvent.unpack(packed)
+        assert (event.id, event.data) == (5, legacy)
+        assert origin == ("abc123" if raw.startswith(b"abc") else "")
@@ -0,0 +1,87 @@
+import asyncio
+
+import httpx
+import orjson
+from openai import AsyncOpenAI
+
+from app.db.models import ArgumentPhase
+from app.workers import llm
+from benchmarks.fake_llm import FakeLLMConfig, create_app
+
+REQUEST = {
+    "model": "fake-model",
+    "messages": [{"role": "system", "content": "rules"}, {"role": "user", "content": "go"}],
+    "max_tokens": 40,
+}
+
+
+def _post(app, body: dict) -> httpx.Response:
+    async def send() -> httpx.Response:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://fake") as client:
+            return await client.post("/v1/chat/completions", json=body)
+
+    return asyncio.run(send())
+
+
+def test_completions_are_deterministic_and_capped() -> None:
+    first = _post(create_app(), REQUEST).json()
+    second = _post(create_app(), REQUEST).json()
+    assert first["choices"][0]["message"] == second["choices"][0]["message"]
+    assert 30 <= first["usage"]["completion_tokens"] <= 40
+
+
+def test_streaming_ends_with_usage_and_done() -> None:
+    body = {**REQUEST, "stream": True, "stream_options": {"include_usage": True}}
+    lines = [line for line in _post(create_app(), body).text.split("\n\n") if line]
+    assert lines[-1] == "data: [DONE]"
+    chunks = [orjson.loads(line.removeprefix("data: ")) for line in lines[:-1]]
+    assert chunks[-1]["choices"] == [] and chunks[-1]["usage"]["completion_tokens"] >= 30
+    text = "".join(chunk["choices"][0]["delta"].get("content", "") for chunk in chunks[:-1])
+    assert text == _post(create_app(), REQUEST).json()["choices"][0]["message"]["content"]
+
+
+def test_long_system_prefix_reports_cached_tokens() -> None:
+    app = create_app()
+    body = {**REQUEST, "messages": [{"role": "system", "content": "x" * 8000}, REQUEST["messages"][1]]}
+    assert _post(app, body).json()["usage"]["prompt_tokens_details"]["cached_tokens"] == 0
+    assert _post(app, body).json()["usage"]["prompt_tokens_details"]["cached_tokens"] == 1920
+
+
+def _generate(app, monkeypatch) -> llm.GeneratedTurn:
+    async def scenario() -> llm.GeneratedTurn:
+        http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+        client = AsyncOpenAI(
+            api_key="fake", base_url="http://fake/v1", http_client=http_client, max_retries=0
+        )
+        monkeypatch.setattr(llm, "_client", client)
+        async with http_client:
+            return await llm.generate_turn_text(
+                speaker_handle="alice",
+                stance="Cats are better",
+                chosen_point="Cats are quiet",
+                opponent_last_turn=None,
+                win_condition="BE_RIGHT",
+                phase=ArgumentPhase.OPENING,
+                evidence_mode="FREEFORM",
+                turn_index=1,
+                max_turns=8,
+                done_hint=False,
+                target_min_tokens=80,
+                target_max_tokens=140,
+            )
+
+    return asyncio.run(scenario())
+
+
+def test_live_generate_path_against_fake_provider(monkeypatch) -> None:
+    generated = _generate(create_app(), monkeypatch)
+    assert generated.completion_tokens == len(generated.text.split())
+    assert generated.completion_tokens <= llm.completion_budget(140)
+
+
+def test_injected_errors_fall_back_to_template(monkeypatch) -> None:
+    fallbacks = llm.LLM_TEMPLATE_FALLBACKS.value(reason="error")
+    generated = _generate(create_app(FakeLLMConfig(error_500_rate=1.0)), monkeypatch)
+    assert generated.prompt_tokens is None
+    assert llm.LLM_TEMPLATE_FALLBACKS.value(reason="error") == fallbacks + 1
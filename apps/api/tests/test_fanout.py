@@ -0,0 +1,131 @@
+import asyncio
+
+import orjson
+from sqlalchemy import select
+
+from app.api.routes import streaming
+from app.db.models import TurnEvent
+from app.services import fanout as fanout_module
+from app.services.event_bus import EventBus, set_event_bus
+from app.services.fanout import FanoutHub, Frame
+from app.services.wire import WIRE_EVENT_COLUMNS, WireEvent
+
+
+def _event(event_id: int) -> WireEvent:
+    return WireEvent(event_id, orjson.dumps({"id": event_id}))
+
+
+def test_wire_event_pack_round_trip() -> None:
+    event = WireEvent.unpack(_event(42).pack())
+    assert event.id == 42
+    assert orjson.loads(event.data) == {"id": 42}
+
+
+def test_wire_event_from_projected_row_matches_entity(sqlite_sessions) -> None:
+    async def scenario() -> tuple[WireEvent, WireEvent]:
+        async with sqlite_sessions() as session_factory:
+            async with session_factory() as session:
+                session.add(
+                    TurnEvent(
+                        argument_id="arg-1",
+                        turn_index=2,
+                        event_type="turn.token",
+                        payload={"token": "hi"},
+                    )
+                )
+                await session.commit()
+            async with session_factory() as session:
+                row = (await session.execute(select(*WIRE_EVENT_COLUMNS))).one()
+                entity = (await session.execute(select(TurnEvent))).scalar_one()
+                pair = WireEvent.from_row(row), WireEvent.from_row(entity)
+        return pair
+
+    projected, loaded = asyncio.run(scenario())
+    assert (projected.id, projected.data) == (loaded.id, loaded.data)
+
+
+def test_frame_reuses_encoded_bytes() -> None:
+    frame = Frame([_event(1), _event(2)])
+    assert orjson.loads(frame.batch_bytes) == [{"id": 1}, {"id": 2}]
+    assert frame.chunks(batch=False) == [b'{"id":1}', b'{"id":2}']
+    assert frame.texts(batch=True)[0] is frame.texts(batch=True)[0]
+    assert frame.texts(batch=False) == ['{"id":1}', '{"id":2}']
+
+
+def test_hub_coalesces_and_shares_frames(monkeypatch) -> None:
+    monkeypatch.setattr(fanout_module.settings, "stream_coalesce_ms", 20.0)
+
+    async def scenario() -> tuple[Frame, Frame]:
+        bus = EventBus(None)
+        set_event_bus(bus)
+        hub = FanoutHub()
+        async with hub.attach("arg-1") as first, hub.attach("arg-1") as second:
+            await asyncio.sleep(0)
+            for event_id in range(3):
+                await bus.publish("arg-1", _event(event_id))
+            return await first.get(), await second.get()
+
+    first_frame, second_frame = asyncio.run(scenario())
+    assert first_frame is second_frame
+    assert [event.id for event in first_frame.events] == [0, 1, 2]
+
+
+def test_hub_closes_slow_subscribers_and_ends_streams_when_the_reader_exits(monkeypatch) -> None:
+    monkeypatch.setattr(fanout_module.settings, "stream_coalesce_ms", 0.0)
+    monkeypatch.setattr(fanout_module.settings, "stream_max_pending_frames", 2)
+
+    class EndingBus:
+        def __init__(self) -> None:
+            self.events: asyncio.Queue[WireEvent | None] = asyncio.Queue()
+
+        async def subscribe(self, argument_id: str):
+            while (event := await self.events.get()) is not None:
+                yield event
+
+    async def scenario() -> tuple[list, list]:
+        bus = EndingBus()
+        monkeypatch.setattr(fanout_module, "get_event_bus", lambda: bus)
+        hub = FanoutHub()
+        async with hub.attach("arg-1") as slow, hub.attach("arg-1") as reading:
+            read: list = []
+            for event_id in range(3):
+                bus.events.put_nowait(_event(event_id))
+                await asyncio.sleep(0.01)
+                read.append(await reading.get())
+            bus.events.put_nowait(None)
+            read.append(await asyncio.wait_for(reading.get(), 1))
+            return [slow.get_nowait()], [frame and frame.events[0].id for frame in read]
+
+    slow, read = asyncio.run(scenario())
+    assert slow == [None]
+    assert read == [0, 1, 2, None]
+
+
+def test_live_stream_sends_the_gap_before_any_live_event(sqlite_sessions, monkeypatch) -> None:
+    monkeypatch.setattr(fanout_module.settings, "stream_coalesce_ms", 0.0)
+
+    async def scenario() -> list[list[int]]:
+        async with sqlite_sessions() as session_factory:
+            monkeypatch.setattr(streaming, "SessionLocal", session_factory)
+            monkeypatch.setattr(streaming, "fanout_hub", FanoutHub())
+            bus = EventBus(None)
+            set_event_bus(bus)
+            async with session_factory() as session:
+                for event_type in ("phase.changed", "turn.final", "argument.completed"):
+                    session.add(TurnEvent(argument_id="arg-1", event_type=event_type, payload={}))
+                await session.commit()
+                gap = (await session.execute(select(*WIRE_EVENT_COLUMNS))).all()[1:]
+
+            # The snapshot covered event 1; events 2 and 3 landed before the subscription.
+            frames = streaming._live_frames("arg-1", 1)
+            received = [[event.id for event in (await asyncio.wait_for(anext(frames), 1)).events]]
+            # Late bus copies of the gap events are not sent twice.
+            for row in gap:
+                await bus.publish("arg-1", WireEvent.from_row(row))
+            await bus.publish("arg-1", _event(4))
+            live = await asyncio.wait_for(anext(frames), 1)
+            received.append([event.id for event in live.events])
+            await frames.aclose()
+        return received
+
+    assert asyncio.run(scenario()) == [[2, 3], [4]]
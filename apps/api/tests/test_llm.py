@@ -0,0 +1,107 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from app.db.models import ArgumentPhase
+from app.services import tracing
+from app.workers import llm
+
+PERSONA = {
+    "speaker_handle": "alice",
+    "stance": "Cats are better",
+    "win_condition": "BE_RIGHT",
+    "evidence_mode": "FREEFORM",
+    "max_turns": 8,
+    "target_min_tokens": 80,
+    "target_max_tokens": 140,
+}
+
+
+def test_static_prefix_is_identical_across_turns() -> None:
+    first = llm.build_prompt_messages(
+        **PERSONA,
+        chosen_point="Cats are quiet",
+        conversation=None,
+        phase=ArgumentPhase.OPENING,
+        turn_index=1,
+    )
+    later = llm.build_prompt_messages(
+        **PERSONA,
+        chosen_point="Cats are clean",
+        conversation="Recent turns:\nbob: Dogs are loyal.",
+        phase=ArgumentPhase.ESCALATION,
+        turn_index=5,
+    )
+    assert first[0] == later[0]
+    assert "Cats are quiet" not in first[0]["content"]
+    assert first[1] != later[1]
+
+
+class _FakeCompletions:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+        self.with_streaming_response = self
+
+    @asynccontextmanager
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        usage = SimpleNamespace(
+            prompt_tokens=1500,
+            completion_tokens=42,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+        )
+        message = SimpleNamespace(content="Cats win.")
+        response = SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+        async def parse():
+            return response
+
+        yield SimpleNamespace(parse=parse)
+
+
+def test_generate_records_cached_prompt_tokens(monkeypatch) -> None:
+    completions = _FakeCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr(llm, "_client", client)
+    hits = llm.LLM_PROMPT_TOKENS.value(cache="hit")
+
+    generated = asyncio.run(
+        llm.generate_turn_text(
+            **PERSONA,
+            chosen_point="Cats are quiet",
+            opponent_last_turn=None,
+            phase=ArgumentPhase.OPENING,
+            turn_index=1,
+            done_hint=False,
+        )
+    )
+    assert generated.text == "Cats win."
+    assert (generated.prompt_tokens, generated.completion_tokens) == (1500, 42)
+    assert generated.cached_prompt_tokens == 1024
+    assert completions.calls[0]["max_tokens"] == llm.completion_budget(140) < 320
+    assert llm.LLM_PROMPT_TOKENS.value(cache="hit") == hits + 1024
+    assert completions.calls[0]["messages"][0]["content"].startswith(llm.SYSTEM_PROMPT)
+
+
+def test_generate_traces_time_to_first_byte(monkeypatch) -> None:
+    client = SimpleNamespace(chat=SimpleNamespace(completions=_FakeCompletions()))
+    monkeypatch.setattr(llm, "_client", client)
+    trace = tracing.ArgumentTrace("arg-1", 64)
+
+    async def scenario() -> None:
+        tracing._current_trace.set(trace)
+        await llm.generate_turn_text(
+            **PERSONA,
+            chosen_point="Cats are quiet",
+            opponent_last_turn=None,
+            phase=ArgumentPhase.OPENING,
+            turn_index=1,
+            done_hint=False,
+        )
+
+    asyncio.run(scenario())
+    events = {event["name"]: event for event in trace.events}
+    assert list(events) == ["llm.first_byte", "llm.request", "llm.complete"]
+    first_byte, request = events["llm.first_byte"], events["llm.request"]
+    assert request["ts"] <= first_byte["ts"]
+    assert first_byte["ts"] + first_byte["dur"] <= request["ts"] + request["dur"]
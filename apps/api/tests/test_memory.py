@@ -0,0 +1,34 @@
+from app.services.memory import ConversationMemory, estimate_tokens, memory_budget
+
+
+def _turn(index: int) -> str:
+    return f"Point {index} stands. Evidence item{index} shows outcome{index} clearly. Filler text here."
+
+
+def test_recent_turns_stay_verbatim() -> None:
+    memory = ConversationMemory(budget_tokens=500, recent_turns=2)
+    for index in range(1, 4):
+        memory.add("alice" if index % 2 else "bob", _turn(index))
+    rendered = memory.render()
+    assert f"bob: {_turn(2)}" in rendered
+    assert f"alice: {_turn(3)}" in rendered
+    assert "Earlier points (condensed):\n- alice: Evidence item1 shows outcome1 clearly." in rendered
+
+
+def test_repeated_points_do_not_grow_the_digest() -> None:
+    memory = ConversationMemory(budget_tokens=500, recent_turns=1)
+    for _ in range(5):
+        memory.add("alice", "The burden of proof is unmet. The burden of proof is unmet.")
+    memory.add("bob", "Fresh rebuttal")
+    assert memory.render().count("burden") == 1
+
+
+def test_rendered_size_is_bounded_by_budget() -> None:
+    budget = memory_budget(140)
+    memory = ConversationMemory(budget_tokens=budget)
+    sizes = []
+    for index in range(1, 200):
+        memory.add("alice" if index % 2 else "bob", _turn(index) * 3)
+        sizes.append(estimate_tokens(memory.render()))
+    assert max(sizes) <= budget + 8
+    assert sizes[-1] == sizes[-50]
@@ -0,0 +1,49 @@
+import pytest
+
+from app.core.metrics import Registry
+
+
+def test_counter_and_gauge_render() -> None:
+    registry = Registry()
+    flags = registry.counter("test_flags_total", "Flags.", ("reason",))
+    streams = registry.gauge("test_streams", "Streams.")
+    flags.inc(reason="error")
+    flags.inc(2, reason="error")
+    with streams.track():
+        assert streams.value() == 1
+    output = registry.render()
+    assert "# TYPE test_flags_total counter" in output
+    assert 'test_flags_total{reason="error"} 3' in output
+    assert "test_streams 0" in output
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    registry = Registry()
+    latency = registry.histogram("test_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5.0)
+    output = registry.render()
+    assert 'test_latency_seconds_bucket{le="0.1"} 1' in output
+    assert 'test_latency_seconds_bucket{le="1"} 2' in output
+    assert 'test_latency_seconds_bucket{le="+Inf"} 3' in output
+    assert "test_latency_seconds_count 3" in output
+
+
+def test_rejects_unknown_labels() -> None:
+    registry = Registry()
+    flags = registry.counter("test_labels_total", "Flags.", ("reason",))
+    with pytest.raises(ValueError):
+        flags.inc(argument_id="abc")
+
+
+def test_worker_metrics_exporter_binds_only_when_a_worker_boots(monkeypatch) -> None:
+    from app.workers import actors
+
+    calls: list[int] = []
+    monkeypatch.setattr(actors, "start_metrics_server", calls.append)
+    monkeypatch.setattr(actors.settings, "worker_metrics_port", 9464)
+    exporter = actors.WorkerMetricsExporter()
+    assert calls == []
+    exporter.after_worker_boot(None, None)
+    assert calls == [9464]
@@ -0,0 +1,92 @@
+import asyncio
+
+from sqlalchemy import update
+
+from app.db.models import Argument, User
+from app.services import response_cache
+from app.services.response_cache import ResponseCache, etag_matches
+
+
+def test_etag_matching_follows_if_none_match_rules() -> None:
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"x", W/"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches(None, '"abc"')
+    assert not etag_matches('"abcd"', '"abc"')
+
+
+def test_entries_built_from_an_old_generation_are_never_served() -> None:
+    async def scenario() -> None:
+        cache = ResponseCache(None, ttl_seconds=60)
+        cached, generation = await cache.lookup("view", "arg-1")
+        assert cached is None
+        stored = await cache.store("view", "arg-1", generation, b'{"status":"waiting"}')
+        hit, _ = await cache.lookup("view", "arg-1")
+        assert hit is stored
+
+        # A reader that looked up before the commit must not pin its stale body afterwards.
+        cache.invalidate_later({"arg-1"})
+        await cache.store("view", "arg-1", generation, b'{"status":"waiting"}')
+        missed, fresh_generation = await cache.lookup("view", "arg-1")
+        assert missed is None
+        assert fresh_generation != generation
+
+    asyncio.run(scenario())
+
+
+def test_redis_errors_fall_back_per_call_and_retry_later() -> None:
+    async def scenario() -> tuple[str | None, object]:
+        cache = ResponseCache("redis://127.0.0.1:1/0", ttl_seconds=60)
+        cached, _ = await cache.lookup("view", "arg-1")
+        assert cached is None
+        await cache.store("view", "arg-1", 0, b"{}")
+        return cache.redis_url, cache._redis.peek()
+
+    redis_url, client = asyncio.run(scenario())
+    assert redis_url == "redis://127.0.0.1:1/0"
+    assert client is None
+
+
+def test_drain_waits_for_scheduled_invalidations() -> None:
+    async def scenario() -> list[list[str]]:
+        cache = ResponseCache("redis://unused", ttl_seconds=60)
+        landed: list[list[str]] = []
+
+        async def invalidate(argument_ids: list[str]) -> None:
+            await asyncio.sleep(0.01)
+            landed.append(argument_ids)
+
+        cache.invalidate = invalidate
+        cache.invalidate_later({"arg-2", "arg-1"})
+        await cache.drain()
+        return landed
+
+    assert asyncio.run(scenario()) == [["arg-1", "arg-2"]]
+
+
+def test_bulk_statements_invalidate_the_arguments_they_touch(sqlite_sessions, monkeypatch) -> None:
+    async def scenario() -> tuple[int, int]:
+        async with sqlite_sessions() as session_factory:
+            async with session_factory() as session:
+                session.add(User(id="u-1", handle="one"))
+                session.add_all(
+                    [
+                        Argument(id="arg-1", creator_user_id="u-1", topic="one"),
+                        Argument(id="arg-2", creator_user_id="u-1", topic="two"),
+                    ]
+                )
+                await session.commit()
+            _, before = await cache.lookup("view", "arg-1")
+            _, untouched_before = await cache.lookup("view", "arg-2")
+            async with session_factory() as session:
+                await session.execute(
+                    update(Argument).where(Argument.topic == "one").values(topic="renamed")
+                )
+                await session.commit()
+            _, after = await cache.lookup("view", "arg-1")
+            _, untouched_after = await cache.lookup("view", "arg-2")
+        return after != before, untouched_after == untouched_before
+
+    cache = ResponseCache(None, ttl_seconds=60)
+    monkeypatch.setattr(response_cache, "_response_cache", cache)
+    assert asyncio.run(scenario()) == (True, True)
@@ -0,0 +1,106 @@
+import asyncio
+from contextlib import suppress
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select
+
+from app.core.config import Settings
+from app.db.models import TurnEvent
+from app.services import retention
+from app.services.retention import build_plan, purge_expired_events
+
+NOW = datetime(2026, 6, 15, tzinfo=UTC)
+
+
+def test_plan_keeps_unlisted_types_forever_by_default() -> None:
+    plan = build_plan({"turn.token": 7, "turn.final": 0}, default_days=0, now=NOW)
+    assert plan.cutoffs == {"turn.token": NOW - timedelta(days=7)}
+    assert plan.default_cutoff is None
+    assert plan.detach_before is None
+
+
+def test_nothing_expires_unless_configured(monkeypatch) -> None:
+    for name in ("EVENT_RETENTION_DAYS", "EVENT_RETENTION_DEFAULT_DAYS"):
+        monkeypatch.delenv(name, raising=False)
+    settings = Settings(_env_file=None)
+    plan = build_plan(
+        settings.event_retention_days, default_days=settings.event_retention_default_days, now=NOW
+    )
+    assert plan.cutoffs == {}
+    assert plan.default_cutoff is None
+
+
+def test_plan_detaches_only_when_every_type_expires() -> None:
+    plan = build_plan({"turn.token": 7, "turn.final": 0}, default_days=90, now=NOW)
+    assert plan.detach_before is None
+    plan = build_plan({"turn.token": 7}, default_days=90, now=NOW)
+    assert plan.detach_before == NOW - timedelta(days=90)
+
+
+def test_purge_deletes_expired_rows_in_chunks(sqlite_sessions, monkeypatch) -> None:
+    monkeypatch.setattr(retention.settings, "event_retention_days", {"turn.token": 7})
+    monkeypatch.setattr(retention.settings, "event_retention_default_days", 0)
+    monkeypatch.setattr(retention.settings, "event_retention_batch_size", 3)
+
+    async def scenario() -> tuple[dict[str, int], list[tuple[str, datetime]]]:
+        async with sqlite_sessions() as session_factory:
+            async with session_factory() as session:
+                for age_days in (1, 10, 10, 10, 10, 30, 30):
+                    for event_type in ("turn.token", "turn.final"):
+                        session.add(
+                            TurnEvent(
+                                argument_id="arg-1",
+                                event_type=event_type,
+                                payload={},
+                                created_at=NOW - timedelta(days=age_days),
+                            )
+                        )
+                await session.commit()
+            counts = await purge_expired_events(now=NOW, session_factory=session_factory)
+            async with session_factory() as session:
+                rows = await session.execute(select(TurnEvent.event_type, TurnEvent.created_at))
+                remaining = [(event_type, created_at) for event_type, created_at in rows.all()]
+        return counts, remaining
+
+    counts, remaining = asyncio.run(scenario())
+    assert counts == {"turn.token": 6}
+    assert sorted(event_type for event_type, _ in remaining) == ["turn.final"] * 7 + ["turn.token"]
+
+
+def test_retention_scheduler_enqueues_once_per_interval(monkeypatch) -> None:
+    from app.workers import actors
+
+    class FakeRedis:
+        def __init__(self) -> None:
+            self.keys: set[str] = set()
+
+        def set(self, key: str, value: bytes, *, nx: bool, ex: int) -> bool:
+            if key in self.keys:
+                return False
+            self.keys.add(key)
+            return True
+
+    class Stop(Exception):
+        pass
+
+    shared = FakeRedis()
+    sent: list[str] = []
+    sleeps: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        if len(sleeps) == 3:
+            raise Stop
+
+    monkeypatch.setattr(actors.Redis, "from_url", lambda url: shared)
+    monkeypatch.setattr(actors.retention_actor, "send", lambda: sent.append("retention"))
+    monkeypatch.setattr(actors.time, "sleep", sleep)
+    monkeypatch.setattr(actors.settings, "event_retention_interval_seconds", 3600)
+    monkeypatch.setattr(actors.settings, "redis_url", "redis://unused")
+    # Two worker processes share the key; only the first claim enqueues.
+    for _ in range(2):
+        sleeps.clear()
+        with suppress(Stop):
+            actors.RetentionScheduler()._run()
+    assert sent == ["retention"]
+    assert sleeps == [60, 60, 60]
@@ -0,0 +1,32 @@
+from collections import Counter
+
+from app.workers.sharding import HashRing, queue_for_argument
+
+ARGUMENT_IDS = [f"argument-{index}" for index in range(4000)]
+
+
+def test_unsharded_deployments_keep_the_base_queue() -> None:
+    assert queue_for_argument("debate_run", "argument-1", shards=0) == "debate_run"
+    assert queue_for_argument("debate_run", "argument-1", shards=1) == "debate_run"
+
+
+def test_every_stage_of_an_argument_lands_on_the_same_shard() -> None:
+    for argument_id in ARGUMENT_IDS[:50]:
+        run_queue = queue_for_argument("debate_run", argument_id, shards=4)
+        postprocess_queue = queue_for_argument("postprocess", argument_id, shards=4)
+        assert run_queue.removeprefix("debate_run.") == postprocess_queue.removeprefix("postprocess.")
+
+
+def test_ring_spreads_load_and_moves_few_arguments_when_resized() -> None:
+    four, five = HashRing(4), HashRing(5)
+    load = Counter(four.shard_for(argument_id) for argument_id in ARGUMENT_IDS)
+    assert max(load.values()) < 1.3 * len(ARGUMENT_IDS) / 4
+
+    moved = [
+        argument_id
+        for argument_id in ARGUMENT_IDS
+        if four.shard_for(argument_id) != five.shard_for(argument_id)
+    ]
+    # Only arguments claimed by the new shard move; a modulo scheme would move about 80%.
+    assert len(moved) < 0.3 * len(ARGUMENT_IDS)
+    assert {five.shard_for(argument_id) for argument_id in moved} == {4}
@@ -0,0 +1,122 @@
+import asyncio
+
+from sqlalchemy import select
+
+from app.db.models import Argument, ArgumentSnapshot, TurnEvent, User
+from app.services.cancellation import request_cancel
+from app.services.event_bus import EventBus, set_event_bus
+from app.services.snapshots import (
+    _upsert_snapshot,
+    apply_event,
+    empty_state,
+    load_snapshot,
+    refresh_snapshot,
+)
+
+
+def _apply(state: dict, event_type: str, payload: dict, turn_index: int | None = None) -> dict:
+    return apply_event(state, event_type=event_type, payload=payload, turn_index=turn_index)
+
+
+def test_snapshot_tracks_partial_and_completed_turns() -> None:
+    state = empty_state()
+    _apply(state, "phase.changed", {"phase": "opening"})
+    _apply(state, "turn.meta", {"speaker_participant_id": "p1", "state": "thinking"}, 1)
+    _apply(state, "turn.token", {"speaker_participant_id": "p1", "token": "Hello "}, 1)
+    _apply(state, "turn.token", {"speaker_participant_id": "p1", "token": "there "}, 1)
+    assert state["partial_turn"]["content"] == "Hello there "
+
+    _apply(
+        state,
+        "turn.final",
+        {"turn_id": "t1", "speaker_participant_id": "p1", "content": "Hello there", "phase": "opening"},
+        1,
+    )
+    assert state["partial_turn"] is None
+    assert state["turns"][0]["content"] == "Hello there"
+    assert state["phase"] == "opening"
+
+
+def test_snapshot_counts_badges_and_reactions() -> None:
+    state = empty_state()
+    _apply(state, "badge.awarded", {"badge_key": "mic_drop", "turn_index": 2}, 2)
+    _apply(state, "reaction.added", {"emoji": "🔥"})
+    _apply(state, "reaction.added", {"emoji": "🔥"})
+    _apply(state, "argument.completed", {"turn_count": 2, "reason": "natural_stop"}, 2)
+    assert [badge["badge_key"] for badge in state["badges"]] == ["mic_drop"]
+    assert state["reactions"] == {"🔥": 2}
+    assert state["completed"]["reason"] == "natural_stop"
+
+
+def test_refresh_snapshot_never_moves_the_checkpoint_backwards(sqlite_sessions) -> None:
+    async def scenario() -> tuple[int, list[str]]:
+        async with sqlite_sessions() as session_factory:
+            async with session_factory() as session:
+                argument = Argument(creator_user_id="u-1", topic="snapshots")
+                session.add_all([User(id="u-1", handle="one"), argument])
+                await session.flush()
+                for phase in ("opening", "rebuttal"):
+                    session.add(
+                        TurnEvent(
+                            argument_id=argument.id,
+                            event_type="phase.changed",
+                            payload={"phase": phase},
+                        )
+                    )
+                await session.commit()
+                argument_id = argument.id
+
+            async with session_factory() as newer, session_factory() as older:
+                await refresh_snapshot(newer, argument_id=argument_id, upto_event_id=2)
+                await newer.commit()
+                # A writer that read the row before that commit, e.g. the API racing the runner.
+                stale = _apply(empty_state(), "phase.changed", {"phase": "opening"})
+                await older.execute(_upsert_snapshot("sqlite", argument_id, stale, 1))
+                await older.commit()
+            async with session_factory() as session:
+                row = (
+                    await session.execute(
+                        select(ArgumentSnapshot.last_event_id, ArgumentSnapshot.state)
+                    )
+                ).one()
+        return row.last_event_id, row.state["phase"]
+
+    assert asyncio.run(scenario()) == (2, "rebuttal")
+
+
+def test_api_events_do_not_checkpoint_past_uncommitted_runner_events(sqlite_sessions) -> None:
+    set_event_bus(EventBus(None))
+
+    async def scenario() -> tuple[str, int]:
+        async with sqlite_sessions() as session_factory:
+            async with session_factory() as session:
+                argument = Argument(creator_user_id="u-1", topic="snapshots")
+                session.add_all([User(id="u-1", handle="one"), argument])
+                await session.flush()
+                # Stands in for the ids the runner has taken but not committed yet.
+                session.add(TurnEvent(id=100, argument_id=argument.id, event_type="turn.token"))
+                await session.commit()
+                argument_id = argument.id
+
+            # Postgres lets the API commit id 101 while the runner's id 50 is still invisible to it.
+            async with session_factory() as api:
+                cancel = await request_cancel(api, argument_id, reason="initiator")
+                await api.commit()
+            async with session_factory() as runner:
+                runner.add(
+                    TurnEvent(
+                        id=50,
+                        argument_id=argument_id,
+                        event_type="phase.changed",
+                        payload={"phase": "rebuttal"},
+                    )
+                )
+                await runner.flush()
+                await refresh_snapshot(runner, argument_id=argument_id, upto_event_id=50)
+                await runner.commit()
+
+            async with session_factory() as session:
+                state, last_event_id = await load_snapshot(session, argument_id)
+        return state["phase"], last_event_id - cancel.id
+
+    assert asyncio.run(scenario()) == ("rebuttal", 0)
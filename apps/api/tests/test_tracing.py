@@ -0,0 +1,44 @@
+from app.services.tracing import ArgumentTrace, TraceStore
+
+
+def test_trace_exports_chrome_events() -> None:
+    trace = ArgumentTrace("arg-1", capacity=16)
+    with trace.span("llm", turn_index=1):
+        trace.instant("llm.complete", turn_index=1)
+    exported = trace.to_chrome()
+    events = exported["traceEvents"]
+    assert events[0]["ph"] == "M"
+    assert [event["name"] for event in events[1:]] == ["llm.complete", "llm"]
+    assert events[2]["ph"] == "X"
+    assert events[2]["dur"] >= 0
+    assert events[2]["args"] == {"turn_index": 1}
+
+
+def test_trace_is_a_ring_buffer() -> None:
+    trace = ArgumentTrace("arg-1", capacity=3)
+    for idx in range(5):
+        trace.instant("tick", idx=idx)
+    assert [event["args"]["idx"] for event in trace.events] == [2, 3, 4]
+    assert trace.to_chrome()["otherData"]["dropped_oldest"] is True
+
+
+def test_store_evicts_oldest_argument() -> None:
+    store = TraceStore(max_arguments=2)
+    store.start("a", capacity=4)
+    store.start("b", capacity=4)
+    store.start("c", capacity=4)
+    assert store.get("a") is None
+    assert store.get("c") is not None
+
+
+def test_unflushed_returns_only_new_events_still_in_the_buffer() -> None:
+    trace = ArgumentTrace("arg-1", capacity=3)
+    trace.instant("a")
+    trace.instant("b")
+    assert [event["name"] for event in trace.unflushed()] == ["a", "b"]
+    trace.flushed = trace.appended
+    assert trace.unflushed() == []
+    for name in ("c", "d", "e", "f"):
+        trace.instant(name)
+    # "c" fell out of the ring buffer before it could be flushed.
+    assert [event["name"] for event in trace.unflushed()] == ["d", "e", "f"]
@@ -34,6 +34,7 @@ export default function DashboardPage() {
   const [inviteUrl, setInviteUrl] = useState<string | null>(null);
   const [spectatorUrl, setSpectatorUrl] = useState<string | null>(null);
   const [isCreating, setIsCreating] = useState(false);
+  const [loadingMore, setLoadingMore] = useState<"active" | "past" | null>(null);
 
   const creditsLabel = useMemo(() => {
     const credits = data?.credits_balance ?? 0;
@@ -59,6 +60,41 @@ export default function DashboardPage() {
       .catch((err: Error) => setError(err.message));
   }, [user]);
 
+  // The API pages each list separately; a cursor only advances its own list.
+  const loadMore = async (list: "active" | "past") => {
+    if (!user || !data) {
+      return;
+    }
+    const cursor = list === "active" ? data.active_next_cursor : data.past_next_cursor;
+    if (!cursor) {
+      return;
+    }
+    setLoadingMore(list);
+    try {
+      const page = await api.myArguments(user, { [list]: cursor });
+      setData((prev) => {
+        if (!prev) {
+          return prev;
+        }
+        return list === "active"
+          ? {
+              ...prev,
+              active: [...prev.active, ...page.active],
+              active_next_cursor: page.active_next_cursor,
+            }
+          : {
+              ...prev,
+              past: [...prev.past, ...page.past],
+              past_next_cursor: page.past_next_cursor,
+            };
+      });
+    } catch (err) {
+      setError((err as Error).message);
+    } finally {
+      setLoadingMore(null);
+    }
+  };
+
   const onCreate = async (event: FormEvent<HTMLFormElement>) => {
     event.preventDefault();
     if (!user) {
@@ -255,6 +291,15 @@ export default function DashboardPage() {
               <p className="text-sm opacity-65">Nothing active yet.</p>
             )}
           </div>
+          {data?.active_next_cursor ? (
+            <button
+              className="mt-3 w-full rounded-xl border border-[#d2d8d5] bg-white px-4 py-2 text-sm disabled:opacity-60"
+              disabled={loadingMore === "active"}
+              onClick={() => loadMore("active")}
+            >
+              {loadingMore === "active" ? "Loading..." : "Load more"}
+            </button>
+          ) : null}
         </div>
 
         <div className="tilt-card surface rounded-2xl p-5">
@@ -271,6 +316,15 @@ export default function DashboardPage() {
               <p className="text-sm opacity-65">No completed battles yet.</p>
             )}
           </div>
+          {data?.past_next_cursor ? (
+            <button
+              className="mt-3 w-full rounded-xl border border-[#d2d8d5] bg-white px-4 py-2 text-sm disabled:opacity-60"
+              disabled={loadingMore === "past"}
+              onClick={() => loadMore("past")}
+            >
+              {loadingMore === "past" ? "Loading..." : "Load more"}
+            </button>
+          ) : null}
         </div>
       </section>
     </main>
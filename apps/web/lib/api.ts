@@ -36,8 +36,19 @@ async function request<T>(
 export const api = {
   apiUrl: API_URL,
 
-  myArguments(user: ClientUser): Promise<MyArgumentsResponse> {
-    return request<MyArgumentsResponse>("/v1/me/arguments", { method: "GET" }, user);
+  myArguments(
+    user: ClientUser,
+    cursors: { active?: string | null; past?: string | null } = {},
+  ): Promise<MyArgumentsResponse> {
+    const params = new URLSearchParams();
+    if (cursors.active) {
+      params.set("active_cursor", cursors.active);
+    }
+    if (cursors.past) {
+      params.set("past_cursor", cursors.past);
+    }
+    const query = params.toString() ? `?${params.toString()}` : "";
+    return request<MyArgumentsResponse>(`/v1/me/arguments${query}`, { method: "GET" }, user);
   },
 
   createArgument(user: ClientUser, topic: string, controls: ArgumentControls): Promise<ArgumentView> {
@@ -102,6 +102,8 @@ export type MyArgumentsResponse = {
     ended_at: string | null;
   }>;
   credits_balance: number;
+  active_next_cursor: string | null;
+  past_next_cursor: string | null;
 };
 
 export type ClientUser = {
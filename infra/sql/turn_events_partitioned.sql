@@ -0,0 +1,52 @@
+-- Month-partitioned turn_events for Postgres. Run before the API first starts so SQLAlchemy's
+-- create_all finds the table and leaves it alone. The partition key must be part of the
+-- primary key, so ids stay unique through the identity sequence rather than the constraint.
+-- `python -m app.services.retention` creates upcoming months and detaches expired ones.
+
+create table if not exists public.turn_events (
+  id bigint generated by default as identity,
+  argument_id varchar(36) not null references public.arguments(id) on delete cascade,
+  turn_index integer,
+  event_type varchar(80) not null,
+  payload json,
+  created_at timestamptz not null default now(),
+  primary key (id, created_at)
+) partition by range (created_at);
+
+create index if not exists ix_turn_events_argument_id on public.turn_events (argument_id);
+create index if not exists ix_turn_events_type_created
+  on public.turn_events (event_type, created_at);
+
+-- Catches rows outside the managed months; keep it empty so new partitions attach cheaply.
+create table if not exists public.turn_events_default
+  partition of public.turn_events default;
+
+-- Rows that already landed in the default partition for a month move into the new partition
+-- first; attaching a month fails while the default still holds rows in its range.
+do $$
+declare
+  month_start date := date_trunc('month', now())::date;
+  part_start date;
+  part_end date;
+  part_name text;
+begin
+  for offset_months in 0..2 loop
+    part_start := month_start + make_interval(months => offset_months);
+    part_end := month_start + make_interval(months => offset_months + 1);
+    part_name := 'turn_events_p' || to_char(part_start, 'YYYY_MM');
+    if to_regclass('public.' || part_name) is null then
+      lock table public.turn_events_default in access exclusive mode;
+      execute format('create table public.%I (like public.turn_events including defaults)', part_name);
+      execute format(
+        'with moved as (delete from public.turn_events_default '
+        'where created_at >= %L and created_at < %L returning *) '
+        'insert into public.%I select * from moved',
+        part_start, part_end, part_name
+      );
+      execute format(
+        'alter table public.turn_events attach partition public.%I for values from (%L) to (%L)',
+        part_name, part_start, part_end
+      );
+    end if;
+  end loop;
+end $$;